@@ -0,0 +1,280 @@
+"""
+Per-request SQL and timing metrics.
+
+RequestMetricsMiddleware opens a RequestMetrics record for every request in
+a context variable. A database execute wrapper adds each query to it, and
+views using SerializerTimingMixin add serializer time, which includes any
+queries the serializer triggers. Records are visible from ``sync_to_async``
+threads because they live in the request's context.
+
+The Server-Timing header exposes query counts and timings, so it is only
+sent to staff users, or to everyone when REQUEST_METRICS_SERVER_TIMING is on.
+
+Finished requests are added to per-route rolling histograms, which
+MetricsView serves in the Prometheus text format. Histograms cover the last
+REQUEST_METRICS_WINDOW_SECONDS and are kept per worker process.
+"""
+import heapq
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+from .openapi import extend_schema
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('request_metrics', default=None)
+
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+
+@dataclass
+class RequestMetrics:
+    max_slow_queries: int = 5
+    start: float = field(default_factory=time.perf_counter)
+    query_count: int = 0
+    db_time: float = 0.0
+    serializer_time: float = 0.0
+    # Min-heap of (duration, sql) holding the slowest queries.
+    slow_queries: list = field(default_factory=list)
+
+    def add_query(self, sql, duration):
+        self.query_count += 1
+        self.db_time += duration
+        if len(self.slow_queries) < self.max_slow_queries:
+            heapq.heappush(self.slow_queries, (duration, sql))
+        elif self.slow_queries and duration > self.slow_queries[0][0]:
+            heapq.heapreplace(self.slow_queries, (duration, sql))
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add_query(sql, time.perf_counter() - start)
+
+
+def _install_query_wrapper(connection, **kwargs):
+    # Outermost, so that connection.execute_wrapper() blocks, which pop the
+    # last wrapper on exit, never remove it.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def install():
+    """
+    Hook query timing into every database connection. Called once, by
+    RequestMetricsMiddleware, only when metrics are enabled.
+    """
+    connection_created.connect(_install_query_wrapper, dispatch_uid='request_metrics')
+    for connection in connections.all(initialized_only=True):
+        _install_query_wrapper(connection)
+
+
+class SerializerTimingMixin:
+    """
+    Generic view mixin that records serializer time: from the moment the view
+    has its page or object until the response is finalized. For list views
+    that is everything after paginate_queryset(), so rows loaded lazily by an
+    unpaginated serializer count as serializer time. Writes include
+    validation and save.
+    """
+    _serializer_start = None
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        self._serializer_start = time.perf_counter()
+        return page
+
+    def get_object(self):
+        obj = super().get_object()
+        self._serializer_start = time.perf_counter()
+        return obj
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        metrics = _current.get()
+        if metrics is not None and self._serializer_start is not None:
+            metrics.serializer_time += time.perf_counter() - self._serializer_start
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+def _sends_server_timing(request):
+    if settings.REQUEST_METRICS_SERVER_TIMING:
+        return True
+    # DRF sets the authenticated user on the Django request as well.
+    user = getattr(request, 'user', None)
+    return bool(user is not None and user.is_staff)
+
+
+def start_request():
+    metrics = RequestMetrics(max_slow_queries=settings.REQUEST_METRICS_SLOW_QUERIES)
+    return metrics, _current.set(metrics)
+
+
+def abandon_request(token):
+    _current.reset(token)
+
+
+def finish_request(request, response, metrics, token):
+    """
+    Close ``metrics``, add the Server-Timing header for staff, log the
+    request if it was slow and add it to the histograms.
+    """
+    _current.reset(token)
+    total = time.perf_counter() - metrics.start
+
+    if _sends_server_timing(request):
+        response['Server-Timing'] = (
+            f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.query_count} queries", '
+            f'serializer;dur={metrics.serializer_time * 1000:.1f}, '
+            f'total;dur={total * 1000:.1f}'
+        )
+
+    if total * 1000 >= settings.REQUEST_METRICS_SLOW_REQUEST_MS:
+        slowest = sorted(metrics.slow_queries, reverse=True)
+        logger.warning(
+            'Slow request %s %s: %.1f ms, %d queries (%.1f ms), serializer %.1f ms%s',
+            request.method, request.get_full_path(), total * 1000, metrics.query_count,
+            metrics.db_time * 1000, metrics.serializer_time * 1000,
+            ''.join(f'\n  {duration * 1000:.1f} ms  {sql[:500]}' for duration, sql in slowest),
+        )
+
+    match = getattr(request, 'resolver_match', None)
+    registry.observe(match.route if match else '<unmatched>', request.method, {
+        'duration': total,
+        'db': metrics.db_time,
+        'serializer': metrics.serializer_time,
+        'queries': metrics.query_count,
+    })
+    return response
+
+
+class RollingHistogram:
+    """
+    Histogram over the last ``window`` seconds, kept as ``slices`` rotating
+    sub-windows so that old observations expire in steps.
+    """
+
+    def __init__(self, buckets, window, slices=5):
+        self.buckets = buckets
+        self.slice_seconds = window / slices
+        self.slices = deque(maxlen=slices)
+
+    def observe(self, value, now):
+        index = int(now // self.slice_seconds)
+        if not self.slices or self.slices[-1][0] != index:
+            self.slices.append([index, [0] * (len(self.buckets) + 1), 0.0])
+        current = self.slices[-1]
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            position = len(self.buckets)
+        current[1][position] += 1
+        current[2] += value
+
+    def snapshot(self, now):
+        """
+        Return (cumulative bucket counts, sum, count) for the window.
+        """
+        oldest = int(now // self.slice_seconds) - self.slices.maxlen + 1
+        counts = [0] * (len(self.buckets) + 1)
+        total = 0.0
+        for index, slice_counts, slice_sum in self.slices:
+            if index >= oldest:
+                counts = [a + b for a, b in zip(counts, slice_counts)]
+                total += slice_sum
+        cumulative, running = [], 0
+        for count in counts:
+            running += count
+            cumulative.append(running)
+        return cumulative, total, running
+
+
+class MetricsRegistry:
+    # (metric name, help text, observation key, buckets setting or value)
+    metrics = [
+        ('http_request_duration_seconds', 'Request duration', 'duration', None),
+        ('http_request_db_seconds', 'Time spent in SQL queries', 'db', None),
+        ('http_request_serializer_seconds', 'Time spent in serializers', 'serializer', None),
+        ('http_request_queries', 'SQL queries per request', 'queries', QUERY_BUCKETS),
+    ]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, route, method, values):
+        now = time.monotonic()
+        with self._lock:
+            for name, _, key, buckets in self.metrics:
+                histogram = self._histograms.get((name, route, method))
+                if histogram is None:
+                    histogram = self._histograms[(name, route, method)] = RollingHistogram(
+                        buckets or settings.REQUEST_METRICS_BUCKETS, settings.REQUEST_METRICS_WINDOW_SECONDS,
+                    )
+                histogram.observe(values[key], now)
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self):
+        """
+        Return every histogram in the Prometheus text exposition format.
+        """
+        now = time.monotonic()
+        lines = []
+        with self._lock:
+            for name, help_text, _, _ in self.metrics:
+                series = sorted((key, h) for key, h in self._histograms.items() if key[0] == name)
+                if not series:
+                    continue
+                lines.append(f'# HELP {name} {help_text} over the last '
+                             f'{settings.REQUEST_METRICS_WINDOW_SECONDS}s.')
+                lines.append(f'# TYPE {name} histogram')
+                for (_, route, method), histogram in series:
+                    labels = f'route="{_escape(route)}",method="{_escape(method)}"'
+                    cumulative, total, count = histogram.snapshot(now)
+                    for bound, value in zip([*histogram.buckets, '+Inf'], cumulative):
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {value}')
+                    lines.append(f'{name}_sum{{{labels}}} {total}')
+                    lines.append(f'{name}_count{{{labels}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
+
+
+class MetricsView(APIView):
+    """
+    API endpoint that allows administrators to read request metrics.
+    """
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        summary="Retrieve request metrics",
+        description="Per-route histograms of request duration, SQL time, serializer time and query count for this worker process, in the Prometheus text format. Only administrators can read metrics.",
+        responses={200: str, 403: "Forbidden"}
+    )
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
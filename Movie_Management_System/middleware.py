@@ -0,0 +1,119 @@
+import hashlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+
+from . import metrics
+from .routers import RoutingState, reset_routing_state, set_routing_state
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RequestMetricsMiddleware:
+    """
+    Record each request's SQL query count, SQL time, serializer time and
+    total time: returned to staff in a Server-Timing header, logged for
+    requests over REQUEST_METRICS_SLOW_REQUEST_MS and added to the histograms
+    served by MetricsView.
+
+    When REQUEST_METRICS_ENABLED is off the middleware removes itself at
+    startup, so it costs nothing per request.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        metrics.install()
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        record, token = metrics.start_request()
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            metrics.abandon_request(token)
+            raise
+        return metrics.finish_request(request, response, record, token)
+
+    async def __acall__(self, request):
+        record, token = metrics.start_request()
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            metrics.abandon_request(token)
+            raise
+        return metrics.finish_request(request, response, record, token)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let safe requests read from a replica, and pin a client to the primary for
+    DATABASE_READ_YOUR_WRITES_SECONDS after one of its requests writes, so it
+    always reads its own writes.
+
+    The pin lives in the shared default cache, keyed by the client's
+    Authorization header, session cookie or address.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.DATABASE_READ_REPLICAS:
+            return self.get_response(request)
+
+        pin_key = self.pin_key(request)
+        use_replica = request.method in SAFE_METHODS and not cache.get(pin_key)
+        state = RoutingState(use_replica=use_replica)
+
+        token = set_routing_state(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_routing_state(token)
+
+        if state.wrote:
+            cache.set(pin_key, True, settings.DATABASE_READ_YOUR_WRITES_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_READ_REPLICAS:
+            return await self.get_response(request)
+
+        pin_key = self.pin_key(request)
+        use_replica = request.method in SAFE_METHODS and not await cache.aget(pin_key)
+        state = RoutingState(use_replica=use_replica)
+
+        token = set_routing_state(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            reset_routing_state(token)
+
+        if state.wrote:
+            await cache.aset(pin_key, True, settings.DATABASE_READ_YOUR_WRITES_SECONDS)
+        return response
+
+    def pin_key(self, request):
+        client = (
+            request.META.get('HTTP_AUTHORIZATION')
+            or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+            or request.META.get('REMOTE_ADDR', '')
+        )
+        return 'db:pin-primary:' + hashlib.sha1(client.encode()).hexdigest()
@@ -0,0 +1,95 @@
+"""
+Primary/replica database routing.
+
+Reads are sent to a read replica only while ReplicaRoutingMiddleware has
+marked the current request as replica-safe (a safe HTTP method from a client
+that has not written recently). Everything else, including management
+commands and writes, uses the primary ``default`` database.
+"""
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+_routing_state = ContextVar('db_routing_state', default=None)
+
+# Replica alias -> time.monotonic() until which it is considered unavailable.
+_unavailable_until = {}
+
+
+@dataclass
+class RoutingState:
+    use_replica: bool = False
+    replica: str = None
+    wrote: bool = False
+
+
+def get_routing_state():
+    return _routing_state.get()
+
+
+def set_routing_state(state):
+    return _routing_state.set(state)
+
+
+def reset_routing_state(token):
+    _routing_state.reset(token)
+
+
+def read_from_primary():
+    """
+    Send the remaining reads of the current request to the primary, for data
+    that outlives the request, such as cached responses, and so must not come
+    from a replica that lags behind.
+    """
+    state = get_routing_state()
+    if state is not None:
+        state.use_replica = False
+
+
+def replica_available(alias):
+    """
+    Return whether ``alias`` can be connected to. A failed replica is skipped
+    for DATABASE_REPLICA_RETRY_SECONDS before it is tried again.
+    """
+    if _unavailable_until.get(alias, 0) > time.monotonic():
+        return False
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError:
+        _unavailable_until[alias] = time.monotonic() + settings.DATABASE_REPLICA_RETRY_SECONDS
+        return False
+    _unavailable_until.pop(alias, None)
+    return True
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = get_routing_state()
+        if state is None or not state.use_replica:
+            return 'default'
+
+        # Pick one replica per request so all of its reads see the same data.
+        if state.replica is None:
+            replicas = list(settings.DATABASE_READ_REPLICAS)
+            random.shuffle(replicas)
+            state.replica = next((alias for alias in replicas if replica_available(alias)), 'default')
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = get_routing_state()
+        if state is not None:
+            state.wrote = True
+            state.use_replica = False
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas are copies of the primary, so objects from any of them may be related.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
@@ -0,0 +1,165 @@
+"""
+Precomputed OpenAPI schema.
+
+drf-spectacular's views build the schema by introspecting every view and
+serializer on each request. Here it is generated once per code version, by
+the ``generate_schema`` management command or by the first request that
+needs it, and written to OPENAPI_SCHEMA_FILE so that the other worker
+processes load it instead of generating it again. Each format is rendered
+once per process and served from memory with a strong ETag and
+``Cache-Control: max-age=OPENAPI_SCHEMA_MAX_AGE``. The Swagger UI page stays
+a plain template render, since it embeds the request's CSRF token, and loads
+the schema from here.
+
+The code version is CODE_VERSION when set (for example the deployed commit),
+otherwise a hash of the installed Django, DRF and drf-spectacular versions
+and of the size and modification time of every source file in the project's
+own packages: the ROOT_URLCONF package and the installed apps that live in
+BASE_DIR. Other directories under BASE_DIR, such as a virtualenv, are not
+read.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from functools import lru_cache
+
+import django
+import drf_spectacular
+import rest_framework
+from django.apps import apps
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.views import SpectacularAPIView
+
+_lock = threading.RLock()
+_schema = None
+_rendered = {}
+
+
+def source_packages():
+    """
+    Return the directories of the project's own packages, see the module
+    docstring.
+    """
+    base = os.path.realpath(settings.BASE_DIR)
+    packages = {os.path.join(base, settings.ROOT_URLCONF.split('.')[0])}
+    packages.update(os.path.realpath(config.path) for config in apps.get_app_configs())
+    return sorted(path for path in packages if os.path.dirname(path) == base and os.path.isdir(path))
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    if settings.CODE_VERSION:
+        return settings.CODE_VERSION
+    digest = hashlib.sha256(f'{django.__version__}:{rest_framework.__version__}:{drf_spectacular.__version__}'.encode())
+    base = os.path.realpath(settings.BASE_DIR)
+    for package in source_packages():
+        for root, dirs, files in os.walk(package):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d != '__pycache__')
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    path = os.path.join(root, name)
+                    stat = os.stat(path)
+                    digest.update(f'{os.path.relpath(path, base)}:{stat.st_size}:{stat.st_mtime_ns}'.encode())
+    return digest.hexdigest()[:16]
+
+
+def generate_schema():
+    """
+    Generate the public schema and return it as plain JSON data, so that a
+    generating and a loading process render exactly the same bytes.
+    """
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    return json.loads(OpenApiJsonRenderer().render(schema, renderer_context={}))
+
+
+def write_schema(schema, version, path=None):
+    path = path or settings.OPENAPI_SCHEMA_FILE
+    directory = os.path.dirname(os.path.abspath(path))
+    # Write to a temporary file and rename it into place, so that readers
+    # never see a partial file.
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'version': version, 'schema': schema}, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_schema():
+    """
+    Return the schema for the current code version from OPENAPI_SCHEMA_FILE,
+    generating and writing it if the file is missing or out of date.
+    """
+    version = code_version()
+    try:
+        with open(settings.OPENAPI_SCHEMA_FILE) as f:
+            stored = json.load(f)
+        if stored.get('version') == version:
+            return stored['schema']
+    except (OSError, ValueError):
+        pass
+    schema = generate_schema()
+    write_schema(schema, version)
+    return schema
+
+
+def get_schema():
+    """
+    Return the schema, loading it once per process.
+    """
+    global _schema
+    if _schema is None:
+        with _lock:
+            if _schema is None:
+                _schema = load_schema()
+    return _schema
+
+
+def _cached(key, render):
+    """
+    Return ``(body, etag)`` for ``key``, calling ``render()`` only the first
+    time in this process.
+    """
+    entry = _rendered.get(key)
+    if entry is None:
+        with _lock:
+            entry = _rendered.get(key)
+            if entry is None:
+                body = render()
+                entry = _rendered[key] = (body, '"%s"' % hashlib.sha256(body).hexdigest()[:32])
+    return entry
+
+
+class CachedSchemaView(SpectacularAPIView):
+    """
+    SpectacularAPIView serving the precomputed schema. The ``lang`` and
+    ``version`` parameters are not supported, since this project has neither
+    translations nor API versions.
+    """
+
+    def _get_schema_response(self, request):
+        renderer = request.accepted_renderer
+        context = self.get_renderer_context()
+        indent = renderer.get_indent(request.accepted_media_type, context) if hasattr(renderer, 'get_indent') else None
+        body, etag = _cached(
+            (type(renderer), indent),
+            lambda: renderer.render(get_schema(), request.accepted_media_type, context),
+        )
+        content_type = request.accepted_media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        response = get_conditional_response(request._request, etag=etag) or HttpResponse(body, content_type=content_type)
+        response['ETag'] = etag
+        response['Content-Disposition'] = f'inline; filename="{self._get_filename(request, None)}"'
+        patch_cache_control(response, public=True, max_age=settings.OPENAPI_SCHEMA_MAX_AGE)
+        return response
+
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 
@@ -50,7 +52,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'Movie_Management_System.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'Movie_Management_System.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -83,13 +87,130 @@ WSGI_APPLICATION = 'Movie_Management_System.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# SQLite is tuned for several concurrent worker processes: WAL lets readers
+# proceed while a write is in progress, IMMEDIATE transactions take the write
+# lock up front instead of failing with "database is locked" on upgrade, and
+# 'timeout' is the busy_timeout writers wait for that lock. Connections are
+# persistent so the PRAGMAs run once per connection, not once per request.
+SQLITE_OPTIONS = {
+    'timeout': 5,
+    'transaction_mode': 'IMMEDIATE',
+    'init_command': (
+        'PRAGMA journal_mode=WAL;'
+        'PRAGMA synchronous=NORMAL;'
+        'PRAGMA mmap_size=134217728;'
+        'PRAGMA cache_size=-20000;'
+        'PRAGMA temp_store=MEMORY;'
+    ),
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_OPTIONS,
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Read replicas: a comma separated list of SQLite files that are copies of
+# the primary, e.g. DJANGO_DB_REPLICAS=/srv/replica1.sqlite3. They are opened
+# read-only, so a missing file fails over to the primary instead of being
+# created empty. WAL is a persistent file setting, so replicas do not set it.
+DATABASE_READ_REPLICAS = []
+for index, replica_path in enumerate(filter(None, os.environ.get('DJANGO_DB_REPLICAS', '').split(',')), start=1):
+    alias = f'replica{index}'
+    DATABASES[alias] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f'file:{Path(replica_path.strip()).resolve()}?mode=ro',
+        'OPTIONS': {
+            'timeout': SQLITE_OPTIONS['timeout'],
+            'init_command': 'PRAGMA mmap_size=134217728; PRAGMA cache_size=-20000; PRAGMA temp_store=MEMORY;',
+        },
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_READ_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['Movie_Management_System.routers.PrimaryReplicaRouter']
+
+# Seconds a client reads from the primary after it writes.
+DATABASE_READ_YOUR_WRITES_SECONDS = 5
+
+# Seconds an unreachable replica is skipped before it is tried again.
+DATABASE_REPLICA_RETRY_SECONDS = 30
+
+
+# Request metrics, see Movie_Management_System.metrics. DJANGO_REQUEST_METRICS=0
+# removes the middleware at startup.
+REQUEST_METRICS_ENABLED = os.environ.get('DJANGO_REQUEST_METRICS', '1') != '0'
+
+# Requests slower than this are logged with their slowest queries.
+REQUEST_METRICS_SLOW_REQUEST_MS = 500
+REQUEST_METRICS_SLOW_QUERIES = 5
+
+# Staff users always get the Server-Timing header; this sends it to every
+# client, which exposes query counts, so it defaults to DEBUG only.
+REQUEST_METRICS_SERVER_TIMING = DEBUG
+
+# Histograms cover this many recent seconds; bucket bounds are in seconds.
+REQUEST_METRICS_WINDOW_SECONDS = 300
+REQUEST_METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+# Throttling, see Movie_Management_System.throttling. Rates are set per view
+# scope in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']. DJANGO_THROTTLE=0 turns
+# throttling off.
+THROTTLE_ENABLED = os.environ.get('DJANGO_THROTTLE', '1') != '0'
+
+
+# Leaderboards, see movie.leaderboards. Boards keep LEADERBOARD_SIZE
+# positions; top rated adds LEADERBOARD_PRIOR_RATINGS ratings at the catalog
+# mean to every movie, and trending counts ratings from the last
+# LEADERBOARD_TRENDING_DAYS.
+LEADERBOARD_SIZE = 100
+LEADERBOARD_PRIOR_RATINGS = 10
+LEADERBOARD_TRENDING_DAYS = 7
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# File based so that invalidations are seen by every worker process.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': Path(tempfile.gettempdir()) / 'movie_management_system_cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    # Token buckets of Movie_Management_System.throttling, kept apart so that
+    # culling and clearing the default cache leave them alone.
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': Path(tempfile.gettempdir()) / 'movie_management_system_throttle',
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+        },
+    },
+    # Authenticated users, see accounts.authentication. Shared by all
+    # workers, so that the invalidation on User save/delete reaches them.
+    'users': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': Path(tempfile.gettempdir()) / 'movie_management_system_users',
+        'TIMEOUT': 30,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+}
+
+# Runs the test suite against its own temporary cache directories.
+TEST_RUNNER = 'Movie_Management_System.test_runner.IsolatedStateTestRunner'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -136,17 +257,39 @@ AUTH_USER_MODEL = 'accounts.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # ORJSONRenderer writes the same JSON as rest_framework's JSONRenderer,
+    # faster, with orjson.
+    'DEFAULT_RENDERER_CLASSES': (
+        'movie.api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_THROTTLE_CLASSES': (
+        ('Movie_Management_System.throttling.TokenBucketThrottle',) if THROTTLE_ENABLED else ()
+    ),
+    # Token buckets per user, or per IP for anonymous clients: N/period
+    # allows a burst of N requests, then one every period/N.
+    'DEFAULT_THROTTLE_RATES': {
+        'login': '10/min',
+        'register': '5/hour',
+        'rating-create': '30/min',
+        'rating-bulk': '10/min',
+        'report-create': '10/min',
+    },
+    'DEFAULT_PAGINATION_CLASS': 'movie.api.pagination.KeysetCursorPagination',
+    'PAGE_SIZE': 50,
 }
 
+# EmailOrUsernameModelBackend extends ModelBackend and also accepts plain
+# usernames, so it is the only backend: a failed login walks one backend
+# and hashes the password once.
 AUTHENTICATION_BACKENDS = [
-    'accounts.backends.EmailOrUsernameModelBackend',  
-    'django.contrib.auth.backends.ModelBackend',      
+    'accounts.backends.EmailOrUsernameModelBackend',
 ]
 
 SIMPLE_JWT = {
@@ -155,6 +298,18 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Serve the OpenAPI schema and Swagger UI. Turned off, together with the
+# documentation apps, by the lean settings_production profile.
+API_DOCS_ENABLED = True
+
+# The OpenAPI schema is generated once per code version and shared by the
+# worker processes through OPENAPI_SCHEMA_FILE, see
+# Movie_Management_System.schema. Set DJANGO_CODE_VERSION (for example to
+# the deployed commit) to skip hashing the source files at startup.
+CODE_VERSION = os.environ.get('DJANGO_CODE_VERSION', '')
+OPENAPI_SCHEMA_FILE = Path(tempfile.gettempdir()) / 'movie_management_system_openapi.json'
+OPENAPI_SCHEMA_MAX_AGE = 86400
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Movie Management System API',
     'DESCRIPTION': 'Documenting Movie Management System APIs',
@@ -0,0 +1,36 @@
+"""
+Lean settings for production workers, which only serve the JSON API.
+
+Select it with ``DJANGO_SETTINGS_MODULE=Movie_Management_System.settings_production``.
+It extends the default settings and leaves out what a worker does not need
+to serve API requests: the documentation apps (drf_yasg, drf_spectacular)
+with their YAML, jsonschema and inflection dependencies, the /api/schema/
+and Swagger UI routes, and the browsable API. The views take
+``extend_schema`` from Movie_Management_System.openapi, which does nothing
+here, so no drf_spectacular module is imported. Run ``python -m
+benchmarks.startup`` to compare the startup time and memory of both profiles.
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, REST_FRAMEWORK
+
+DEBUG = False
+
+# Server-Timing exposes query counts; only staff get it in production.
+REQUEST_METRICS_SERVER_TIMING = False
+
+ALLOWED_HOSTS = list(filter(None, os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',')))
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ('drf_yasg', 'drf_spectacular')]
+
+# See Movie_Management_System/urls.py.
+API_DOCS_ENABLED = False
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ('movie.api.renderers.ORJSONRenderer',),
+    # DRF's own class is already loaded; drf_spectacular's would pull in the
+    # whole schema generator.
+    'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.openapi.AutoSchema',
+}
@@ -0,0 +1,34 @@
+"""
+Test runner for ``manage.py test``, see TEST_RUNNER in settings.
+"""
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class IsolatedStateTestRunner(DiscoverRunner):
+    """
+    DiscoverRunner that moves the file based caches (responses, catalog
+    version, throttle buckets) and OPENAPI_SCHEMA_FILE into a temporary
+    directory for the duration of the run, so that test runs share no state
+    with each other or with a development server on the same machine.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.state_dir = Path(tempfile.mkdtemp(prefix='movie_management_system_test_'))
+        caches = {
+            alias: {**config, 'LOCATION': self.state_dir / alias} if config['BACKEND'].endswith('FileBasedCache') else config
+            for alias, config in settings.CACHES.items()
+        }
+        self.isolated_state = override_settings(CACHES=caches, OPENAPI_SCHEMA_FILE=self.state_dir / 'openapi.json')
+        self.isolated_state.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.isolated_state.disable()
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,58 @@
+"""
+Token-bucket rate limiting for DRF views.
+
+A view opts in with a ``throttle_scope``; its rate comes from
+REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] as for DRF's ScopedRateThrottle.
+A rate of ``N/period`` is a bucket of N tokens per user (or per client IP
+for anonymous requests) that refills continuously at N per period: a client
+can burst N requests, then sustain one every period/N. A rejected request
+is answered ``429 Too Many Requests`` with a ``Retry-After`` header.
+
+Buckets live in the ``throttle`` cache, shared by the worker processes
+without touching the database. A bucket is read and then written, not
+updated atomically, so concurrent requests of one client in different
+processes can occasionally spend the same token.
+"""
+import math
+
+from django.core.cache import caches
+from rest_framework.throttling import ScopedRateThrottle
+
+
+class TokenBucketThrottle(ScopedRateThrottle):
+    """
+    ScopedRateThrottle with a token bucket, stored as ``(tokens, updated_at)``,
+    instead of a list of request times. Views without a scope, and scopes
+    whose rate is None, are not throttled.
+    """
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    @property
+    def cache(self):
+        return caches['throttle']
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        if self.num_requests is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+
+        refill = self.num_requests / self.duration
+        self.now = self.timer()
+        tokens, updated_at = self.cache.get(self.key, (self.num_requests, self.now))
+        tokens = min(self.num_requests, tokens + (self.now - updated_at) * refill)
+        if tokens < 1:
+            self.wait_seconds = (1 - tokens) / refill
+            return False
+        tokens -= 1
+        # The entry expires once the bucket would be full again, which is
+        # the same as having no entry.
+        self.cache.set(self.key, (tokens, self.now), math.ceil((self.num_requests - tokens) / refill))
+        return True
+
+    def wait(self):
+        return self.wait_seconds
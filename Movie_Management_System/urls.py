@@ -17,10 +17,10 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 from django.conf.urls.static import static
 from django.conf import settings
 
+from .metrics import MetricsView
 
 
 urlpatterns = [
@@ -28,8 +28,19 @@ urlpatterns = [
     path('api/', include('movie.api.urls')),
     path('accounts/', include('accounts.api.urls')),
 
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
 ]
+
+# The documentation stack is only imported when it is served, so that lean
+# profiles (settings_production) start without it.
+if settings.API_DOCS_ENABLED:
+    from drf_spectacular.views import SpectacularSwaggerView
+
+    from .schema import CachedSchemaView
+
+    urlpatterns += [
+        path('api/schema/', CachedSchemaView.as_view(), name='schema'),
+        path('', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    ]
     
 
@@ -18,9 +18,12 @@ class LoginSerializer(serializers.Serializer):
         email_or_username = data.get('email_or_username')
         password = data.get('password')
 
-        user = authenticate(username=email_or_username, password=password) or \
-               authenticate(email=email_or_username, password=password)
-               
+        user = authenticate(
+            request=self.context.get('request'),
+            username=email_or_username,
+            password=password,
+        )
+
         if not user:
             raise AuthenticationFailed('Invalid credentials')
         
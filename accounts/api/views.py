@@ -3,12 +3,13 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from drf_spectacular.utils import extend_schema
+from Movie_Management_System.openapi import extend_schema
 
 from .serializers import LoginSerializer, RegisterSerializer
 
 class LoginView(APIView):
     permission_classes = []  # No restriction for login
+    throttle_scope = 'login'
     
     @extend_schema(
         summary="Login user with username or email and password",
@@ -17,7 +18,7 @@ class LoginView(APIView):
     )
 
     def post(self, request):
-        serializer = LoginSerializer(data=request.data)
+        serializer = LoginSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
         
@@ -30,6 +31,7 @@ class LoginView(APIView):
 
 class RegisterView(APIView):
     permission_classes = []  # No restriction for registration
+    throttle_scope = 'register'
 
     @extend_schema(
         summary="Register a new user with username, email, and password",
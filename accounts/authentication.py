@@ -0,0 +1,62 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+# Cache alias shared by all workers (see CACHES). Entries are dropped on every
+# User save/delete. QuerySet.update() and raw SQL send no signals: call
+# invalidate_cached_user() after them, or the change shows once the TTL expires.
+USER_CACHE_ALIAS = 'users'
+
+
+def user_cache_key(user_id):
+    return f'accounts:user:{user_id}'
+
+
+def invalidate_cached_user(user_id):
+    caches[USER_CACHE_ALIAS].delete(user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves ``request.user`` from a short-TTL
+    cache keyed by the token's user id, so authenticated requests skip the
+    user lookup query on a cache hit. Deactivating or demoting a user with
+    ``save()`` takes effect on the next request in every worker.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        cache = caches[USER_CACHE_ALIAS]
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            # Only users that pass simplejwt's checks (exists, active) are cached.
+            user = super().get_user(validated_token)
+            cache.set(key, user)
+        return user
+
+    async def aauthenticate(self, request):
+        """
+        Async counterpart of ``authenticate()`` for async views. Token
+        validation is pure CPU work, and a user cache hit is a local file
+        read, so only a cache miss hops to a thread for the database lookup.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = caches[USER_CACHE_ALIAS].get(user_cache_key(user_id)) if user_id is not None else None
+        if user is None:
+            user = await sync_to_async(self.get_user)(validated_token)
+        return user, validated_token
@@ -1,19 +1,30 @@
 # accounts/backends.py
 from django.contrib.auth.backends import ModelBackend
+from django.db.models import Q
 from .models import User  # import your custom user model
 
 class EmailOrUsernameModelBackend(ModelBackend):
+    """
+    Authenticate with either a username or an email address.
+
+    Each attempt costs one user lookup (username OR email in a single query)
+    and exactly one password hash, whether or not the user exists.
+    """
     def authenticate(self, request, username=None, password=None, **kwargs):
-        user = None
-        if username:
-            try:
-                user = User.objects.get(username=username)
-            except User.DoesNotExist:
-                try:
-                    user = User.objects.get(email=username)
-                except User.DoesNotExist:
-                    return None
+        if username is None:
+            username = kwargs.get('email', kwargs.get(User.USERNAME_FIELD))
+        if username is None or password is None:
+            return None
+
+        candidates = list(User.objects.filter(Q(username=username) | Q(email=username))[:2])
+        # A username match wins over another account whose email is the same string.
+        user = next((c for c in candidates if c.username == username), candidates[0] if candidates else None)
+
+        if user is None:
+            # Hash anyway so unknown users take as long as a wrong password.
+            User().set_password(password)
+            return None
 
-        if user and user.check_password(password):
+        if user.check_password(password):
             return user
         return None
@@ -1,3 +1,98 @@
-from django.test import TestCase
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from accounts.api import urls
+from accounts.authentication import invalidate_cached_user
+from accounts.models import User
+from benchmarks.dataset import seed
+from benchmarks.endpoints import endpoints_for, run_endpoint
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Every accounts API route must stay within the query budget declared in
+    benchmarks/endpoints.py.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = seed(users=5, movies=2, ratings_per_movie=1, reports=1)
+
+    def test_every_route_has_a_budget(self):
+        routes = {str(pattern.pattern) for pattern in urls.urlpatterns}
+        covered = {endpoint.route for endpoint in endpoints_for('accounts')}
+        self.assertEqual(routes - covered, set())
+
+    def test_endpoints_stay_within_budget(self):
+        for endpoint in endpoints_for('accounts'):
+            with self.subTest(endpoint.name):
+                result = run_endpoint(endpoint, self.dataset)
+                self.assertEqual(result.status, endpoint.status)
+                self.assertLessEqual(
+                    len(result.queries), endpoint.budget,
+                    '\n'.join(query['sql'] for query in result.queries),
+                )
+
+
+# A fast hasher, so that ten logins do not take ten PBKDF2 runs.
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class LoginThrottleTests(TestCase):
+    """
+    Logins are limited to 10 per minute per client IP.
+    """
+
+    def setUp(self):
+        caches['throttle'].clear()
+
+    def login(self, **extra):
+        return APIClient().post('/accounts/login/', {'email_or_username': 'nobody', 'password': 'wrong'},
+                                format='json', **extra)
+
+    def test_eleventh_login_in_a_minute_is_throttled_without_queries(self):
+        for _ in range(10):
+            self.assertEqual(self.login().status_code, 401)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        self.assertEqual(queries.captured_queries, [])
+
+    def test_buckets_are_per_client_ip(self):
+        for _ in range(10):
+            self.login()
+        self.assertEqual(self.login().status_code, 429)
+        self.assertEqual(self.login(REMOTE_ADDR='10.0.0.2').status_code, 401)
+
+
+class CachedUserTests(TestCase):
+    """
+    Changes to a user reach requests authenticated from the user cache.
+    """
+
+    def setUp(self):
+        caches['users'].clear()
+        self.admin = User.objects.create_user('admin', 'admin@example.com', is_staff=True)
+        self.client = APIClient(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.admin)}')
+        # Cache the user.
+        self.assertEqual(self.client.get('/api/admin-report/queue/').status_code, 200)
+
+    def test_deactivated_user_is_rejected(self):
+        self.admin.is_active = False
+        self.admin.save()
+        self.assertEqual(self.client.get('/api/admin-report/queue/').status_code, 401)
+
+    def test_demoted_admin_loses_access(self):
+        self.admin.is_staff = False
+        self.admin.save()
+        self.assertEqual(self.client.get('/api/admin-report/queue/').status_code, 403)
+
+    def test_queryset_update_takes_effect_once_invalidated(self):
+        User.objects.filter(pk=self.admin.pk).update(is_staff=False)
+        self.assertEqual(self.client.get('/api/admin-report/queue/').status_code, 200)
+        invalidate_cached_user(self.admin.pk)
+        self.assertEqual(self.client.get('/api/admin-report/queue/').status_code, 403)
@@ -0,0 +1,94 @@
+"""
+Throughput of the sync DRF read views vs. their async counterparts under ASGI.
+
+Requests go through Django's ASGI handler (``AsyncClient``) with up to
+``--concurrency`` requests in flight. Under ASGI, sync views run one at a
+time on the handler's worker thread; async views only hop to it for their
+queries. Every request carries a distinct query string, so none of them is
+answered from the response cache.
+
+    python -m benchmarks.async_views [--requests N] [--concurrency C]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.utils import percentile, print_table, setup_django, test_database
+
+
+def seed():
+    from accounts.models import User
+    from movie.models import Movie, Rating
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    owner = User.objects.create_user('bench', 'bench@example.com', 'correct-horse')
+    raters = User.objects.bulk_create(
+        User(username=f'rater{i}', email=f'rater{i}@example.com') for i in range(50)
+    )
+    movies = Movie.objects.bulk_create(
+        Movie(title=f'Movie {i}', description='...', released_at='2020-01-01',
+              genre='drama', language='en', created_by=owner)
+        for i in range(200)
+    )
+    Rating.objects.bulk_create(Rating(user=user, movie=movies[0], rating=4) for user in raters)
+    Movie.rebuild_rating_aggregates()
+    return movies[0].pk, str(RefreshToken.for_user(owner).access_token)
+
+
+async def run_scenario(client, url, headers, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    timings = []
+
+    async def one(n):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(url, {'bench': n}, headers=headers)
+            timings.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, (url, response.status_code)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(n) for n in range(requests)))
+    elapsed = time.perf_counter() - start
+    timings.sort()
+    return {
+        'req/s': requests / elapsed,
+        'p50 ms': percentile(timings, 50),
+        'p95 ms': percentile(timings, 95),
+    }
+
+
+async def run(requests, concurrency):
+    from asgiref.sync import sync_to_async
+    from django.test import AsyncClient
+
+    movie_id, token = await sync_to_async(seed)()
+    headers = {'Authorization': f'Bearer {token}'}
+    endpoints = [
+        ('movie list', '/api/movies/', '/api/async/movies/'),
+        ('movie detail', f'/api/movie/{movie_id}/', f'/api/async/movie/{movie_id}/'),
+        ('rating list', f'/api/{movie_id}/rating/', f'/api/async/{movie_id}/rating/'),
+    ]
+
+    client = AsyncClient()
+    rows = []
+    for endpoint, sync_url, async_url in endpoints:
+        for label, url in (('sync', sync_url), ('async', async_url)):
+            stats = await run_scenario(client, url, headers, requests, concurrency)
+            rows.append({'endpoint': endpoint, 'view': label, **stats})
+
+    print_table(rows, ['endpoint', 'view', 'req/s', 'p50 ms', 'p95 ms'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        asyncio.run(run(args.requests, args.concurrency))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Synthetic dataset for benchmarks and query-budget tests.
+
+Everything is written with ``bulk_create`` in a handful of statements, and
+all users share one precomputed password hash, so seeding tens of thousands
+of rows takes seconds.
+"""
+import datetime
+import random
+from dataclasses import dataclass
+
+PASSWORD = 'correct-horse-battery'
+
+GENRES = ['action', 'comedy', 'drama', 'horror', 'sci-fi', 'documentary']
+LANGUAGES = ['en', 'fr', 'de', 'es', 'ja']
+
+
+@dataclass
+class Dataset:
+    admin: object
+    member: object
+    users: list
+    movie_ids: list
+    rating_ids: list
+    report_ids: list
+
+    @property
+    def movie_id(self):
+        """
+        A movie owned by ``member`` that ``member`` has rated and reported.
+        """
+        return self.movie_ids[0]
+
+    @property
+    def unrated_movie_id(self):
+        """
+        A movie that ``member`` has neither rated nor reported.
+        """
+        return self.movie_ids[-1]
+
+    @property
+    def rating_id(self):
+        """
+        ``member``'s rating of ``movie_id``.
+        """
+        return self.rating_ids[0]
+
+    @property
+    def report_id(self):
+        """
+        ``member``'s pending report on ``movie_id``.
+        """
+        return self.report_ids[0]
+
+
+def seed(users=50, movies=200, ratings_per_movie=20, reports=100, batch_size=1000, random_seed=0):
+    """
+    Create a dataset and return a ``Dataset`` describing it.
+
+    ``users`` includes the ``admin`` and ``member`` accounts, both of which
+    log in with ``PASSWORD``. ``member`` owns every movie, rates the first
+    ``movies - 1`` of them and files the first report, leaving the last movie
+    untouched. Leaderboards are refreshed once everything is written.
+    """
+    from django.contrib.auth.hashers import make_password
+    from django.db import transaction
+
+    from accounts.models import User
+    from movie.leaderboards import refresh_leaderboards
+    from movie.models import Movie, Rating, Report
+
+    rng = random.Random(random_seed)
+    users = max(users, 2)
+    ratings_per_movie = min(ratings_per_movie, users - 1)
+    password = make_password(PASSWORD)
+
+    with transaction.atomic():
+        User.objects.bulk_create(
+            [User(username='admin', email='admin@example.com', password=password,
+                  is_staff=True, is_superuser=True),
+             User(username='member', email='member@example.com', password=password)] +
+            [User(username=f'user{i}', email=f'user{i}@example.com', password=password)
+             for i in range(users - 2)],
+            batch_size=batch_size,
+        )
+        user_list = list(User.objects.order_by('id'))
+        admin, member = user_list[0], user_list[1]
+        raters = user_list[1:]
+
+        start = datetime.date(1980, 1, 1)
+        Movie.objects.bulk_create(
+            (Movie(title=f'Movie {i}', description=f'Synthetic movie number {i}.',
+                   released_at=start + datetime.timedelta(days=rng.randrange(16000)),
+                   duration_hours=rng.randrange(1, 4), duration_minutes=rng.randrange(60),
+                   genre=rng.choice(GENRES), language=rng.choice(LANGUAGES), created_by=member)
+             for i in range(movies)),
+            batch_size=batch_size,
+        )
+        movie_ids = list(Movie.objects.order_by('id').values_list('id', flat=True))
+
+        # ``member`` rates every movie but the last; other raters are sampled.
+        ratings = []
+        for movie_id in movie_ids[:-1]:
+            others = rng.sample(raters[1:], ratings_per_movie - 1) if ratings_per_movie > 1 else []
+            for user in [member] + others:
+                ratings.append(Rating(user=user, movie_id=movie_id, rating=rng.randint(1, 5)))
+        Rating.objects.bulk_create(ratings, batch_size=batch_size)
+        Movie.rebuild_rating_aggregates()
+        Rating.rebuild_rollups()
+
+        pairs = [(member, movie_ids[0])]
+        seen = {(member.pk, movie_ids[0])}
+        while len(pairs) < min(reports, len(raters) * (len(movie_ids) - 1)):
+            user, movie_id = rng.choice(raters), rng.choice(movie_ids[:-1])
+            if (user.pk, movie_id) not in seen:
+                seen.add((user.pk, movie_id))
+                pairs.append((user, movie_id))
+        Report.objects.bulk_create(
+            (Report(user=user, movie_id=movie_id, reason='Synthetic report',
+                    status=rng.choice(Report.Status.values) if n else Report.Status.PENDING)
+             for n, (user, movie_id) in enumerate(pairs)),
+            batch_size=batch_size,
+        )
+        refresh_leaderboards()
+
+    return Dataset(
+        admin=admin,
+        member=member,
+        users=user_list,
+        movie_ids=movie_ids,
+        rating_ids=list(Rating.objects.order_by('id').values_list('id', flat=True)),
+        report_ids=list(Report.objects.order_by('id').values_list('id', flat=True)),
+    )
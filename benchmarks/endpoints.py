@@ -0,0 +1,314 @@
+"""
+Latency and SQL query counts for every API route, checked against budgets.
+
+Each entry in ENDPOINTS declares one request against a route from
+``movie/api/urls.py`` or ``accounts/api/urls.py``, the status it must
+return and the most SQL queries it may run. Requests go through the test
+client. Writes run inside a transaction that is rolled back, so every
+iteration sees the same seeded data.
+
+Query counts are taken from a cold request, with the response and user
+caches cleared. Latency covers ``--iterations`` further requests and
+includes cache hits. The command exits with status 1 when any endpoint
+returns an unexpected status or goes over its budget. movie/tests.py and
+accounts/tests.py enforce the same budgets in the test suite.
+
+    python -m benchmarks.endpoints [--iterations N] [--users N] [--movies N]
+                                   [--ratings-per-movie N] [--reports N]
+"""
+import argparse
+import sys
+from dataclasses import dataclass, field
+
+from benchmarks.dataset import PASSWORD
+from benchmarks.utils import measure, print_table, setup_django, test_database
+
+ANONYMOUS, MEMBER, ADMIN = 'anonymous', 'member', 'admin'
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """
+    One request against ``route``, the pattern as declared in the app's
+    ``urlpatterns``. ``path`` is formatted with the Dataset as ``d``, and
+    ``data`` may be a callable taking the Dataset.
+    """
+    app: str
+    route: str
+    method: str
+    path: str
+    budget: int
+    status: int = 200
+    role: str = MEMBER
+    data: object = None
+    format: str = 'json'
+    label: str = ''
+
+    @property
+    def name(self):
+        return f'{self.method} {self.label or self.path}'
+
+
+def movie_payload(d):
+    return {
+        'title': 'Benchmark', 'description': 'Benchmark movie', 'released_at': '2020-01-01',
+        'genre': 'drama', 'language': 'en', 'created_by': d.member.pk,
+    }
+
+
+def bulk_ratings_payload(d):
+    return [{'movie_id': movie_id, 'rating': 4} for movie_id in d.movie_ids[:50]]
+
+
+def catalog_upload_payload(d):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    rows = ''.join(f'Imported {i},Partner movie,2021-05-0{i % 9 + 1},drama,en\n' for i in range(100))
+    return {'file': SimpleUploadedFile('movies.csv', f'title,description,released_at,genre,language\n{rows}'.encode())}
+
+
+def refresh_token_payload(d):
+    from rest_framework_simplejwt.tokens import RefreshToken
+    return {'refresh': str(RefreshToken.for_user(d.member))}
+
+
+# The comment above each endpoint lists the queries its budget allows.
+# "user" is the JWT user lookup, which a warm user cache skips; the
+# SAVEPOINT and RELEASE of a transaction.atomic() block count as queries.
+ENDPOINTS = [
+    # movie/api/urls.py
+    # The page of movies, selected as value rows.
+    Endpoint('movie', 'movies/', 'GET', '/api/movies/', budget=1, role=ANONYMOUS),
+    Endpoint('movie', 'movies/', 'GET', '/api/movies/?genre=drama&min_rating=2&ordering=-average_rating',
+             budget=1, role=ANONYMOUS, label='/api/movies/?<filters>'),
+    Endpoint('movie', 'movies/', 'GET', '/api/movies/?format=ndjson', budget=1, role=ANONYMOUS),
+    # The full-text match joined to the movies.
+    Endpoint('movie', 'movies/search/', 'GET', '/api/movies/search/?q=synthetic+movie', budget=1, role=ANONYMOUS),
+    # The leaderboard entries joined to their movies.
+    Endpoint('movie', 'movies/top-rated/', 'GET', '/api/movies/top-rated/', budget=1, role=ANONYMOUS),
+    Endpoint('movie', 'movies/trending/', 'GET', '/api/movies/trending/?limit=100', budget=1, role=ANONYMOUS),
+    # user, the created_by check, the INSERT.
+    Endpoint('movie', 'movie-create/', 'POST', '/api/movie-create/', budget=3, status=201, data=movie_payload),
+    # user, the movie.
+    Endpoint('movie', 'movie/<int:pk>/', 'GET', '/api/movie/{d.movie_id}/', budget=2),
+    # user, the movie, its owner for the permission check, the created_by
+    # check, the UPDATE.
+    Endpoint('movie', 'movie/<int:pk>/', 'PUT', '/api/movie/{d.movie_id}/', budget=5, data=movie_payload),
+    # user, the movie, its owner, the UPDATE.
+    Endpoint('movie', 'movie/<int:pk>/', 'PATCH', '/api/movie/{d.movie_id}/', budget=4, data={'genre': 'comedy'}),
+    # user, the movie, its owner, the ratings the deletion collector loads
+    # for their post_delete signals, then one DELETE each for the histogram,
+    # rollups, leaderboard entries, reports, ratings and the movie.
+    Endpoint('movie', 'movie/<int:pk>/', 'DELETE', '/api/movie/{d.movie_id}/', budget=10, status=204),
+    # The page of movies.
+    Endpoint('movie', 'async/movies/', 'GET', '/api/async/movies/', budget=1, role=ANONYMOUS),
+    # user, the movie.
+    Endpoint('movie', 'async/movie/<int:pk>/', 'GET', '/api/async/movie/{d.movie_id}/', budget=2),
+    # user, the page of ratings, then one prefetch each for their users and
+    # movies.
+    Endpoint('movie', 'async/<int:pk>/rating/', 'GET', '/api/async/{d.movie_id}/rating/', budget=4),
+    # user, the page of ratings joined to their users and movies.
+    Endpoint('movie', '<int:pk>/rating/', 'GET', '/api/{d.movie_id}/rating/', budget=2),
+    # user, SAVEPOINT, the previous rating, the aggregate UPDATE, the rating
+    # upsert, the histogram and rollup upserts, RELEASE, the saved rating
+    # joined to its user and movie.
+    Endpoint('movie', '<int:pk>/rating/', 'PUT', '/api/{d.movie_id}/rating/', budget=9, data={'rating': 3}),
+    # The histogram rows.
+    Endpoint('movie', '<int:pk>/rating/histogram/', 'GET', '/api/{d.movie_id}/rating/histogram/',
+             budget=1, role=ANONYMOUS),
+    # The rollup rows.
+    Endpoint('movie', '<int:pk>/rating/timeline/', 'GET', '/api/{d.movie_id}/rating/timeline/?period=week',
+             budget=1, role=ANONYMOUS),
+    # user, SAVEPOINT, the aggregate UPDATE, the INSERT, the histogram and
+    # rollup upserts, RELEASE, the movie for the response.
+    Endpoint('movie', '<int:pk>/rating-create/', 'POST', '/api/{d.unrated_movie_id}/rating-create/',
+             budget=8, status=201, data={'rating': 4}),
+    # user, the rating, then one prefetch each for its user and movie.
+    Endpoint('movie', 'rating/<int:pk>/', 'GET', '/api/rating/{d.rating_id}/', budget=4),
+    # user, the rating, its owner, SAVEPOINT, the guarded rating UPDATE, the
+    # aggregate UPDATE, the histogram and rollup upserts, RELEASE, the movie
+    # for the response.
+    Endpoint('movie', 'rating/<int:pk>/', 'PUT', '/api/rating/{d.rating_id}/', budget=10, data={'rating': 2}),
+    Endpoint('movie', 'rating/<int:pk>/', 'PATCH', '/api/rating/{d.rating_id}/', budget=10, data={'rating': 2}),
+    # user, the rating, its owner, SAVEPOINT, the rating the deletion
+    # collector loads for post_delete, the DELETE, the aggregate UPDATE, the
+    # histogram and rollup upserts, RELEASE.
+    Endpoint('movie', 'rating/<int:pk>/', 'DELETE', '/api/rating/{d.rating_id}/', budget=10, status=204),
+    # user, SAVEPOINT, the existing movies, the user's previous ratings, the
+    # rating upsert, the aggregate UPDATE, the histogram and rollup upserts,
+    # RELEASE.
+    Endpoint('movie', 'ratings/bulk/', 'POST', '/api/ratings/bulk/', budget=9, data=bulk_ratings_payload),
+    # user, the page of reports joined to their users and movies.
+    Endpoint('movie', '<int:pk>/report/', 'GET', '/api/{d.movie_id}/report/', budget=2),
+    # user, the movie, SAVEPOINT, the INSERT, RELEASE.
+    Endpoint('movie', '<int:pk>/report-create/', 'POST', '/api/{d.unrated_movie_id}/report-create/',
+             budget=5, status=201, data={'reason': 'Benchmark report'}),
+    # user, the report, then one prefetch each for its user and movie.
+    Endpoint('movie', 'report/<int:pk>/', 'GET', '/api/report/{d.report_id}/', budget=4),
+    # user, the report, its owner, the UPDATE, the movie for the response.
+    Endpoint('movie', 'report/<int:pk>/', 'PUT', '/api/report/{d.report_id}/', budget=5, data={'reason': 'Updated'}),
+    Endpoint('movie', 'report/<int:pk>/', 'PATCH', '/api/report/{d.report_id}/', budget=5, data={'reason': 'Updated'}),
+    # user, the report, its owner, the DELETE.
+    Endpoint('movie', 'report/<int:pk>/', 'DELETE', '/api/report/{d.report_id}/', budget=4, status=204),
+    # user, the page of reports joined to their users and movies.
+    Endpoint('movie', 'admin-report/', 'GET', '/api/admin-report/', budget=2, role=ADMIN),
+    Endpoint('movie', 'admin-report/queue/', 'GET', '/api/admin-report/queue/', budget=2, role=ADMIN),
+    # user, one UPDATE of the reports whose status changes.
+    Endpoint('movie', 'admin-report/bulk/', 'POST', '/api/admin-report/bulk/', budget=2, role=ADMIN,
+             data=lambda d: {'ids': d.report_ids, 'action': 'approve'}),
+    # user, the report, the UPDATE, then the report's user and movie for the
+    # response.
+    Endpoint('movie', 'report-approve/<int:pk>/', 'PUT', '/api/report-approve/{d.report_id}/',
+             budget=5, role=ADMIN),
+    Endpoint('movie', 'report-reject/<int:pk>/', 'PUT', '/api/report-reject/{d.report_id}/',
+             budget=5, role=ADMIN),
+    # user, the counts grouped by status.
+    Endpoint('movie', 'report-status/', 'GET', '/api/report-status/', budget=2, role=ADMIN),
+    # user, one iterator over the table.
+    Endpoint('movie', 'admin-catalog/export/', 'GET', '/api/admin-catalog/export/?model=ratings',
+             budget=2, role=ADMIN),
+    # user, the owners of the batch, SAVEPOINT, the 100 rows' bulk INSERT,
+    # which SQLite's variable limit splits in two, RELEASE.
+    Endpoint('movie', 'admin-catalog/import/', 'POST', '/api/admin-catalog/import/', budget=6, role=ADMIN,
+             data=catalog_upload_payload, format='multipart'),
+
+    # accounts/api/urls.py
+    # The user matching the username or email.
+    Endpoint('accounts', 'login/', 'POST', '/accounts/login/', budget=1, role=ANONYMOUS,
+             data={'email_or_username': 'member', 'password': PASSWORD}),
+    # The username and email uniqueness checks, the INSERT.
+    Endpoint('accounts', 'register/', 'POST', '/accounts/register/', budget=3, status=201, role=ANONYMOUS,
+             data={'username': 'newcomer', 'email': 'newcomer@example.com', 'password': PASSWORD}),
+    # None: the refresh token is checked without a database lookup.
+    Endpoint('accounts', 'token/refresh/', 'POST', '/accounts/token/refresh/', budget=0, role=ANONYMOUS,
+             data=refresh_token_payload),
+]
+
+
+def endpoints_for(app):
+    return [endpoint for endpoint in ENDPOINTS if endpoint.app == app]
+
+
+@dataclass
+class Result:
+    endpoint: Endpoint
+    status: int
+    queries: list
+    stats: dict = field(default_factory=dict)
+
+    @property
+    def over_budget(self):
+        return len(self.queries) > self.endpoint.budget
+
+    @property
+    def failed(self):
+        return self.status != self.endpoint.status or self.over_budget
+
+
+def auth_headers(dataset):
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    return {
+        ANONYMOUS: {},
+        MEMBER: {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(dataset.member)}'},
+        ADMIN: {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(dataset.admin)}'},
+    }
+
+
+def send(client, endpoint, dataset, headers, capture=None):
+    """
+    Issue ``endpoint``'s request inside a rolled-back transaction. Queries
+    are recorded into ``capture``, a CaptureQueriesContext, if given; the
+    wrapping transaction's own statements are not.
+    """
+    from contextlib import nullcontext
+    from django.db import transaction
+
+    data = endpoint.data(dataset) if callable(endpoint.data) else endpoint.data
+    kwargs = {'format': endpoint.format} if data is not None else {}
+    with transaction.atomic():
+        with capture if capture is not None else nullcontext():
+            response = getattr(client, endpoint.method.lower())(
+                endpoint.path.format(d=dataset), data, **kwargs, **headers[endpoint.role],
+            )
+            if response.streaming:
+                # Streamed bodies run their queries as they are consumed.
+                b''.join(response.streaming_content)
+        transaction.set_rollback(True)
+    return response
+
+
+def clear_caches():
+    from django.core.cache import caches
+    for alias in caches:
+        caches[alias].clear()
+
+
+def run_endpoint(endpoint, dataset, iterations=0, headers=None):
+    """
+    Send one cold request and return its Result, with latency statistics
+    over ``iterations`` more requests when ``iterations`` is positive.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    headers = headers or auth_headers(dataset)
+    clear_caches()
+    queries = CaptureQueriesContext(connection)
+    response = send(client, endpoint, dataset, headers, capture=queries)
+
+    result = Result(endpoint, response.status_code, queries.captured_queries)
+    if iterations > 0:
+        result.stats = measure(lambda: send(client, endpoint, dataset, headers), iterations)
+    return result
+
+
+def run(iterations, **dataset_options):
+    from benchmarks.dataset import seed
+
+    dataset = seed(**dataset_options)
+    headers = auth_headers(dataset)
+    results = [run_endpoint(endpoint, dataset, iterations, headers) for endpoint in ENDPOINTS]
+
+    print_table(
+        [{
+            'endpoint': r.endpoint.name,
+            'status': r.status,
+            'queries': len(r.queries),
+            'budget': r.endpoint.budget,
+            'p50 ms': r.stats['p50'],
+            'p95 ms': r.stats['p95'],
+            'p99 ms': r.stats['p99'],
+        } for r in results],
+        ['endpoint', 'status', 'queries', 'budget', 'p50 ms', 'p95 ms', 'p99 ms'],
+    )
+
+    failures = [r for r in results if r.failed]
+    for r in failures:
+        print(f'\nFAIL {r.endpoint.name}: status {r.status} (expected {r.endpoint.status}), '
+              f'{len(r.queries)} queries (budget {r.endpoint.budget})', file=sys.stderr)
+        for query in r.queries:
+            print(f'  {query["sql"]}', file=sys.stderr)
+    return not failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--movies', type=int, default=2000)
+    parser.add_argument('--ratings-per-movie', type=int, default=20)
+    parser.add_argument('--reports', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        ok = run(args.iterations, users=args.users, movies=args.movies,
+                 ratings_per_movie=args.ratings_per_movie, reports=args.reports)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
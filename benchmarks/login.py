@@ -0,0 +1,120 @@
+"""
+Login throughput before and after the single-pass login pipeline.
+
+"before" replays the previous pipeline: ``authenticate()`` called with
+``username=`` and then ``email=``, over both EmailOrUsernameModelBackend
+(one lookup by username, then one by email) and ModelBackend. "after"
+runs the current LoginSerializer. Each scenario reports throughput, latency,
+SQL queries and password hashes per attempt.
+
+    python -m benchmarks.login [--iterations N]
+"""
+import argparse
+from unittest import mock
+
+from benchmarks.utils import measure, print_table, setup_django, test_database
+
+
+def legacy_backend_class():
+    from django.contrib.auth.backends import ModelBackend
+    from accounts.models import User
+
+    class LegacyEmailOrUsernameModelBackend(ModelBackend):
+        def authenticate(self, request, username=None, password=None, **kwargs):
+            user = None
+            if username:
+                try:
+                    user = User.objects.get(username=username)
+                except User.DoesNotExist:
+                    try:
+                        user = User.objects.get(email=username)
+                    except User.DoesNotExist:
+                        return None
+
+            if user and user.check_password(password):
+                return user
+            return None
+
+    return LegacyEmailOrUsernameModelBackend
+
+
+def legacy_login(email_or_username, password):
+    from django.contrib.auth import authenticate
+    return authenticate(username=email_or_username, password=password) or \
+        authenticate(email=email_or_username, password=password)
+
+
+def current_login(email_or_username, password):
+    from rest_framework.exceptions import AuthenticationFailed
+    from accounts.api.serializers import LoginSerializer
+    serializer = LoginSerializer(data={'email_or_username': email_or_username, 'password': password})
+    try:
+        return serializer.is_valid()
+    except AuthenticationFailed:
+        return False
+
+
+def run(iterations):
+    from django.contrib.auth.hashers import PBKDF2PasswordHasher
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext, override_settings
+    from accounts.models import User
+
+    User.objects.create_user('bench', 'bench@example.com', 'correct-horse')
+    scenarios = [
+        ('username', 'bench', 'correct-horse'),
+        ('email', 'bench@example.com', 'correct-horse'),
+        ('wrong password', 'bench', 'wrong'),
+        ('unknown user', 'nobody@example.com', 'wrong'),
+    ]
+
+    legacy = legacy_backend_class()
+    legacy_path = f'{__name__}.LegacyEmailOrUsernameModelBackend'
+    globals()['LegacyEmailOrUsernameModelBackend'] = legacy
+    pipelines = [
+        ('before', legacy_login, {'AUTHENTICATION_BACKENDS': [legacy_path, 'django.contrib.auth.backends.ModelBackend']}),
+        ('after', current_login, {}),
+    ]
+
+    rows = []
+    for label, login, overrides in pipelines:
+        with override_settings(**overrides):
+            for scenario, identifier, password in scenarios:
+                hashes = []
+                original_encode = PBKDF2PasswordHasher.encode
+
+                def counting_encode(self, *args, **kwargs):
+                    hashes.append(1)
+                    return original_encode(self, *args, **kwargs)
+
+                with mock.patch.object(PBKDF2PasswordHasher, 'encode', counting_encode):
+                    with CaptureQueriesContext(connection) as queries:
+                        login(identifier, password)
+                    per_attempt_hashes = len(hashes)
+                    stats = measure(lambda: login(identifier, password), iterations)
+
+                rows.append({
+                    'pipeline': label,
+                    'scenario': scenario,
+                    'logins/s': stats['throughput'],
+                    'p50 ms': stats['p50'],
+                    'p95 ms': stats['p95'],
+                    'queries': len(queries),
+                    'hashes': per_attempt_hashes,
+                })
+
+    print_table(rows, ['pipeline', 'scenario', 'logins/s', 'p50 ms', 'p95 ms', 'queries', 'hashes'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(args.iterations)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Rows per second of the DRF list serializers vs. their ValuesSerializer fast
+path (movie/api/values.py), with and without ORJSONRenderer.
+
+Each path reads the same rows, in id order, from the seeded dataset. The
+DRF path loads model instances, with the view's eager loading, and
+serializes them with ``many=True``; the fast path reads ``values_list()``
+rows. Throughput is measured for serializing alone and for serializing plus
+rendering to JSON. That every path renders the same bytes is checked by
+ValuesSerializerTests in movie/tests.py.
+
+    python -m benchmarks.serializers [--iterations N] [--users N] [--movies N]
+                                     [--ratings-per-movie N] [--reports N]
+"""
+import argparse
+import time
+
+from benchmarks.utils import print_table, setup_django, test_database
+
+
+def cases():
+    from movie.api.serializers import MovieSerializer, RatingSerializer, ReportSerializer
+    from movie.models import Movie, Rating, Report
+
+    return [
+        ('MovieSerializer', MovieSerializer, Movie.objects.order_by('id')),
+        ('RatingSerializer', RatingSerializer, RatingSerializer.setup_eager_loading(Rating.objects.order_by('id'))),
+        ('ReportSerializer', ReportSerializer, ReportSerializer.setup_eager_loading(Report.objects.order_by('id'))),
+    ]
+
+
+def paths(serializer_class, queryset):
+    """
+    Return ``{name: (serialize, render)}``, where ``serialize()`` reads and
+    serializes every row and ``render(data)`` returns JSON bytes.
+    """
+    from rest_framework.renderers import JSONRenderer
+
+    from movie.api.renderers import ORJSONRenderer
+    from movie.api.values import values_serializer
+
+    fast = values_serializer(serializer_class)
+    drf = lambda: serializer_class(list(queryset), many=True).data  # noqa: E731
+    values = lambda: fast.serialize(fast.rows(queryset))  # noqa: E731
+    return {
+        'drf + json': (drf, JSONRenderer().render),
+        'values + json': (values, JSONRenderer().render),
+        'values + orjson': (values, ORJSONRenderer().render),
+    }
+
+
+def rows_per_second(func, rows, iterations):
+    best = float('inf')
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return rows / best if best else float('inf')
+
+
+def run(iterations, **dataset_options):
+    from benchmarks.dataset import seed
+
+    seed(**dataset_options)
+    table = []
+    for name, serializer_class, queryset in cases():
+        rows = queryset.count()
+        for path, (serialize, render) in paths(serializer_class, queryset).items():
+            table.append({
+                'serializer': name,
+                'path': path,
+                'rows': rows,
+                'serialize rows/s': rows_per_second(serialize, rows, iterations),
+                '+ render rows/s': rows_per_second(lambda: render(serialize()), rows, iterations),
+            })
+
+    print_table(table, ['serializer', 'path', 'rows', 'serialize rows/s', '+ render rows/s'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--movies', type=int, default=2000)
+    parser.add_argument('--ratings-per-movie', type=int, default=10)
+    parser.add_argument('--reports', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        run(args.iterations, users=args.users, movies=args.movies,
+            ratings_per_movie=args.ratings_per_movie, reports=args.reports)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Multi-process SQLite read/write throughput for two database profiles.
+
+"before" is the stock sqlite3 configuration (rollback journal, deferred
+transactions, a new connection per request). "after" is the
+``DATABASES['default']`` configuration from settings (WAL, busy timeout,
+IMMEDIATE transactions, persistent connections). Every worker process
+emulates request handling: it closes old connections around each operation
+as Django's request signals do, then runs either a catalog read or a
+rating upsert.
+
+    python -m benchmarks.sqlite_concurrency [--workers N] [--seconds S] [--write-ratio R]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from benchmarks.utils import print_table
+
+BEFORE = {'OPTIONS': {}, 'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False}
+
+
+def configure(db_path, profile):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Movie_Management_System.settings')
+    from django.conf import settings
+    settings.DATABASES['default'].update(profile, NAME=db_path)
+    import django
+    django.setup()
+
+
+def seed(db_path, users, movies):
+    configure(db_path, BEFORE)
+    from django.core.management import call_command
+    from accounts.models import User
+    from movie.models import Movie
+
+    call_command('migrate', verbosity=0)
+    User.objects.bulk_create([User(username=f'user{i}', email=f'user{i}@example.com') for i in range(users)])
+    owner = User.objects.first()
+    Movie.objects.bulk_create([
+        Movie(title=f'Movie {i}', description='Synthetic', released_at='2000-01-01',
+              genre='drama', language='en', created_by=owner)
+        for i in range(movies)
+    ])
+
+
+def worker(db_path, profile, seconds, write_ratio, seed_value, results):
+    configure(db_path, profile)
+    from django.db import OperationalError, close_old_connections
+    from accounts.models import User
+    from movie.models import Movie, Rating
+
+    rng = random.Random(seed_value)
+    user_ids = list(User.objects.values_list('pk', flat=True))
+    movie_ids = list(Movie.objects.values_list('pk', flat=True))
+    users = {pk: User(pk=pk) for pk in user_ids}
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        close_old_connections()
+        try:
+            if rng.random() < write_ratio:
+                Rating.upsert(users[rng.choice(user_ids)], rng.choice(movie_ids), rng.randint(1, 5))
+                counts['writes'] += 1
+            else:
+                list(Movie.objects.order_by('-id')[:20])
+                counts['reads'] += 1
+        except OperationalError:
+            counts['errors'] += 1
+        close_old_connections()
+
+    results.put(counts)
+
+
+def run_profile(label, seeded_path, profile, args):
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, 'bench.sqlite3')
+    shutil.copy(seeded_path, db_path)
+
+    ctx = multiprocessing.get_context('spawn')
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=worker, args=(db_path, profile, args.seconds, args.write_ratio, i, results))
+        for i in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    totals = {'reads': 0, 'writes': 0, 'errors': 0}
+    for _ in processes:
+        for key, value in results.get().items():
+            totals[key] += value
+    for process in processes:
+        process.join()
+    shutil.rmtree(workdir)
+
+    return {
+        'profile': label,
+        'reads/s': totals['reads'] / args.seconds,
+        'writes/s': totals['writes'] / args.seconds,
+        'locked errors': totals['errors'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--movies', type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    seeded_path = os.path.join(workdir, 'seed.sqlite3')
+    ctx = multiprocessing.get_context('spawn')
+    seeder = ctx.Process(target=seed, args=(seeded_path, args.users, args.movies))
+    seeder.start()
+    seeder.join()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Movie_Management_System.settings')
+    from django.conf import settings
+    default = settings.DATABASES['default']
+    after = {key: default[key] for key in ('OPTIONS', 'CONN_MAX_AGE', 'CONN_HEALTH_CHECKS') if key in default}
+
+    rows = [
+        run_profile('before', seeded_path, BEFORE, args),
+        run_profile('after', seeded_path, after, args),
+    ]
+    shutil.rmtree(workdir)
+
+    print(f'{args.workers} processes, {args.seconds:g}s each, {args.write_ratio:.0%} writes')
+    print_table(rows, ['profile', 'reads/s', 'writes/s', 'locked errors'])
+
+
+if __name__ == '__main__':
+    main()
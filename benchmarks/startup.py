@@ -0,0 +1,81 @@
+"""
+Cold-start time and memory of a WSGI worker for each settings profile.
+
+Every run starts a fresh interpreter that imports
+``Movie_Management_System.wsgi`` (settings, app registry, ``application``)
+and then loads the URLconf, as the first request would. It reports the
+median time of both steps, the peak RSS, the number of imported modules and
+how many of them belong to the documentation stack (drf_yasg,
+drf_spectacular and their YAML, jsonschema, inflection and uritemplate
+dependencies). DRF itself imports yaml, inflection and uritemplate when
+they are installed, so those remain in every profile.
+
+    python -m benchmarks.startup [--runs N] [--profile SETTINGS_MODULE ...]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.utils import print_table
+
+PROFILES = ['Movie_Management_System.settings', 'Movie_Management_System.settings_production']
+
+DOC_PACKAGES = ('drf_yasg', 'drf_spectacular', 'yaml', 'jsonschema', 'inflection', 'uritemplate')
+
+CHILD = f'''
+import json, resource, sys, time
+
+start = time.perf_counter()
+import Movie_Management_System.wsgi
+imported = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+ready = time.perf_counter()
+
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'ready_ms': (ready - start) * 1000,
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere.
+    'rss_mib': rss / (1 << 20 if sys.platform == 'darwin' else 1 << 10),
+    'modules': len(sys.modules),
+    'doc_modules': sum(name.split('.')[0] in {DOC_PACKAGES!r} for name in sys.modules),
+}}))
+'''
+
+
+def start_worker(settings_module):
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module}
+    output = subprocess.run([sys.executable, '-c', CHILD], env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def run(profiles, runs):
+    # Alternate between the profiles so that drift in machine load affects
+    # them all alike.
+    samples = {profile: [] for profile in profiles}
+    for _ in range(runs):
+        for profile in profiles:
+            samples[profile].append(start_worker(profile))
+    table = []
+    for profile in profiles:
+        row = {'profile': profile}
+        for key in ('import_ms', 'ready_ms', 'rss_mib', 'modules', 'doc_modules'):
+            row[key] = statistics.median(sample[key] for sample in samples[profile])
+        table.append(row)
+    print_table(table, ['profile', 'import_ms', 'ready_ms', 'rss_mib', 'modules', 'doc_modules'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--profile', action='append', help='Settings module to measure (default: both profiles).')
+    args = parser.parse_args()
+    run(args.profile or PROFILES, args.runs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Shared helpers for the benchmark scripts in this package.
+
+Benchmarks run against a throwaway test database, never ``db.sqlite3``.
+Run them from the project root, e.g. ``python -m benchmarks.login``.
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+
+def setup_django(settings_module='Movie_Management_System.settings'):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    # Benchmarks repeat requests far faster than the throttle rates allow.
+    os.environ.setdefault('DJANGO_THROTTLE', '0')
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """
+    Create the test database (running all migrations) for the duration of
+    the block and destroy it afterwards.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(func, iterations):
+    """
+    Call ``func`` ``iterations`` times and return latency statistics in ms.
+    """
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    total = sum(timings)
+    return {
+        'n': iterations,
+        'mean': statistics.fmean(timings),
+        'p50': percentile(timings, 50),
+        'p95': percentile(timings, 95),
+        'p99': percentile(timings, 99),
+        'throughput': iterations / (total / 1000) if total else float('inf'),
+    }
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def print_table(rows, columns):
+    """
+    Print ``rows`` (a list of dicts) as an aligned text table.
+    """
+    formatted = [
+        [f'{row[c]:.2f}' if isinstance(row[c], float) else str(row[c]) for c in columns]
+        for row in rows
+    ]
+    widths = [max(len(c), *(len(r[i]) for r in formatted)) for i, c in enumerate(columns)]
+    print('  '.join(c.ljust(w) for c, w in zip(columns, widths)))
+    for r in formatted:
+        print('  '.join(v.ljust(w) for v, w in zip(r, widths)))
@@ -1,6 +1,7 @@
 from django.contrib import admin
-from .models import Movie, Rating, Report
+from .models import LeaderboardEntry, Movie, Rating, Report
 
 admin.site.register(Movie)
 admin.site.register(Rating)
-admin.site.register(Report)
\ No newline at end of file
+admin.site.register(Report)
+admin.site.register(LeaderboardEntry)
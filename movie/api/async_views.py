@@ -0,0 +1,141 @@
+"""
+Async implementations of the catalog read endpoints, for ASGI deployments.
+
+They return the same payloads, cursors and cache headers as MovieListView,
+MovieDetailView and MovieRatingListView, but query through the async ORM,
+so a slow client does not hold a worker thread while it waits. DRF views
+are sync-only, so these are plain Django async views.
+
+Responses are cached per URL like the sync views', so an async and a sync
+URL are cached separately: the pagination links in a payload point back at
+the view that built it. Both share the catalog version, so one write
+invalidates both.
+"""
+import abc
+
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from django.views import View
+
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+
+from Movie_Management_System.routers import read_from_primary
+from accounts.authentication import CachedJWTAuthentication
+from movie.cache import aget_catalog_state
+from movie.models import Movie, Rating
+from .caching import catalog_etag, response_cache_key
+from .filters import MovieFilterBackend, MovieOrderingFilter
+from .pagination import KeysetCursorPagination
+from .serializers import MovieSerializer, RatingSerializer
+
+
+class AsyncAPIView(abc.ABC, View):
+    """
+    Minimal async counterpart of APIView: JWT authentication, DRF-style
+    error bodies and JSON rendering. Subclasses implement ``aget``.
+    """
+    authentication_required = False
+    authenticator = CachedJWTAuthentication()
+
+    async def get(self, request, *args, **kwargs):
+        request = Request(request)
+        try:
+            if self.authentication_required:
+                await self.authenticate(request)
+            return await self.aget(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            # Same body as DRF's exception_handler.
+            data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+            response = JsonResponse(data, safe=False, status=exc.status_code, encoder=JSONEncoder)
+            if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                response['WWW-Authenticate'] = self.authenticator.authenticate_header(request)
+            return response
+
+    async def authenticate(self, request):
+        result = await self.authenticator.aauthenticate(request._request)
+        if result is None:
+            raise exceptions.NotAuthenticated()
+        request.user, request.auth = result
+
+    @abc.abstractmethod
+    async def aget(self, request, *args, **kwargs):
+        """
+        Handle a GET with the DRF request and return a response.
+        """
+
+    def render(self, data):
+        return JsonResponse(data, safe=False, encoder=JSONEncoder)
+
+
+class AsyncCatalogView(AsyncAPIView):
+    """
+    Async counterpart of CatalogCacheMixin. Subclasses implement
+    ``build_data``.
+    """
+    cache_timeout = 300
+
+    async def aget(self, request, *args, **kwargs):
+        state = await aget_catalog_state()
+        etag = catalog_etag(state, request.build_absolute_uri())
+
+        not_modified = get_conditional_response(request._request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        cache_key = response_cache_key(etag)
+        data = await cache.aget(cache_key)
+        if data is None:
+            read_from_primary()
+            data = await self.build_data(request, *args, **kwargs)
+            await cache.aset(cache_key, data, self.cache_timeout)
+
+        response = self.render(data)
+        response['ETag'] = etag
+        return response
+
+    @abc.abstractmethod
+    async def build_data(self, request, *args, **kwargs):
+        """
+        Return the response data to cache and render.
+        """
+
+
+class AsyncMovieListView(AsyncCatalogView):
+    """
+    Async movie list, with the same filters and ordering as MovieListView.
+    """
+    filter_backends = [MovieFilterBackend, MovieOrderingFilter]
+    ordering = ('-id',)
+
+    async def build_data(self, request, *args, **kwargs):
+        queryset = Movie.objects.all()
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(request, queryset, self)
+        paginator = KeysetCursorPagination()
+        movies = await paginator.apaginate_queryset(queryset, request, self)
+        return paginator.get_async_paginated_data(MovieSerializer(movies, many=True).data)
+
+
+class AsyncMovieDetailView(AsyncCatalogView):
+    authentication_required = True
+
+    async def build_data(self, request, pk, *args, **kwargs):
+        try:
+            movie = await Movie.objects.aget(pk=pk)
+        except Movie.DoesNotExist:
+            raise exceptions.NotFound('No Movie matches the given query.')
+        return MovieSerializer(movie).data
+
+
+class AsyncMovieRatingListView(AsyncAPIView):
+    authentication_required = True
+
+    async def aget(self, request, pk, *args, **kwargs):
+        queryset = RatingSerializer.setup_eager_loading(Rating.objects.filter(movie_id=pk))
+        paginator = KeysetCursorPagination()
+        ratings = await paginator.apaginate_queryset(queryset, request)
+        data = paginator.get_async_paginated_data(RatingSerializer(ratings, many=True).data)
+        return self.render(data)
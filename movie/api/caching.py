@@ -0,0 +1,61 @@
+import hashlib
+
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from Movie_Management_System.routers import read_from_primary
+from movie.cache import get_catalog_state
+
+
+def catalog_etag(state, url):
+    return '"%s"' % hashlib.md5(f"{state['version']}:{url}".encode()).hexdigest()
+
+
+def response_cache_key(etag):
+    return f'movie:response:{etag}'
+
+
+class CatalogCacheMixin:
+    """
+    Cache successful GET responses of catalog read views and answer
+    conditional requests.
+
+    The ETag and cache key are derived from the catalog version and the full
+    request URL, so a matching ``If-None-Match`` is answered with 304 before
+    the queryset or serializer is touched. Authentication and permission
+    checks still run first, since they happen before the handler is called.
+    Streamed responses (see StreamingListMixin) are not cached. A cache miss
+    is read from the primary database: the catalog version is bumped as soon
+    as a write commits, so a replica that has not caught up yet would
+    otherwise store its stale page under the new version.
+    """
+    cache_timeout = 300
+
+    def get(self, request, *args, **kwargs):
+        if getattr(request.accepted_renderer, 'streaming', False):
+            return super().get(request, *args, **kwargs)
+
+        state = get_catalog_state()
+        url = request.build_absolute_uri()
+        etag = catalog_etag(state, url)
+
+        not_modified = get_conditional_response(request._request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        cache_key = response_cache_key(etag)
+        data = cache.get(cache_key)
+        if data is None:
+            read_from_primary()
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            cache.set(cache_key, response.data, self.cache_timeout)
+        else:
+            response = Response(data, status=status.HTTP_200_OK)
+
+        response['ETag'] = etag
+        return response
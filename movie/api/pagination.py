@@ -0,0 +1,151 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+def _reverse(ordering):
+    return [field[1:] if field.startswith('-') else '-' + field for field in ordering]
+
+
+def _after(ordering, values):
+    """
+    Return the Q of rows strictly after ``values`` in ``ordering``: for
+    ``('-a', '-id')``, ``a < v OR (a = v AND id < i)``.
+    """
+    condition, equal = Q(), Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        condition |= equal & Q(**{f'{name}__{"lt" if field.startswith("-") else "gt"}': value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Opaque-cursor keyset pagination.
+
+    A cursor holds the sort key of the last row of a page, every ordering
+    column including the ``id`` tiebreaker, and the next page is fetched
+    with a ``WHERE (key, id) > (<cursor>)`` range scan instead of an OFFSET.
+    Reading a deep page costs the same as reading the first one, however
+    many rows share a sort value, and writes to rows already read do not
+    shift the following pages. A row whose own sort value changes between
+    requests can still move to the other side of the cursor.
+
+    Cursors of a single-column ordering hold the plain value.
+    """
+    ordering = '-id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async counterpart of ``paginate_queryset``. Pages, cursors and links
+        are the same as the sync views'; only the query runs on the async ORM.
+        """
+        queryset = self.page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([obj async for obj in queryset.aiterator(chunk_size=self.page_size + 1)])
+
+    def page_queryset(self, queryset, request, view):
+        """
+        Return the slice of ``queryset`` that holds the requested page plus
+        one row, which tells whether there is a page after it.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        self.reverse = self.cursor.reverse if self.cursor else False
+        self.current_position = self.decode_position(self.cursor.position) if self.cursor else None
+
+        ordering = _reverse(self.ordering) if self.reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if self.current_position is not None:
+            # The fields convert the cursor's values while the filter is
+            # built, so a tampered value fails here rather than in the query.
+            try:
+                queryset = queryset.filter(_after(ordering, self.current_position))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+
+        has_position = self.current_position is not None
+        self.has_next = has_position if self.reverse else has_more
+        self.has_previous = has_more if self.reverse else has_position
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self.get_position(self.page[-1]) if self.page else self.current_position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self.encode_position(position)))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.get_position(self.page[0]) if self.page else self.current_position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.encode_position(position)))
+
+    def get_position(self, row):
+        return [getattr(row, field.lstrip('-')) for field in self.ordering]
+
+    def encode_position(self, values):
+        if len(values) == 1:
+            return str(values[0])
+        return json.dumps(values, cls=DjangoJSONEncoder)
+
+    def decode_position(self, position):
+        if position is None:
+            return None
+        if len(self.ordering) == 1:
+            return [position]
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def get_async_paginated_data(self, data):
+        return {'next': self.get_next_link(), 'previous': self.get_previous_link(), 'results': data}
+
+
+class ModerationQueuePagination(KeysetCursorPagination):
+    """
+    Cursor pagination over the moderation queue, oldest report first.
+    """
+    ordering = 'id'
+
+
+class SearchCursorPagination(KeysetCursorPagination):
+    """
+    Cursor pagination over full-text search results, most relevant first.
+    """
+    ordering = ('search_rank', 'id')
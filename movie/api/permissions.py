@@ -3,6 +3,7 @@ from rest_framework import permissions
 class IsOwnerOrReadOnly(permissions.BasePermission):
     """
     Custom permission to only allow owners of an object to edit it.
+    The owner is read from the view's ``owner_field`` (default ``user``).
     """
     def has_object_permission(self, request, view, obj):
         # Read permissions are allowed to any request,
@@ -10,4 +11,4 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         
-        return obj.user == request.user
\ No newline at end of file
+        return getattr(obj, getattr(view, 'owner_field', 'user')) == request.user
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+JSON rendering with orjson, which is listed in requirements.txt.
+
+ORJSONRenderer can replace rest_framework.renderers.JSONRenderer in
+REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES']. For the compact UTF-8 output
+this project uses it writes the same bytes several times faster, with two
+known differences: floats below 1e-4 or from 1e16 up are written without
+Python's ``e-05``/``e+16`` exponent padding, and NaN and infinity become
+``null`` instead of an error. ValuesSerializerTests checks that the
+project's list payloads render identically. Data orjson cannot encode, such
+as integers beyond 64 bits, is rendered by JSONRenderer.
+"""
+import orjson
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+# Datetimes and dataclasses go through DRF's encoder, whose format for them
+# differs from orjson's.
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+_default = encoders.JSONEncoder().default
+
+
+def orjson_dumps(data):
+    """
+    Return ``data`` as compact JSON bytes, as JSONRenderer would write them,
+    or None if orjson cannot encode ``data``.
+    """
+    try:
+        ret = orjson.dumps(data, default=_default, option=_OPTIONS)
+    except orjson.JSONEncodeError:
+        return None
+    # JSONRenderer escapes U+2028 and U+2029 to stay a JavaScript subset.
+    if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+        ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return ret
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it can; see the module
+    docstring. Indented output (the browsable API, ``indent=``) and
+    non-default UNICODE_JSON/COMPACT_JSON settings use JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (self.compact and not self.ensure_ascii
+                and self.get_indent(accepted_media_type, renderer_context or {}) is None):
+            ret = orjson_dumps(data)
+            if ret is not None:
+                return ret
+        return super().render(data, accepted_media_type, renderer_context)
@@ -1,14 +1,26 @@
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+
 from rest_framework import serializers
 
-from movie.models import Movie, Rating, Report
+from movie.models import LeaderboardEntry, Movie, Rating, RatingRollup, Report
 from accounts.api.serializers import UserSerializer
 
+# Largest integer the database accepts; bigger ids would fail in the query
+# instead of failing validation.
+MAX_ID = 2 ** 63 - 1
+
 
 class MovieSerializer(serializers.ModelSerializer):
     
     average_rating = serializers.SerializerMethodField()
     total_ratings = serializers.SerializerMethodField()
 
+    # Model fields read by the method fields, for the ValuesSerializer fast path.
+    values_sources = {'average_rating': 'rating_avg', 'total_ratings': 'rating_count'}
+
     class Meta:
         model = Movie
         fields = [
@@ -25,6 +37,15 @@ class MovieSerializer(serializers.ModelSerializer):
 
     
 
+class MovieImportSerializer(MovieSerializer):
+    """
+    One row of a catalog import, with MovieSerializer's field rules.
+    ``created_by`` is a plain id here; the importer checks a whole batch of
+    ids with one query instead of one query per row.
+    """
+    created_by = serializers.IntegerField(min_value=1, max_value=MAX_ID)
+
+
 class RatingSerializer(serializers.ModelSerializer):
 
     movie = MovieSerializer(read_only=True)
@@ -33,6 +54,98 @@ class RatingSerializer(serializers.ModelSerializer):
     class Meta:
         model = Rating
         fields = ['user', 'movie', 'rating', 'created_at']
+        extra_kwargs = {'rating': {'required': True}}
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        # Resolve every referenced user and movie with one IN query each,
+        # so rows sharing a movie also share the same Movie instance.
+        return queryset.prefetch_related('user', 'movie')
+
+
+class BulkRatingItemSerializer(serializers.ModelSerializer):
+    """
+    One entry of a bulk rating upload. The rating is validated with the same
+    model field rules as RatingSerializer; the movie is only checked for
+    existence when the batch is written.
+    """
+    movie_id = serializers.IntegerField(max_value=MAX_ID)
+
+    class Meta:
+        model = Rating
+        fields = ['movie_id', 'rating']
+        extra_kwargs = {'rating': {'required': True}}
+
+
+class RatingImportSerializer(serializers.ModelSerializer):
+    """
+    One row of a rating import. Users and movies are checked per batch, and
+    an existing rating for the same pair is replaced instead of rejected.
+    ``created_at`` is optional, as in the exports it is read back from.
+    """
+    user = serializers.IntegerField(min_value=1, max_value=MAX_ID)
+    movie = serializers.IntegerField(min_value=1, max_value=MAX_ID)
+    created_at = serializers.DateTimeField(required=False)
+
+    class Meta:
+        model = Rating
+        fields = ['user', 'movie', 'rating', 'created_at']
+        extra_kwargs = {'rating': {'required': True}}
+        validators = []
+
+
+class CatalogTransferSerializer(serializers.Serializer):
+    model = serializers.ChoiceField(choices=['movies', 'ratings'], default='movies')
+    file_format = serializers.ChoiceField(choices=['csv', 'jsonl'], required=False)
+
+
+class RatingRollupSerializer(serializers.ModelSerializer):
+
+    average = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = RatingRollup
+        fields = ['start', 'count', 'average']
+
+
+class RatingTimelineQuerySerializer(serializers.Serializer):
+    """
+    Date range of a rating timeline. Without ``since`` the last 30 days or
+    26 weeks up to ``until`` (default today) are returned.
+    """
+    period = serializers.ChoiceField(choices=RatingRollup.Period.choices, default=RatingRollup.Period.DAY)
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+
+    max_points = 366
+    default_points = {RatingRollup.Period.DAY: 30, RatingRollup.Period.WEEK: 26}
+
+    def validate(self, attrs):
+        step = datetime.timedelta(days=7 if attrs['period'] == RatingRollup.Period.WEEK else 1)
+        until = attrs.get('until') or timezone.localdate()
+        since = attrs.get('since') or until - step * (self.default_points[attrs['period']] - 1)
+        if attrs['period'] == RatingRollup.Period.WEEK:
+            # Include the whole week that ``since`` falls in.
+            since -= datetime.timedelta(days=since.weekday())
+        if since > until:
+            raise serializers.ValidationError({'since': 'Must not be after until.'})
+        if (until - since) // step >= self.max_points:
+            raise serializers.ValidationError(f'A timeline may span at most {self.max_points} periods.')
+        return {**attrs, 'since': since, 'until': until}
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+
+    movie = MovieSerializer(read_only=True)
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = ['position', 'score', 'rating_count', 'movie', 'refreshed_at']
+
+
+class LeaderboardQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(min_value=1, max_value=settings.LEADERBOARD_SIZE, default=20,
+                                     help_text='Number of positions to return.')
 
 
 class ReportSerializer(serializers.ModelSerializer):
@@ -42,4 +155,14 @@ class ReportSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Report
-        fields = ['user', 'movie', 'reason']
+        fields = ['user', 'movie', 'reason', 'status']
+        read_only_fields = ['status']
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.prefetch_related('user', 'movie')
+
+
+class ReportBulkActionSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1, max_value=MAX_ID), allow_empty=False, max_length=1000)
+    action = serializers.ChoiceField(choices=['approve', 'reject'])
@@ -0,0 +1,106 @@
+import json
+
+from django.http import StreamingHttpResponse
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils import encoders
+
+from .renderers import orjson_dumps
+
+
+class StreamingRenderer(BaseRenderer):
+    """
+    Renderer whose media type asks a StreamingListMixin view for its whole
+    result as a stream. Non-list responses (errors) are rendered as a single
+    JSON document.
+    """
+    streaming = True
+    charset = 'utf-8'
+    content_type = None
+    start = end = separator = terminator = b''
+
+    def encode(self, item):
+        return orjson_dumps(item) or json.dumps(
+            item, cls=encoders.JSONEncoder, ensure_ascii=False, separators=(',', ':'),
+        ).encode()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b'' if data is None else self.encode(data) + self.terminator
+
+    def stream(self, items, chunk_size):
+        """
+        Encode ``items`` incrementally, yielding one bytes chunk per
+        ``chunk_size`` items.
+        """
+        buffer = [self.start]
+        for index, item in enumerate(items):
+            if index:
+                buffer.append(self.separator)
+            buffer.append(self.encode(item))
+            buffer.append(self.terminator)
+            if index % chunk_size == chunk_size - 1:
+                yield b''.join(buffer)
+                buffer = []
+        buffer.append(self.end)
+        yield b''.join(buffer)
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """
+    ``Accept: application/x-ndjson``: one JSON object per line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    content_type = 'application/x-ndjson; charset=utf-8'
+    terminator = b'\n'
+
+
+class JSONArrayStreamRenderer(StreamingRenderer):
+    """
+    ``Accept: application/json; stream=true``: the same objects as one JSON
+    array, written as it is produced.
+    """
+    media_type = 'application/json; stream=true'
+    format = 'json-stream'
+    content_type = 'application/json; charset=utf-8'
+    start = b'['
+    separator = b','
+    end = b']'
+
+
+class StreamingListMixin:
+    """
+    Let clients stream the whole, unpaginated result of a list view, as
+    NDJSON or as a JSON array depending on the ``Accept`` header.
+
+    Rows are read with ``.iterator(chunk_size=...)``, which also applies
+    prefetch_related per chunk, and are serialized and encoded one chunk at
+    a time, so memory use stays bounded however many rows match. Since the
+    status line is sent before the rows are read, an error mid-stream ends
+    the response early instead of turning it into an error response.
+    """
+    stream_chunk_size = 500
+
+    def get_renderers(self):
+        # The stream=true renderer must precede JSONRenderer, which would
+        # otherwise also match ``application/json; stream=true``.
+        return [JSONArrayStreamRenderer(), *super().get_renderers(), NDJSONRenderer()]
+
+    def list(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if not getattr(renderer, 'streaming', False):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if not queryset.ordered:
+            queryset = queryset.order_by('-id')
+        rows = self.stream_representations(queryset, self.stream_chunk_size)
+
+        response = StreamingHttpResponse(renderer.stream(rows, self.stream_chunk_size),
+                                         content_type=renderer.content_type)
+        response['Vary'] = 'Accept'
+        return response
+
+    def stream_representations(self, queryset, chunk_size):
+        serializer = self.get_serializer()
+        return (serializer.to_representation(obj) for obj in queryset.iterator(chunk_size=chunk_size))
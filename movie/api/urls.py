@@ -1,19 +1,34 @@
 from django.urls import path
-from .views import ( MovieListView, MovieCreateView, MovieDetailView, 
-                    MovieRatingListView, MovieRatingCreateView, MovieRatingDetailView,
+from .views import ( MovieListView, MovieSearchView, TopRatedMovieListView, TrendingMovieListView, MovieCreateView, MovieDetailView, 
+                    MovieRatingListView, MovieRatingCreateView, MovieRatingDetailView, MovieRatingBulkView,
+                    MovieRatingHistogramView, MovieRatingTimelineView,
                     MovieReportListView, MovieReportCreateView, MovieReportDetailView, 
-                    AdminReportListView, AdminReportApprove, AdminReportReject, AdminReportStatusView) 
+                    AdminReportListView, AdminReportQueueView, AdminReportBulkActionView,
+                    AdminReportApprove, AdminReportReject, AdminReportStatusView,
+                    AdminCatalogExportView, AdminCatalogImportView) 
+from .async_views import AsyncMovieListView, AsyncMovieDetailView, AsyncMovieRatingListView
 
 urlpatterns = [
     # Movie URLs / Endpoints
     path('movies/', MovieListView.as_view(), name='movie-list'),
+    path('movies/search/', MovieSearchView.as_view(), name='movie-search'),
+    path('movies/top-rated/', TopRatedMovieListView.as_view(), name='movie-top-rated'),
+    path('movies/trending/', TrendingMovieListView.as_view(), name='movie-trending'),
     path('movie-create/', MovieCreateView.as_view(), name='movie-create'),
     path('movie/<int:pk>/', MovieDetailView.as_view(), name='movie-detail'),
 
+    # Async (ASGI) read endpoints
+    path('async/movies/', AsyncMovieListView.as_view(), name='async-movie-list'),
+    path('async/movie/<int:pk>/', AsyncMovieDetailView.as_view(), name='async-movie-detail'),
+    path('async/<int:pk>/rating/', AsyncMovieRatingListView.as_view(), name='async-movie-rating'),
+
     # Movie Rating URLs / Endpoints
     path('<int:pk>/rating/', MovieRatingListView.as_view(), name='movie-rating'),
+    path('<int:pk>/rating/histogram/', MovieRatingHistogramView.as_view(), name='movie-rating-histogram'),
+    path('<int:pk>/rating/timeline/', MovieRatingTimelineView.as_view(), name='movie-rating-timeline'),
     path('<int:pk>/rating-create/', MovieRatingCreateView.as_view(), name='rating-create'),
     path('rating/<int:pk>/', MovieRatingDetailView.as_view(), name='movie-rating'),
+    path('ratings/bulk/', MovieRatingBulkView.as_view(), name='rating-bulk'),
 
     # Movie Report URLs/ Endpoints 
     path('<int:pk>/report/', MovieReportListView.as_view(), name='movie-report'),
@@ -22,7 +37,13 @@ urlpatterns = [
 
     # Admin Report View URL/ Endpoints
     path('admin-report/', AdminReportListView.as_view(), name='admin-report'),
+    path('admin-report/queue/', AdminReportQueueView.as_view(), name='admin-report-queue'),
+    path('admin-report/bulk/', AdminReportBulkActionView.as_view(), name='admin-report-bulk'),
     path('report-approve/<int:pk>/', AdminReportApprove.as_view(), name='admin-report-approve'),
     path('report-reject/<int:pk>/', AdminReportReject.as_view(), name='admin-report-reject'),
     path('report-status/', AdminReportStatusView.as_view(), name='admin-report-status'),
+
+    # Admin Catalog Import / Export URLs / Endpoints
+    path('admin-catalog/export/', AdminCatalogExportView.as_view(), name='admin-catalog-export'),
+    path('admin-catalog/import/', AdminCatalogImportView.as_view(), name='admin-catalog-import'),
 ]
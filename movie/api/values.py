@@ -0,0 +1,129 @@
+"""
+Read-only fast path for list serializers.
+
+A ValuesSerializer is compiled once from a ModelSerializer. It reads the
+columns the serializer needs, nested serializers included, with one
+``values_list()`` query and turns each row into the same dict the serializer
+would build, through one getter per field: an ``itemgetter`` for columns that
+are output as stored, or a closure over the column index and the field's
+converter. Model instances, ``get_attribute`` and per-field
+``to_representation`` calls are skipped; only fields whose representation
+differs from the database value (dates, floats, choices) are converted, with
+the field's own logic.
+
+SerializerMethodFields are supported when the serializer class maps them to a
+model field in ``values_sources``.
+"""
+from functools import lru_cache
+from operator import itemgetter
+
+from django.core.exceptions import ImproperlyConfigured
+
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# Fields whose to_representation() returns database values unchanged.
+_IDENTITY = (serializers.CharField, serializers.IntegerField, serializers.PrimaryKeyRelatedField)
+
+
+def _converter(field):
+    method = type(field).to_representation
+    if any(method is base.to_representation for base in _IDENTITY):
+        return None
+    if method is serializers.FloatField.to_representation:
+        return float
+    return field.to_representation
+
+
+def _getter(index, convert, nullable):
+    if convert is None:
+        return itemgetter(index)
+    if nullable:
+        return lambda row: None if row[index] is None else convert(row[index])
+    return lambda row: convert(row[index])
+
+
+def _compile(serializer, prefix, columns):
+    """
+    Return a function building ``serializer``'s output from a ``row``,
+    appending the columns it reads to ``columns``.
+    """
+    model = serializer.Meta.model
+    sources = getattr(type(serializer), 'values_sources', {})
+    items = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.BaseSerializer):
+            if isinstance(field, serializers.ListSerializer):
+                raise ImproperlyConfigured(f'{type(serializer).__name__}.{name}: many=True is not supported.')
+            getter = _compile(field, f'{prefix}{field.source}__', columns)
+        else:
+            method_field = isinstance(field, serializers.SerializerMethodField)
+            source = sources.get(name) if method_field else field.source
+            if source is None or '.' in source or source == '*':
+                raise ImproperlyConfigured(f'{type(serializer).__name__}.{name} has no model field to read.')
+            # A method field's source holds what the method would return.
+            convert = None if method_field else _converter(field)
+            getter = _getter(len(columns), convert, convert is not None and model._meta.get_field(source).null)
+            columns.append(prefix + source)
+        items.append((name, getter))
+    items = tuple(items)
+    return lambda row: {name: getter(row) for name, getter in items}
+
+
+class ValuesSerializer:
+    """
+    Compiled read-only form of ``serializer_class``; see the module docstring.
+    """
+
+    def __init__(self, serializer_class):
+        columns = []
+        self.build = _compile(serializer_class(), '', columns)
+        self.columns = tuple(columns)
+
+    def rows(self, queryset, extra=()):
+        """
+        Return ``queryset`` as named rows of the serializer's columns, plus
+        ``extra`` columns such as the pagination ordering keys.
+        """
+        columns = self.columns + tuple(column for column in extra if column not in self.columns)
+        return queryset.prefetch_related(None).values_list(*columns, named=True)
+
+    def serialize(self, rows):
+        build = self.build
+        return [build(row) for row in rows]
+
+
+@lru_cache(maxsize=None)
+def values_serializer(serializer_class):
+    return ValuesSerializer(serializer_class)
+
+
+class ValuesListMixin:
+    """
+    Serve a list view through the ValuesSerializer of its serializer class.
+    Streamed responses are left to StreamingListMixin, which calls
+    stream_representations().
+    """
+
+    def list(self, request, *args, **kwargs):
+        if getattr(request.accepted_renderer, 'streaming', False):
+            return super().list(request, *args, **kwargs)
+
+        serializer = values_serializer(self.get_serializer_class())
+        queryset = self.filter_queryset(self.get_queryset())
+        extra = ()
+        if hasattr(self.paginator, 'get_ordering'):
+            # Cursor pagination reads its position from the ordering columns.
+            extra = [field.lstrip('-') for field in self.paginator.get_ordering(request, queryset, self)]
+        rows = serializer.rows(queryset, extra)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
+
+    def stream_representations(self, queryset, chunk_size):
+        serializer = values_serializer(self.get_serializer_class())
+        return map(serializer.build, serializer.rows(queryset).iterator(chunk_size=chunk_size))
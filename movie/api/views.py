@@ -1,29 +1,45 @@
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import redirect, get_object_or_404
 
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from drf_spectacular.utils import extend_schema
-
-from movie.models import Movie, Rating, Report
-from .serializers import MovieSerializer, RatingSerializer, ReportSerializer
+from Movie_Management_System.metrics import SerializerTimingMixin
+from Movie_Management_System.openapi import OpenApiParameter, extend_schema
+from movie.catalog_io import (FORMATS, UnreadableFile, decode_lines, export_rows, format_for_filename,
+                              import_rows, read_rows)
+from movie.leaderboards import get_leaderboard
+from movie.models import LeaderboardEntry, Movie, Rating, RatingHistogram, RatingRollup, Report
+from movie.search import search_movies
+from .serializers import (MovieSerializer, RatingSerializer, ReportSerializer, BulkRatingItemSerializer,
+                          ReportBulkActionSerializer, CatalogTransferSerializer, LeaderboardEntrySerializer,
+                          LeaderboardQuerySerializer, RatingRollupSerializer, RatingTimelineQuerySerializer)
 from .permissions import IsOwnerOrReadOnly
+from .caching import CatalogCacheMixin
+from .streaming import StreamingListMixin
+from .values import ValuesListMixin
+from .pagination import ModerationQueuePagination, SearchCursorPagination
+from .filters import MovieFilterBackend, MovieOrderingFilter
 
 # Movie Views
-class MovieListView(generics.ListAPIView):
+class MovieListView(SerializerTimingMixin, CatalogCacheMixin, ValuesListMixin, StreamingListMixin, generics.ListAPIView):
     """
     API endpoint that allows users to view all movies.
     """
     queryset = Movie.objects.all()
     serializer_class = MovieSerializer
     permission_classes = []
+    filter_backends = [MovieFilterBackend, MovieOrderingFilter]
+    ordering = ('-id',)
 
     @extend_schema(  
         summary='Retrieve a list of movies',  
-        description='This endpoint allows users to retrieve a list of all available movies in the system. The response includes details such as title, description, release date, and average rating.',
+        description='This endpoint allows users to retrieve a list of all available movies in the system. The response includes details such as title, description, release date, and average rating. Results can be filtered by genre, language, release date range and minimum average rating, and sorted by release date, average rating or number of ratings. Send `Accept: application/x-ndjson` (one movie per line) or `Accept: application/json; stream=true` (a JSON array) to stream every matching movie in one unpaginated response.',
         responses={
             200: MovieSerializer(many=True),  
         },
@@ -32,6 +48,79 @@ class MovieListView(generics.ListAPIView):
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
+class MovieSearchView(SerializerTimingMixin, ValuesListMixin, generics.ListAPIView):
+    """
+    API endpoint that allows users to search movies by title and description.
+    """
+    serializer_class = MovieSerializer
+    permission_classes = []
+    pagination_class = SearchCursorPagination
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': 'This query parameter is required.'})
+        return search_movies(query)
+
+    @extend_schema(
+        summary='Search movies',
+        description='Full-text search over movie titles and descriptions. Every word in `q` is prefix matched, and results are ordered by relevance with title matches weighted above description matches.',
+        parameters=[OpenApiParameter('q', str, required=True, description='Search text')],
+        responses={
+            200: MovieSerializer(many=True),
+        },
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+class LeaderboardView(SerializerTimingMixin, generics.ListAPIView):
+    """
+    Base view for one precomputed leaderboard, see movie.leaderboards.
+    """
+    serializer_class = LeaderboardEntrySerializer
+    permission_classes = []
+    pagination_class = None
+    board = None
+
+    def get_queryset(self):
+        params = LeaderboardQuerySerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        return get_leaderboard(self.board, params.validated_data['limit'])
+
+class TopRatedMovieListView(LeaderboardView):
+    """
+    API endpoint that allows users to view the top rated movies.
+    """
+    board = LeaderboardEntry.Board.TOP_RATED
+
+    @extend_schema(
+        summary='Retrieve the top rated movies',
+        description='Movies ranked by a weighted average rating: every movie counts as if it had a number of extra ratings at the average of the whole catalog, so a movie with a few high ratings does not outrank one with many. `score` is that weighted average and `rating_count` the number of real ratings. The board is precomputed by a scheduled job; `refreshed_at` tells when it was last refreshed.',
+        parameters=[LeaderboardQuerySerializer],
+        responses={
+            200: LeaderboardEntrySerializer(many=True),
+        },
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+class TrendingMovieListView(LeaderboardView):
+    """
+    API endpoint that allows users to view the movies trending this week.
+    """
+    board = LeaderboardEntry.Board.TRENDING
+
+    @extend_schema(
+        summary='Retrieve the trending movies',
+        description='Movies ranked by the number of ratings they received in the last seven days, with ties going to the higher recent average. `score` and `rating_count` are both that number of recent ratings. The board is precomputed by a scheduled job; `refreshed_at` tells when it was last refreshed.',
+        parameters=[LeaderboardQuerySerializer],
+        responses={
+            200: LeaderboardEntrySerializer(many=True),
+        },
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
 class MovieCreateView(generics.CreateAPIView):
     """
     API endpoint that allows users to create movies.
@@ -62,13 +151,14 @@ class MovieCreateView(generics.CreateAPIView):
     def post(self, requset, *args, **kwargs):
         return super().post(requset, *args, **kwargs)
 
-class MovieDetailView(generics.RetrieveUpdateDestroyAPIView):
+class MovieDetailView(SerializerTimingMixin, CatalogCacheMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     API endpoint that allows users to view, update, or delete a specific movie.
     """
     queryset = Movie.objects.all()
     serializer_class = MovieSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
+    owner_field = 'created_by'
 
     @extend_schema(
         summary="Retrieve a specific movie",
@@ -106,7 +196,7 @@ class MovieDetailView(generics.RetrieveUpdateDestroyAPIView):
     
 
 # Rating Views
-class MovieRatingListView(generics.ListAPIView):
+class MovieRatingListView(SerializerTimingMixin, ValuesListMixin, generics.ListAPIView):
     """
     API endpoint that allows users to view all ratings for a specific movie.
     """
@@ -115,7 +205,13 @@ class MovieRatingListView(generics.ListAPIView):
 
     def get_queryset(self):
         pk = self.kwargs.get('pk')
-        return Rating.objects.filter(movie_id=pk)
+        return RatingSerializer.setup_eager_loading(Rating.objects.filter(movie_id=pk))
+
+    def get_throttles(self):
+        # PUT writes a rating like POST .../rating-create/ and spends tokens
+        # from the same bucket; reading the list is not throttled.
+        self.throttle_scope = 'rating-create' if self.request.method == 'PUT' else None
+        return super().get_throttles()
 
     @extend_schema(
         summary="Retrive a list of specific movie rating",
@@ -125,6 +221,24 @@ class MovieRatingListView(generics.ListAPIView):
     
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
+
+    @extend_schema(
+        operation_id="api_movie_rating_upsert",
+        summary="Create or replace your rating for a specific movie",
+        description="Create the authenticated user's rating for a movie, or replace it if one already exists. The rating row is written with one upsert statement, in the same transaction as the movie's rating aggregates and rollups.",
+        request=RatingSerializer,
+        responses={200: RatingSerializer, 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests"}
+    )
+    def put(self, request, *args, **kwargs):
+        serializer = RatingSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        movie_id = self.kwargs['pk']
+        if not Rating.upsert(request.user, movie_id, serializer.validated_data['rating']):
+            raise NotFound('Movie not found')
+
+        rating = Rating.objects.select_related('user', 'movie').get(user=request.user, movie_id=movie_id)
+        return Response(RatingSerializer(rating).data, status=status.HTTP_200_OK)
     
     
 class MovieRatingCreateView(generics.CreateAPIView):
@@ -133,18 +247,23 @@ class MovieRatingCreateView(generics.CreateAPIView):
     """
     serializer_class = RatingSerializer
     permission_classes = [IsOwnerOrReadOnly]
+    throttle_scope = 'rating-create'
     
     def perform_create(self, serializer):
         user = self.request.user
         movie_id = self.kwargs['pk']
-        movie = Movie.objects.get(pk=movie_id)
 
-        rating_user = Rating.objects.filter(user=user, movie=movie)
-        if rating_user.exists():
+        # The aggregate UPDATE doubles as the existence check for the movie,
+        # and the unique (user, movie) constraint rejects duplicate ratings.
+        try:
+            with transaction.atomic():
+                if not Movie.apply_rating_delta(movie_id, 1, serializer.validated_data['rating']):
+                    raise NotFound('Movie not found')
+                rating = serializer.save(user=user, movie_id=movie_id)
+                Rating.update_rollups([(movie_id, rating.created_at, None, rating.rating)])
+        except IntegrityError:
             raise ValidationError('You have already rated this movie')
     
-        serializer.save(user=user, movie=movie)
-    
     @extend_schema(
             summary="Create a new rating for a specific movie",
             description="Create a new rating for a specific movie by providing the movie's ID. Only authenticated users can create a new rating for a movie.",
@@ -155,8 +274,103 @@ class MovieRatingCreateView(generics.CreateAPIView):
         return super().post(request, *args, **kwargs)
     
 
+class MovieRatingBulkView(APIView):
+    """
+    API endpoint that allows users to create or replace many of their ratings in one request.
+    """
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'rating-bulk'
+    max_items = 500
+
+    @extend_schema(
+        summary="Create or replace a batch of ratings",
+        description="Accepts a list of {movie_id, rating} items and writes all valid items in one transaction. Returns a result for each item in request order. When a movie appears more than once, the last item wins.",
+        request=BulkRatingItemSerializer(many=True),
+        responses={200: "Per-item results", 400: "Bad Request"}
+    )
+    def post(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError('Expected a list of ratings')
+        if len(items) > self.max_items:
+            raise ValidationError(f'A batch may contain at most {self.max_items} ratings')
+
+        results = []
+        ratings = {}
+        for index, item in enumerate(items):
+            serializer = BulkRatingItemSerializer(data=item)
+            if serializer.is_valid():
+                movie_id = serializer.validated_data['movie_id']
+                ratings[movie_id] = serializer.validated_data['rating']
+                results.append({'index': index, 'movie_id': movie_id})
+            else:
+                results.append({'index': index, 'status': 'error', 'errors': serializer.errors})
+
+        written = Rating.bulk_upsert(request.user, ratings) if ratings else {}
+
+        for result in results:
+            if 'status' in result:
+                continue
+            created = written.get(result['movie_id'])
+            if created is None:
+                result.update(status='error', errors={'movie_id': ['Movie not found']})
+            else:
+                result['status'] = 'created' if created else 'updated'
+
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+
+class MovieRatingHistogramView(APIView):
+    """
+    API endpoint that allows users to view how many ratings of each star a movie has.
+    """
+    permission_classes = []
+
+    @extend_schema(
+        summary="Retrieve the rating histogram of a specific movie",
+        description="Return the number of the movie's ratings with 1 to 5 stars, ratings being rounded to the nearest star, and their total. The histogram is kept up to date on every rating write.",
+        responses={200: "Histogram", 404: "Not Found"}
+    )
+    def get(self, request, *args, **kwargs):
+        movie_id = self.kwargs['pk']
+        counts = dict(RatingHistogram.objects.filter(movie_id=movie_id).values_list('stars', 'count'))
+        if not counts and not Movie.objects.filter(pk=movie_id).exists():
+            raise NotFound('Movie not found')
+
+        histogram = {str(stars): counts.get(stars, 0) for stars in range(1, 6)}
+        return Response({'histogram': histogram, 'rating_count': sum(histogram.values())}, status=status.HTTP_200_OK)
+
+
+class MovieRatingTimelineView(APIView):
+    """
+    API endpoint that allows users to view a movie's rating volume and average over time.
+    """
+    permission_classes = []
+
+    @extend_schema(
+        summary="Retrieve the rating timeline of a specific movie",
+        description="Return the number and average of the movie's ratings per day or per week (`period=day|week`, weeks start on Monday) between `since` and `until`, by the date each rating was first given. Periods without ratings are left out. By default the last 30 days or 26 weeks are returned, and at most 366 periods can be requested.",
+        parameters=[RatingTimelineQuerySerializer],
+        responses={200: RatingRollupSerializer(many=True), 400: "Bad Request", 404: "Not Found"}
+    )
+    def get(self, request, *args, **kwargs):
+        params = RatingTimelineQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        movie_id = self.kwargs['pk']
+
+        rollups = list(
+            RatingRollup.objects
+            .filter(movie_id=movie_id, period=params.validated_data['period'],
+                    start__range=(params.validated_data['since'], params.validated_data['until']),
+                    count__gt=0)
+            .order_by('start')
+        )
+        if not rollups and not Movie.objects.filter(pk=movie_id).exists():
+            raise NotFound('Movie not found')
+        return Response(RatingRollupSerializer(rollups, many=True).data, status=status.HTTP_200_OK)
+
     
-class MovieRatingDetailView(generics.RetrieveUpdateDestroyAPIView):
+class MovieRatingDetailView(SerializerTimingMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     API endpoint that allows users to view a specific movie rating.
     """
@@ -164,6 +378,17 @@ class MovieRatingDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = RatingSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
 
+    def perform_update(self, serializer):
+        # rating is the only writable field. The response's movie is loaded
+        # after the write, so it already shows the new aggregates.
+        rating = serializer.validated_data.get('rating', serializer.instance.rating)
+        if not Rating.change(serializer.instance, rating):
+            raise NotFound('Rating not found')
+
+    def perform_destroy(self, instance):
+        if not Rating.remove(instance):
+            raise NotFound('Rating not found')
+
     @extend_schema(
         summary="Retrieve a specific movie rating",
         description="Retrieve a specific movie rating by providing the movie's ID and rating's ID. Only authenticated users can see the movie rating.",
@@ -202,7 +427,7 @@ class MovieRatingDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 # Report Views
-class MovieReportListView(generics.ListAPIView):
+class MovieReportListView(SerializerTimingMixin, ValuesListMixin, generics.ListAPIView):
     """
     API endpoint that allows users to view all reports for a specific movie.
     """
@@ -212,7 +437,7 @@ class MovieReportListView(generics.ListAPIView):
     def get_queryset(self):
         pk = self.kwargs.get('pk')
         user = self.request.user
-        return Report.objects.filter(user=user, movie_id=pk)
+        return ReportSerializer.setup_eager_loading(Report.objects.filter(user=user, movie_id=pk))
     
     @extend_schema(
         summary="Retrive a list of specific movie report",
@@ -227,18 +452,19 @@ class MovieReportListView(generics.ListAPIView):
 class MovieReportCreateView(generics.CreateAPIView):
     serializer_class = ReportSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'report-create'
         
     def perform_create(self, serializer):
         movie_id = self.kwargs['pk']
         user = self.request.user
 
-        movie = Movie.objects.get(id=movie_id)
-        report = Report.objects.filter(user=user, movie=movie)
+        movie = get_object_or_404(Movie, id=movie_id)
 
-        if report.exists():
+        try:
+            with transaction.atomic():
+                serializer.save(user=user, movie=movie)
+        except IntegrityError:
             raise ValidationError('You have already reported this movie')
-
-        serializer.save(user=user, movie=movie)
     
     @extend_schema(
         summary="Create a new report for a particular movie.",
@@ -250,7 +476,7 @@ class MovieReportCreateView(generics.CreateAPIView):
         return super().post(request, *args, **kwargs)
 
     
-class MovieReportDetailView(generics.RetrieveUpdateDestroyAPIView):
+class MovieReportDetailView(SerializerTimingMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     API endpoint that allows users to view a specific movie report.
     """
@@ -294,17 +520,17 @@ class MovieReportDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 # Admin reports views
 
-class AdminReportListView(generics.ListAPIView):
+class AdminReportListView(SerializerTimingMixin, ValuesListMixin, StreamingListMixin, generics.ListAPIView):
     """
     API endpoint that allows administrators to view all reports.
     """
-    queryset = Report.objects.all()
+    queryset = ReportSerializer.setup_eager_loading(Report.objects.all())
     serializer_class = ReportSerializer
     permission_classes = [IsAdminUser] 
 
     @extend_schema(
         summary="Retrieve a list of all reports",
-        description="Retrieve a list of all reports. Only administrators can see the list of reports.",
+        description="Retrieve a list of all reports. Send `Accept: application/x-ndjson` or `Accept: application/json; stream=true` to stream every report in one unpaginated response. Only administrators can see the list of reports.",
         responses={204: "No Content", 403: "Forbidden"}
     )
     
@@ -312,6 +538,58 @@ class AdminReportListView(generics.ListAPIView):
         return super().get(request, *args, **kwargs)
 
 
+class AdminReportQueueView(SerializerTimingMixin, ValuesListMixin, generics.ListAPIView):
+    """
+    API endpoint that allows administrators to work through pending reports, oldest first.
+    """
+    queryset = ReportSerializer.setup_eager_loading(Report.objects.filter(status=Report.Status.PENDING))
+    serializer_class = ReportSerializer
+    permission_classes = [IsAdminUser]
+    pagination_class = ModerationQueuePagination
+
+    @extend_schema(
+        summary="Retrieve the moderation queue",
+        description="Retrieve pending reports, oldest first, with cursor pagination. Only administrators can see the moderation queue.",
+        responses={200: ReportSerializer(many=True), 403: "Forbidden"}
+    )
+
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class AdminReportBulkActionView(APIView):
+    """
+    API endpoint that allows administrators to approve or reject many reports at once.
+    """
+    permission_classes = [IsAdminUser]
+    action_statuses = {
+        'approve': Report.Status.APPROVED,
+        'reject': Report.Status.REJECTED,
+    }
+
+    @extend_schema(
+        summary="Approve or reject a list of reports",
+        description="Set the status of every listed report with a single UPDATE. Reports that already have the target status are left unchanged. Only administrators can moderate reports.",
+        request=ReportBulkActionSerializer,
+        responses={200: "Counts of requested and updated reports", 400: "Bad Request", 403: "Forbidden"}
+    )
+
+    def post(self, request, *args, **kwargs):
+        serializer = ReportBulkActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        ids = set(serializer.validated_data['ids'])
+        target = self.action_statuses[serializer.validated_data['action']]
+        updated = Report.objects.filter(pk__in=ids).exclude(status=target).update(status=target)
+
+        return Response({
+            'action': serializer.validated_data['action'],
+            'requested_count': len(ids),
+            'updated_count': updated,
+            }, status=status.HTTP_200_OK
+        )
+
+
 class AdminReportApprove(generics.UpdateAPIView):
     """
     API endpoint that allows administrators to approve a specific report.
@@ -322,12 +600,11 @@ class AdminReportApprove(generics.UpdateAPIView):
     def update(self, *args, **kwargs):
         report = self.get_object()
 
-        if report.approved:
+        if report.status == Report.Status.APPROVED:
             raise ValidationError('Report is already approved')
         
-        report.approved = True
-        report.rejected = False
-        report.save()
+        report.status = Report.Status.APPROVED
+        report.save(update_fields=['status'])
 
         serializer = self.get_serializer(report)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -362,12 +639,11 @@ class AdminReportReject(generics.UpdateAPIView):
     def update(self, *args, **kwargs):
         report = self.get_object()
 
-        if report.rejected:
+        if report.status == Report.Status.REJECTED:
             raise ValidationError('Report is already rejected')
         
-        report.rejected = True
-        report.approved = False
-        report.save()
+        report.status = Report.Status.REJECTED
+        report.save(update_fields=['status'])
 
         serializer = self.get_serializer(report)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -396,21 +672,95 @@ class AdminReportStatusView(APIView):
     """
     permission_classes = [IsAdminUser]
 
-    def get(self, request):
-        report_approved_count = Report.objects.filter(approved=True).count()
-        report_rejected_count = Report.objects.filter(rejected=True).count()
+    @extend_schema(
+        summary="Retrieve a report status",
+        description="Retrieve the number of pending, approved and rejected reports. Only administrators can see this information.",
+        responses={200: "No Content", 403: "Forbidden"}
+    )
+    
+    def get(self, request, *args, **kwargs):
+        counts = Report.status_counts()
 
         return Response({
-            'approved_count': report_approved_count,
-            'rejected_count': report_rejected_count
+            'pending_count': counts[Report.Status.PENDING],
+            'approved_count': counts[Report.Status.APPROVED],
+            'rejected_count': counts[Report.Status.REJECTED],
+            'total_count': sum(counts.values()),
             }, status=status.HTTP_200_OK
         )
-    
+
+
+# Admin catalog import / export views
+
+class AdminCatalogExportView(APIView):
+    """
+    API endpoint that allows administrators to download the whole catalog.
+    """
+    permission_classes = [IsAdminUser]
+
     @extend_schema(
-        summary="Retrieve a report status",
-        description="Retrieve the number of approved and rejected reports for the authenticated user. Only administrators can see this information.",
-        responses={200: "No Content", 403: "Forbidden"}
+        summary="Export movies or ratings",
+        description="Stream every movie (`model=movies`) or rating (`model=ratings`) as CSV or JSON Lines (`file_format=csv|jsonl`, default csv). The file is written while it is read from the database, so any size can be exported. Only administrators can export the catalog.",
+        parameters=[CatalogTransferSerializer],
+        responses={200: "CSV or JSON Lines file", 403: "Forbidden"}
     )
-    
     def get(self, request, *args, **kwargs):
-        return super().get(request, *args, **kwargs)
\ No newline at end of file
+        params = CatalogTransferSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        model = params.validated_data['model']
+        file_format = params.validated_data.get('file_format', 'csv')
+
+        response = StreamingHttpResponse(export_rows(model, file_format), content_type=FORMATS[file_format])
+        response['Content-Disposition'] = f'attachment; filename="{model}.{file_format}"'
+        return response
+
+
+class AdminCatalogImportView(APIView):
+    """
+    API endpoint that allows administrators to upload movies or ratings in bulk.
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+    max_reported_errors = 100
+
+    @extend_schema(
+        summary="Import movies or ratings",
+        description="Upload a CSV or JSON Lines `file` of movies (`model=movies`) or ratings (`model=ratings`). Each row is validated with the same rules as the API and valid rows are written in batches. Movies without `created_by` are owned by the uploader, and a rating replaces the same user's existing rating of the movie, with the file's `created_at` when it has one. A file that is not UTF-8 text, or not parseable CSV, is rejected with 400 and the line number before anything is imported. The response counts imported and rejected rows and lists the first rejected rows with their errors. Only administrators can import.",
+        parameters=[CatalogTransferSerializer],
+        request={'multipart/form-data': {'type': 'object', 'properties': {'file': {'type': 'string', 'format': 'binary'}}}},
+        responses={200: "Import summary", 400: "Bad Request", 403: "Forbidden"}
+    )
+    def post(self, request, *args, **kwargs):
+        params = CatalogTransferSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': 'This field is required.'})
+        model = params.validated_data['model']
+        file_format = params.validated_data.get('file_format') or format_for_filename(upload.name)
+
+        errors = []
+
+        def report(line, row_errors):
+            if len(errors) < self.max_reported_errors:
+                errors.append({'line': line, 'errors': row_errors})
+
+        # Read the file once before importing, so that a file that turns out
+        # to be unreadable is rejected before any of its batches is written.
+        try:
+            for _ in read_rows(decode_lines(upload.file), file_format):
+                pass
+        except UnreadableFile as exc:
+            raise ValidationError({'file': [str(exc)]})
+        upload.file.seek(0)
+
+        rows = read_rows(decode_lines(upload.file), file_format)
+        result = import_rows(rows, model, default_owner=request.user, on_error=report)
+
+        return Response({
+            'model': model,
+            'imported_count': result.imported,
+            'rejected_count': result.failed,
+            'errors': errors,
+            }, status=status.HTTP_200_OK
+        )
@@ -0,0 +1,51 @@
+"""
+Catalog versioning for the movie response cache.
+
+Every cached catalog response is keyed by the current catalog version. Any
+write to a Movie or Rating replaces the version once its transaction commits,
+which makes every previously cached response unreachable at once instead of
+tracking individual keys.
+
+Responses are validated by ETag only. There is no Last-Modified: at
+one-second resolution, a write in the same second as a cached read would be
+answered with a stale 304 to ``If-Modified-Since``.
+"""
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+
+CATALOG_STATE_KEY = 'movie:catalog-state'
+
+
+def _new_catalog_state():
+    return {'version': uuid.uuid4().hex}
+
+
+def get_catalog_state():
+    """
+    Return the current ``{'version'}`` catalog state.
+    """
+    state = cache.get(CATALOG_STATE_KEY)
+    if state is None:
+        state = _new_catalog_state()
+        if not cache.add(CATALOG_STATE_KEY, state, timeout=None):
+            state = cache.get(CATALOG_STATE_KEY) or state
+    return state
+
+
+async def aget_catalog_state():
+    state = await cache.aget(CATALOG_STATE_KEY)
+    if state is None:
+        state = await sync_to_async(get_catalog_state)()
+    return state
+
+
+def bump_catalog_version():
+    """
+    Invalidate all cached catalog responses once the current transaction
+    commits, so a concurrent reader can never cache pre-commit data under the
+    new version.
+    """
+    transaction.on_commit(lambda: cache.set(CATALOG_STATE_KEY, _new_catalog_state(), timeout=None))
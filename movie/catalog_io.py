@@ -0,0 +1,249 @@
+"""
+Streaming import and export of movies and ratings as CSV or JSON Lines.
+
+Imports read one row at a time, validate it with the field rules of the API
+serializers and write valid rows in ``bulk_create`` batches, one transaction
+per batch. Bad rows are reported through a callback and skipped; a file
+that cannot be decoded or split into rows raises UnreadableFile. Exports
+walk the table with ``.iterator()`` and yield text chunks, so memory use does
+not depend on the size of the table in either direction.
+"""
+import csv
+import datetime
+import io
+import json
+from dataclasses import dataclass
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from accounts.models import User
+from .api.serializers import MovieImportSerializer, RatingImportSerializer
+from .cache import bump_catalog_version
+from .models import Movie, Rating
+
+FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+# Exported columns; ``id`` is informational and ignored on import. Imported
+# ratings keep their ``created_at`` when the column is present.
+COLUMNS = {
+    'movies': ['id', 'title', 'description', 'released_at', 'duration_hours', 'duration_minutes',
+               'duration_seconds', 'genre', 'language', 'created_by'],
+    'ratings': ['id', 'user', 'movie', 'rating', 'created_at'],
+}
+
+
+class _ExportEncoder(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder, but times keep their microseconds, which it rounds to
+    milliseconds, so exported ``created_at`` values import back unchanged.
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    failed: int = 0
+
+
+class UnreadableFile(Exception):
+    """
+    Raised when a file stops being readable at ``line``: it is not UTF-8
+    text, or a CSV record cannot be parsed.
+    """
+
+    def __init__(self, line, message):
+        super().__init__(f'Line {line}: {message}')
+        self.line = line
+
+
+def format_for_filename(filename, default='csv'):
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    return {'ndjson': 'jsonl', 'json': 'jsonl'}.get(extension, extension if extension in FORMATS else default)
+
+
+def decode_lines(stream):
+    """
+    Yield the lines of a binary UTF-8 stream as text, without a leading BOM.
+    Lines are decoded one at a time, so an UnreadableFile names the line
+    holding the bad bytes.
+    """
+    for line, data in enumerate(stream, start=1):
+        try:
+            yield data.decode('utf-8-sig' if line == 1 else 'utf-8')
+        except UnicodeDecodeError as exc:
+            raise UnreadableFile(line, f'Not UTF-8 text: {exc.reason} at byte {exc.start + 1}.')
+
+
+def read_rows(lines, file_format):
+    """
+    Yield ``(line, row, error)`` for each record of an iterable of text
+    lines, where ``row`` is a dict and ``error`` is set instead when the
+    record cannot be parsed. Empty CSV cells are left out so that model
+    defaults apply. Raises UnreadableFile when a CSV record cannot be split
+    into fields, since the records after it cannot be found either.
+    """
+    if file_format == 'csv':
+        reader = csv.DictReader(lines)
+        try:
+            for row in reader:
+                yield reader.line_num, {k: v for k, v in row.items() if k is not None and v != ''}, None
+        except csv.Error as exc:
+            # DictReader.line_num is only updated after a record is read.
+            raise UnreadableFile(reader.reader.line_num, f'Invalid CSV: {exc}.')
+        return
+
+    for line, text in enumerate(lines, start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError as exc:
+            yield line, None, {'non_field_errors': [f'Invalid JSON: {exc}']}
+            continue
+        if not isinstance(row, dict):
+            yield line, None, {'non_field_errors': ['Expected a JSON object.']}
+            continue
+        yield line, row, None
+
+
+def import_rows(rows, model, batch_size=1000, default_owner=None, on_error=None):
+    """
+    Validate and write ``rows`` from read_rows() as ``model`` ('movies' or
+    'ratings'). Movies without ``created_by`` are owned by ``default_owner``;
+    ratings replace an existing rating by the same user for the same movie.
+    ``on_error(line, errors)`` is called for every rejected row.
+    """
+    serializer_class, write_batch = {
+        'movies': (MovieImportSerializer, _write_movies),
+        'ratings': (RatingImportSerializer, _write_ratings),
+    }[model]
+    result = ImportResult()
+
+    def reject(line, errors):
+        result.failed += 1
+        if on_error is not None:
+            on_error(line, errors)
+
+    batch = []
+    for line, row, error in rows:
+        if error is not None:
+            reject(line, error)
+            continue
+        if model == 'movies' and default_owner is not None:
+            row.setdefault('created_by', default_owner.pk)
+        serializer = serializer_class(data=row)
+        if not serializer.is_valid():
+            reject(line, serializer.errors)
+            continue
+        batch.append((line, serializer.validated_data))
+        if len(batch) >= batch_size:
+            result.imported += _flush(batch, write_batch, reject)
+            batch = []
+    if batch:
+        result.imported += _flush(batch, write_batch, reject)
+    return result
+
+
+def _flush(batch, write_batch, reject):
+    rejected = write_batch(batch)
+    for line, errors in rejected:
+        reject(line, errors)
+    return len(batch) - len(rejected)
+
+
+def _existing(model, ids):
+    return set(model.objects.filter(pk__in=ids).values_list('pk', flat=True))
+
+
+def _write_movies(batch):
+    owners = _existing(User, {data['created_by'] for _, data in batch})
+    rejected = [(line, {'created_by': ['User not found']}) for line, data in batch if data['created_by'] not in owners]
+    movies = [
+        Movie(created_by_id=data['created_by'], **{k: v for k, v in data.items() if k != 'created_by'})
+        for _, data in batch if data['created_by'] in owners
+    ]
+    with transaction.atomic():
+        Movie.objects.bulk_create(movies)
+        # bulk_create sends no post_save signals, so invalidate explicitly.
+        bump_catalog_version()
+    return rejected
+
+
+def _write_ratings(batch):
+    users = _existing(User, {data['user'] for _, data in batch})
+    movies = _existing(Movie, {data['movie'] for _, data in batch})
+    rejected = []
+    ratings = {}
+    for line, data in batch:
+        errors = {}
+        if data['user'] not in users:
+            errors['user'] = ['User not found']
+        if data['movie'] not in movies:
+            errors['movie'] = ['Movie not found']
+        if errors:
+            rejected.append((line, errors))
+        else:
+            # The last row for a (user, movie) pair wins.
+            ratings[data['user'], data['movie']] = data
+
+    with transaction.atomic():
+        saved = Rating.objects.bulk_create(
+            [Rating(user_id=user_id, movie_id=movie_id, rating=data['rating'])
+             for (user_id, movie_id), data in ratings.items()],
+            update_conflicts=True,
+            unique_fields=['user', 'movie'],
+            update_fields=['rating'],
+        )
+        # auto_now_add overwrites created_at on insert, so imported dates are
+        # written afterwards; rows without one keep the existing date.
+        dated = []
+        for rating, data in zip(saved, ratings.values()):
+            if 'created_at' in data:
+                rating.created_at = data['created_at']
+                dated.append(rating)
+        Rating.objects.bulk_update(dated, ['created_at'])
+        movie_ids = {movie_id for _, movie_id in ratings}
+        Movie.rebuild_rating_aggregates(Movie.objects.filter(pk__in=movie_ids))
+        Rating.rebuild_rollups(movie_ids)
+    return rejected
+
+
+def export_rows(model, file_format, chunk_size=2000):
+    """
+    Yield the whole ``model`` table ('movies' or 'ratings') as text chunks
+    of ``chunk_size`` rows, in id order.
+    """
+    columns = COLUMNS[model]
+    fields = [{'created_by': 'created_by_id', 'user': 'user_id', 'movie': 'movie_id'}.get(c, c) for c in columns]
+    queryset = (Movie if model == 'movies' else Rating).objects.order_by('id').values_list(*fields)
+
+    buffer = io.StringIO()
+    if file_format == 'csv':
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        write = writer.writerow
+    else:
+        encoder = _ExportEncoder()
+
+        def write(values):
+            buffer.write(encoder.encode(dict(zip(columns, values))))
+            buffer.write('\n')
+
+    rows = 0
+    for values in queryset.iterator(chunk_size=chunk_size):
+        write(values)
+        rows += 1
+        if rows % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
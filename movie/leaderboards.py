@@ -0,0 +1,118 @@
+"""
+Precomputed top-rated and trending leaderboards.
+
+Ranking movies on request would aggregate the whole Rating table, so
+refresh_leaderboards() ranks them ahead of time into LeaderboardEntry rows,
+and reads are a range scan over the (board, position) index. A refresh reads
+only the denormalized aggregates on Movie and, for trending, the ratings of
+the last LEADERBOARD_TRENDING_DAYS through ``rating_recent_idx``, and it
+rewrites only the positions whose movie or score changed.
+
+Boards are refreshed only by the refresh_leaderboards management command,
+run on a schedule. Reads never refresh: between runs they are served the
+rows of the last refresh, whose time every entry carries in refreshed_at.
+"""
+import datetime
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Avg, Count, F, Sum, Value
+from django.utils import timezone
+
+from .models import LeaderboardEntry, Movie, Rating
+
+Board = LeaderboardEntry.Board
+
+
+def rank_top_rated(size):
+    """
+    Return the ``size`` best ``(movie_id, score, rating_count)`` by Bayesian
+    average: each movie's ratings plus LEADERBOARD_PRIOR_RATINGS virtual
+    ratings at the catalog-wide mean, so a movie needs many good ratings,
+    not one, to rank high.
+    """
+    totals = Movie.objects.aggregate(count=Sum('rating_count'), total=Sum('rating_sum'))
+    if not totals['count']:
+        return []
+    prior = float(settings.LEADERBOARD_PRIOR_RATINGS)
+    mean = totals['total'] / totals['count']
+    score = (Value(prior * mean) + F('rating_sum')) / (Value(prior) + F('rating_count'))
+    return list(
+        Movie.objects
+        .filter(rating_count__gt=0)
+        .annotate(score=models.ExpressionWrapper(score, output_field=models.FloatField()))
+        .order_by('-score', 'id')
+        .values_list('id', 'score', 'rating_count')[:size]
+    )
+
+
+def rank_trending(size, now=None):
+    """
+    Return the ``size`` movies with the most ratings in the last
+    LEADERBOARD_TRENDING_DAYS as ``(movie_id, score, rating_count)``, where
+    both score and count are the number of recent ratings. Ties go to the
+    higher recent average.
+    """
+    since = (now or timezone.now()) - datetime.timedelta(days=settings.LEADERBOARD_TRENDING_DAYS)
+    rows = (
+        Rating.objects
+        .filter(created_at__gte=since)
+        .values('movie')
+        .annotate(recent=Count('id'), average=Avg('rating'))
+        .order_by('-recent', '-average', 'movie')
+        .values_list('movie', 'recent')[:size]
+    )
+    return [(movie_id, float(recent), recent) for movie_id, recent in rows]
+
+
+def write_board(board, ranking, refreshed_at):
+    """
+    Store ``ranking`` as ``board``'s entries, writing only the positions
+    that changed. Readers see the old or the new board, never a mix.
+    """
+    fields = ['movie_id', 'score', 'rating_count']
+    with transaction.atomic():
+        current = {entry.position: entry for entry in LeaderboardEntry.objects.filter(board=board)}
+        changed, created = [], []
+        for position, (movie_id, score, rating_count) in enumerate(ranking, start=1):
+            entry = current.pop(position, None)
+            if entry is None:
+                created.append(LeaderboardEntry(board=board, position=position, movie_id=movie_id, score=score,
+                                                rating_count=rating_count, refreshed_at=refreshed_at))
+            elif (entry.movie_id, entry.score, entry.rating_count) != (movie_id, score, rating_count):
+                entry.movie_id, entry.score, entry.rating_count = movie_id, score, rating_count
+                changed.append(entry)
+        removed = [entry.pk for entry in current.values()]
+        if removed:
+            LeaderboardEntry.objects.filter(pk__in=removed).delete()
+        LeaderboardEntry.objects.bulk_update(changed, fields)
+        LeaderboardEntry.objects.bulk_create(created)
+        LeaderboardEntry.objects.filter(board=board).update(refreshed_at=refreshed_at)
+    return len(changed) + len(created) + len(removed)
+
+
+def refresh_leaderboards(boards=None, size=None):
+    """
+    Recompute ``boards`` (default: all) and return a dict mapping each board
+    to the number of positions that changed.
+    """
+    size = size or settings.LEADERBOARD_SIZE
+    now = timezone.now()
+    written = {}
+    for board in boards or Board.values:
+        ranking = rank_trending(size, now) if board == Board.TRENDING else rank_top_rated(size)
+        written[board] = write_board(board, ranking, now)
+    return written
+
+
+def get_leaderboard(board, limit):
+    """
+    Return the first ``limit`` entries of ``board``, with their movies, from
+    one query, as of the last refresh.
+    """
+    return list(
+        LeaderboardEntry.objects
+        .filter(board=board)
+        .select_related('movie')
+        .order_by('position')[:limit]
+    )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from movie.catalog_io import FORMATS, export_rows, format_for_filename
+
+
+class Command(BaseCommand):
+    help = 'Export all movies or ratings to a CSV or JSON Lines file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to write, or - for stdout.')
+        parser.add_argument('--model', choices=['movies', 'ratings'], default='movies')
+        parser.add_argument('--format', dest='file_format', choices=list(FORMATS),
+                            help='File format (default: from the file extension, else csv).')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['file_format'] or format_for_filename(path)
+
+        if path == '-':
+            for chunk in export_rows(options['model'], file_format):
+                self.stdout.write(chunk, ending='')
+            return
+
+        with open(path, 'w', newline='', encoding='utf-8') as stream:
+            for chunk in export_rows(options['model'], file_format):
+                stream.write(chunk)
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from Movie_Management_System.schema import code_version, generate_schema, write_schema
+
+
+class Command(BaseCommand):
+    help = 'Generate the OpenAPI schema served at /api/schema/ for the current code version.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', help='Write the schema here (default: OPENAPI_SCHEMA_FILE).')
+
+    def handle(self, *args, **options):
+        path = options['file'] or settings.OPENAPI_SCHEMA_FILE
+        write_schema(generate_schema(), code_version(), path)
+        self.stdout.write(self.style.SUCCESS(f'Wrote the schema for code version {code_version()} to {path}.'))
@@ -0,0 +1,50 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from movie.catalog_io import FORMATS, UnreadableFile, decode_lines, format_for_filename, import_rows, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Import movies or ratings from a CSV or JSON Lines file. Rejected rows are reported on stderr.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to read, or - for stdin.')
+        parser.add_argument('--model', choices=['movies', 'ratings'], default='movies')
+        parser.add_argument('--format', dest='file_format', choices=list(FORMATS),
+                            help='File format (default: from the file extension, else csv).')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--created-by', help='Username that owns movies without a created_by column.')
+
+    def handle(self, *args, **options):
+        default_owner = None
+        if options['created_by']:
+            try:
+                default_owner = User.objects.get(username=options['created_by'])
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['created_by']!r} does not exist")
+
+        path = options['path']
+        file_format = options['file_format'] or format_for_filename(path)
+
+        def report(line, errors):
+            self.stderr.write(json.dumps({'line': line, 'errors': errors}))
+
+        stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        try:
+            result = import_rows(
+                read_rows(decode_lines(stream), file_format), options['model'],
+                batch_size=options['batch_size'], default_owner=default_owner, on_error=report,
+            )
+        except UnreadableFile as exc:
+            # Batches written before the unreadable line stay imported.
+            raise CommandError(str(exc))
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.imported} {options['model']}, rejected {result.failed} row(s)."
+        ))
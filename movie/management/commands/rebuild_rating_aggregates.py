@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from movie.models import Movie
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized rating aggregates on Movie from the Rating table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'movie_ids', nargs='*', type=int,
+            help='Only rebuild these movies (default: all movies).',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Movie.objects.all()
+        if options['movie_ids']:
+            queryset = queryset.filter(pk__in=options['movie_ids'])
+
+        with transaction.atomic():
+            updated = Movie.rebuild_rating_aggregates(queryset)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt rating aggregates for {updated} movie(s).'))
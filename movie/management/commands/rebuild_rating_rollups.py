@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from movie.models import Rating
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the rating histograms and daily and weekly rating rollups from the Rating table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'movie_ids', nargs='*', type=int,
+            help='Only rebuild these movies (default: all movies).',
+        )
+
+    def handle(self, *args, **options):
+        Rating.rebuild_rollups(options['movie_ids'] or None)
+
+        scope = f'{len(options["movie_ids"])} movie(s)' if options['movie_ids'] else 'all movies'
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt rating rollups for {scope}.'))
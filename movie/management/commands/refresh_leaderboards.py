@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from movie.leaderboards import Board, refresh_leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Recompute the top rated and trending leaderboards.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--board', action='append', choices=Board.values, dest='boards',
+            help='Only refresh this board; may be repeated (default: all boards).',
+        )
+        parser.add_argument('--size', type=int, help='Number of positions to keep (default: LEADERBOARD_SIZE).')
+
+    def handle(self, *args, **options):
+        written = refresh_leaderboards(options['boards'], options['size'])
+        for board, changed in written.items():
+            self.stdout.write(self.style.SUCCESS(f'Refreshed {board}: {changed} position(s) changed.'))
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.2 on 2026-10-18 03:08
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def populate_rating_aggregates(apps, schema_editor):
+    Movie = apps.get_model('movie', 'Movie')
+    Rating = apps.get_model('movie', 'Rating')
+    ratings = Rating.objects.filter(movie=OuterRef('pk')).values('movie')
+    Movie.objects.update(
+        rating_count=Coalesce(Subquery(ratings.annotate(c=Count('id')).values('c')), 0),
+        rating_sum=Coalesce(Subquery(ratings.annotate(s=Sum('rating')).values('s')), 0.0),
+        rating_avg=Coalesce(Subquery(ratings.annotate(a=Avg('rating')).values('a')), 0.0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movie', '0002_report_approved_report_rejected'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='rating_avg',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='rating_sum',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.RunPython(populate_rating_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.2 on 2026-10-18 03:10
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Avg, Count, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def remove_duplicates(apps, schema_editor):
+    """
+    Keep only the most recent rating and report per (user, movie) so the
+    unique constraints can be created, then rebuild the affected movies'
+    rating aggregates.
+    """
+    Movie = apps.get_model('movie', 'Movie')
+    Rating = apps.get_model('movie', 'Rating')
+    Report = apps.get_model('movie', 'Report')
+
+    affected_movies = set()
+    for model in (Rating, Report):
+        duplicates = (
+            model.objects.values('user', 'movie')
+            .annotate(latest=Max('id'), n=Count('id'))
+            .filter(n__gt=1)
+        )
+        for row in duplicates:
+            model.objects.filter(user=row['user'], movie=row['movie'], id__lt=row['latest']).delete()
+            if model is Rating:
+                affected_movies.add(row['movie'])
+
+    if affected_movies:
+        ratings = Rating.objects.filter(movie=OuterRef('pk')).values('movie')
+        Movie.objects.filter(pk__in=affected_movies).update(
+            rating_count=Coalesce(Subquery(ratings.annotate(c=Count('id')).values('c')), 0),
+            rating_sum=Coalesce(Subquery(ratings.annotate(s=Sum('rating')).values('s')), 0.0),
+            rating_avg=Coalesce(Subquery(ratings.annotate(a=Avg('rating')).values('a')), 0.0),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movie', '0003_movie_rating_aggregates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='rating',
+            constraint=models.UniqueConstraint(fields=('user', 'movie'), name='unique_rating_per_user_movie'),
+        ),
+        migrations.AddConstraint(
+            model_name='report',
+            constraint=models.UniqueConstraint(fields=('user', 'movie'), name='unique_report_per_user_movie'),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Full-text search index for Movie.title and Movie.description.
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# External content FTS5 table: the text lives in movie_movie and the index is
+# kept in sync by triggers. SQLite drops a table's triggers when Django
+# remakes it, so a later migration that remakes movie_movie must run
+# CREATE_TRIGGERS again.
+CREATE_INDEX = [
+    """
+    CREATE VIRTUAL TABLE movie_movie_fts USING fts5(
+        title, description,
+        content='movie_movie', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    "INSERT INTO movie_movie_fts(movie_movie_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+    "INSERT INTO movie_movie_fts(movie_movie_fts) VALUES ('rebuild')",
+]
+
+CREATE_TRIGGERS = [
+    """
+    CREATE TRIGGER movie_movie_fts_ai AFTER INSERT ON movie_movie BEGIN
+        INSERT INTO movie_movie_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER movie_movie_fts_ad AFTER DELETE ON movie_movie BEGIN
+        INSERT INTO movie_movie_fts(movie_movie_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER movie_movie_fts_au AFTER UPDATE OF title, description ON movie_movie BEGIN
+        INSERT INTO movie_movie_fts(movie_movie_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO movie_movie_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+DROP_INDEX = [
+    'DROP TRIGGER IF EXISTS movie_movie_fts_ai',
+    'DROP TRIGGER IF EXISTS movie_movie_fts_ad',
+    'DROP TRIGGER IF EXISTS movie_movie_fts_au',
+    'DROP TABLE IF EXISTS movie_movie_fts',
+]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in CREATE_INDEX + CREATE_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_INDEX:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movie', '0004_unique_rating_and_report_per_user'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.CreateModel(
+            name='MovieSearchIndex',
+            fields=[
+                ('movie', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='movie.movie')),
+                ('title', models.TextField()),
+                ('description', models.TextField()),
+                ('document', models.TextField(db_column='movie_movie_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'movie_movie_fts',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.2 on 2026-10-18 03:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def forwards(apps, schema_editor):
+    Report = apps.get_model('movie', 'Report')
+    Report.objects.filter(approved=True).update(status='approved')
+    Report.objects.filter(approved=False, rejected=True).update(status='rejected')
+
+
+def backwards(apps, schema_editor):
+    Report = apps.get_model('movie', 'Report')
+    Report.objects.filter(status='approved').update(approved=True, rejected=False)
+    Report.objects.filter(status='rejected').update(approved=False, rejected=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movie', '0006_movie_catalog_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')], default='pending', max_length=16),
+        ),
+        migrations.RunPython(forwards, backwards),
+        migrations.RemoveField(
+            model_name='report',
+            name='approved',
+        ),
+        migrations.RemoveField(
+            model_name='report',
+            name='rejected',
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['status', 'id'], name='report_status_idx'),
+        ),
+    ]
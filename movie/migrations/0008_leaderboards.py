@@ -0,0 +1,40 @@
+# Generated by Django 5.1.2 on 2026-10-18 03:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movie', '0007_report_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(choices=[('top_rated', 'Top rated'), ('trending', 'Trending')], max_length=16)),
+                ('position', models.PositiveIntegerField()),
+                ('score', models.FloatField()),
+                ('rating_count', models.PositiveIntegerField()),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['created_at', 'movie', 'rating'], name='rating_recent_idx'),
+        ),
+        migrations.AddField(
+            model_name='leaderboardentry',
+            name='movie',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movie.movie'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('board', 'position'), name='unique_leaderboard_position'),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.1.2 on 2026-10-18 03:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum, Value
+from django.db.models.functions import TruncDate, TruncWeek
+
+from movie.rollups import insert_from, rating_stars_expression
+
+
+def populate_rating_rollups(apps, schema_editor):
+    # The same INSERT ... SELECT statements as Rating.rebuild_rollups(), on
+    # the historical models, so that existing ratings are counted before
+    # writes start adjusting the tables.
+    Rating = apps.get_model('movie', 'Rating')
+    RatingHistogram = apps.get_model('movie', 'RatingHistogram')
+    RatingRollup = apps.get_model('movie', 'RatingRollup')
+    ratings = Rating.objects.order_by()
+    insert_from(RatingHistogram, ['movie', 'stars', 'count'], (
+        ratings.annotate(stars=rating_stars_expression('rating'))
+        .values('movie', 'stars').annotate(count=Count('id'))
+    ))
+    for period, trunc in (('day', TruncDate('created_at')),
+                          ('week', TruncWeek('created_at', output_field=models.DateField()))):
+        insert_from(RatingRollup, ['movie', 'period', 'start', 'count', 'total'], (
+            ratings.annotate(period=Value(period), start=trunc)
+            .values('movie', 'period', 'start').annotate(count=Count('id'), total=Sum('rating'))
+        ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movie', '0008_leaderboards'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingHistogram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stars', models.PositiveSmallIntegerField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RatingRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('week', 'Week')], max_length=8)),
+                ('start', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+                ('total', models.FloatField(default=0.0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['movie', 'created_at'], name='rating_movie_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='ratinghistogram',
+            name='movie',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movie.movie'),
+        ),
+        migrations.AddField(
+            model_name='ratingrollup',
+            name='movie',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movie.movie'),
+        ),
+        migrations.AddConstraint(
+            model_name='ratinghistogram',
+            constraint=models.UniqueConstraint(fields=('movie', 'stars'), name='unique_histogram_bucket'),
+        ),
+        migrations.AddConstraint(
+            model_name='ratingrollup',
+            constraint=models.UniqueConstraint(fields=('movie', 'period', 'start'), name='unique_rollup_period'),
+        ),
+        migrations.RunPython(populate_rating_rollups, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,16 @@
-from django.db import models
+import datetime
+
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from accounts.models import User
-from django.db.models import Avg
+from django.db.models import Avg, Case, Count, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, TruncDate, TruncWeek
+from django.db.models.lookups import GreaterThan
+
+from django.utils import timezone
+
+from .cache import bump_catalog_version
+from .rollups import increment, insert_from, rating_stars, rating_stars_expression
 
 class Movie(models.Model):
     title = models.CharField(max_length=200)
@@ -15,17 +24,118 @@ class Movie(models.Model):
     language = models.CharField(max_length=50)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Denormalized rating aggregates, maintained by apply_rating_delta()
+    # and rebuilt from the Rating table by rebuild_rating_aggregates().
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.FloatField(default=0.0)
+    rating_avg = models.FloatField(default=0.0)
+
+    RATING_AGGREGATE_FIELDS = ['rating_count', 'rating_sum', 'rating_avg']
+
+    class Meta:
+        # Catalog filters and sort keys of MovieListView. The trailing id
+        # matches the tiebreaker used by cursor pagination.
+        indexes = [
+            models.Index(fields=['released_at', 'id'], name='movie_released_idx'),
+            models.Index(fields=['rating_avg', 'id'], name='movie_rating_avg_idx'),
+            models.Index(fields=['rating_count', 'id'], name='movie_rating_count_idx'),
+            models.Index(fields=['genre', 'released_at'], name='movie_genre_released_idx'),
+            models.Index(fields=['language', 'released_at'], name='movie_language_released_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
     def average_rating(self):
-        ratings = self.rating_set.all()  
-        if ratings.exists():
-            return ratings.aggregate(Avg('rating'))['rating__avg']  
-        return 0.0  
+        return self.rating_avg
 
     def total_ratings(self):
-        return self.rating_set.count()  
+        return self.rating_count
+
+    @classmethod
+    def apply_rating_delta(cls, movie_id, count_delta, sum_delta):
+        """
+        Atomically shift a movie's rating aggregates in a single UPDATE.
+        """
+        return cls._shift_rating_aggregates(cls.objects.filter(pk=movie_id), count_delta, sum_delta)
+
+    @classmethod
+    def apply_rating_deltas(cls, deltas):
+        """
+        Shift the aggregates of several movies in a single UPDATE.
+        ``deltas`` maps a movie id to a ``(count_delta, sum_delta)`` pair.
+        """
+        if not deltas:
+            return 0
+        count_delta = Case(
+            *[When(pk=pk, then=Value(count)) for pk, (count, _) in deltas.items()],
+            default=Value(0),
+        )
+        sum_delta = Case(
+            *[When(pk=pk, then=Value(float(total))) for pk, (_, total) in deltas.items()],
+            default=Value(0.0),
+        )
+        return cls._shift_rating_aggregates(cls.objects.filter(pk__in=deltas), count_delta, sum_delta)
+
+    @staticmethod
+    def _shift_rating_aggregates(queryset, count_delta, sum_delta):
+        new_count = F('rating_count') + count_delta
+        new_sum = F('rating_sum') + sum_delta
+        bump_catalog_version()
+        return queryset.update(
+            rating_count=new_count,
+            rating_sum=new_sum,
+            rating_avg=Case(
+                When(GreaterThan(new_count, 0), then=new_sum / new_count),
+                default=Value(0.0),
+                output_field=models.FloatField(),
+            ),
+        )
+
+    @classmethod
+    def rebuild_rating_aggregates(cls, queryset=None):
+        """
+        Recompute rating aggregates from the Rating table to repair drift.
+        """
+        queryset = cls.objects.all() if queryset is None else queryset
+        ratings = Rating.objects.filter(movie=OuterRef('pk')).values('movie')
+        bump_catalog_version()
+        return queryset.update(
+            rating_count=Coalesce(Subquery(ratings.annotate(c=Count('id')).values('c')), 0),
+            rating_sum=Coalesce(Subquery(ratings.annotate(s=Sum('rating')).values('s')), 0.0),
+            rating_avg=Coalesce(Subquery(ratings.annotate(a=Avg('rating')).values('a')), 0.0),
+        )
+
+class MovieSearchIndex(models.Model):
+    """
+    Read-only view of the ``movie_movie_fts`` FTS5 index, which is kept in
+    sync with ``movie_movie`` by triggers (see migration 0005).
+    """
+    movie = models.OneToOneField(
+        Movie, primary_key=True, db_column='rowid', db_constraint=False,
+        on_delete=models.DO_NOTHING, related_name='search_index',
+    )
+    title = models.TextField()
+    description = models.TextField()
+    # FTS5's hidden column named after the table, the left operand of MATCH.
+    document = models.TextField(db_column='movie_movie_fts')
+    # FTS5's hidden rank column, configured as bm25 weighting title over description.
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'movie_movie_fts'
+
+
+@MovieSearchIndex._meta.get_field('document').register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
 
 class Rating(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -33,15 +143,288 @@ class Rating(models.Model):
     rating = models.FloatField(default=0.0, validators=[MinValueValidator(1), MaxValueValidator(5)])
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'movie'], name='unique_rating_per_user_movie'),
+        ]
+        indexes = [
+            # Covers the trending leaderboard, which groups recent ratings by
+            # movie without reading the table itself.
+            models.Index(fields=['created_at', 'movie', 'rating'], name='rating_recent_idx'),
+            # A movie's ratings in time order, for the rating list and for
+            # rebuilding one movie's rollups.
+            models.Index(fields=['movie', 'created_at'], name='rating_movie_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} rated {self.movie.title}"
 
+    @classmethod
+    def upsert(cls, user, movie_id, rating):
+        """
+        Create or replace ``user``'s rating of a movie. Runs, in one
+        transaction: a SELECT of the previous rating (FOR UPDATE where the
+        database supports it; SQLite serializes writers instead), an UPDATE
+        of the movie's aggregates, which also tells whether the movie exists,
+        the rating's INSERT ... ON CONFLICT DO UPDATE and the two rollup
+        upserts of update_rollups(). Returns False if the movie does not exist.
+        """
+        with transaction.atomic():
+            previous = (
+                cls.objects.select_for_update()
+                .filter(user=user, movie_id=movie_id)
+                .values_list('rating', 'created_at')
+                .first()
+            )
+            old_rating = previous[0] if previous else None
+            if not Movie.apply_rating_delta(movie_id, 0 if previous else 1, rating - (old_rating or 0.0)):
+                return False
+            obj = cls(user=user, movie_id=movie_id, rating=rating)
+            cls.objects.bulk_create(
+                [obj],
+                update_conflicts=True,
+                unique_fields=['user', 'movie'],
+                update_fields=['rating'],
+            )
+            cls.update_rollups([(movie_id, previous[1] if previous else obj.created_at, old_rating, rating)])
+        return True
+
+    @classmethod
+    def bulk_upsert(cls, user, ratings):
+        """
+        Create or replace many of ``user``'s ratings at once. ``ratings`` maps
+        movie ids to rating values; ids of movies that do not exist are skipped.
+        Returns a dict mapping each written movie id to True if its rating was
+        created or False if it replaced an existing one.
+        """
+        with transaction.atomic():
+            movie_ids = set(Movie.objects.filter(pk__in=ratings).values_list('pk', flat=True))
+            previous = {
+                movie_id: (rating, created_at)
+                for movie_id, rating, created_at in cls.objects.select_for_update()
+                .filter(user=user, movie_id__in=movie_ids)
+                .values_list('movie_id', 'rating', 'created_at')
+            }
+            objs = [cls(user=user, movie_id=movie_id, rating=ratings[movie_id]) for movie_id in movie_ids]
+            cls.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=['user', 'movie'],
+                update_fields=['rating'],
+            )
+            Movie.apply_rating_deltas({
+                movie_id: (
+                    0 if movie_id in previous else 1,
+                    ratings[movie_id] - previous.get(movie_id, (0.0,))[0],
+                )
+                for movie_id in movie_ids
+            })
+            cls.update_rollups([
+                (obj.movie_id, previous[obj.movie_id][1], previous[obj.movie_id][0], obj.rating)
+                if obj.movie_id in previous else (obj.movie_id, obj.created_at, None, obj.rating)
+                for obj in objs
+            ])
+        return {movie_id: movie_id not in previous for movie_id in movie_ids}
+
+    @classmethod
+    def change(cls, instance, rating):
+        """
+        Set the value of the loaded rating ``instance`` and shift the
+        aggregates and rollups by the difference. The UPDATE only matches the
+        value the delta is computed from, so a concurrent change is read
+        again instead of drifting the aggregates. Returns False if the rating
+        no longer exists.
+        """
+        old_rating = instance.rating
+        with transaction.atomic():
+            while not cls.objects.filter(pk=instance.pk, rating=old_rating).update(rating=rating):
+                old_rating = cls.objects.filter(pk=instance.pk).values_list('rating', flat=True).first()
+                if old_rating is None:
+                    return False
+            Movie.apply_rating_delta(instance.movie_id, 0, rating - old_rating)
+            cls.update_rollups([(instance.movie_id, instance.created_at, old_rating, rating)])
+        instance.rating = rating
+        return True
+
+    @classmethod
+    def remove(cls, instance):
+        """
+        Delete the loaded rating ``instance`` and take it out of the
+        aggregates and rollups, only if this call deleted the row, guarded on
+        its value like change(). Returns False if it no longer exists.
+        """
+        rating = instance.rating
+        with transaction.atomic():
+            while not cls.objects.filter(pk=instance.pk, rating=rating).delete()[1].get(cls._meta.label):
+                rating = cls.objects.filter(pk=instance.pk).values_list('rating', flat=True).first()
+                if rating is None:
+                    return False
+            Movie.apply_rating_delta(instance.movie_id, -1, -rating)
+            cls.update_rollups([(instance.movie_id, instance.created_at, rating, None)])
+        return True
+
+    @classmethod
+    def update_rollups(cls, changes):
+        """
+        Apply rating writes to RatingHistogram and RatingRollup. ``changes``
+        holds one ``(movie_id, created_at, old_rating, new_rating)`` per
+        written rating, with ``old_rating`` None for a new rating and
+        ``new_rating`` None for a deleted one. Runs at most two statements.
+        """
+        histogram, rollups = {}, {}
+        for movie_id, created_at, old, new in changes:
+            count_delta = (new is not None) - (old is not None)
+            total_delta = (new or 0.0) - (old or 0.0)
+            if old is not None:
+                key = (movie_id, rating_stars(old))
+                histogram[key] = histogram.get(key, 0) - 1
+            if new is not None:
+                key = (movie_id, rating_stars(new))
+                histogram[key] = histogram.get(key, 0) + 1
+            day = timezone.localdate(created_at)
+            for period, start in ((RatingRollup.Period.DAY, day),
+                                  (RatingRollup.Period.WEEK, day - datetime.timedelta(days=day.weekday()))):
+                counts = rollups.setdefault((movie_id, period, start), [0, 0.0])
+                counts[0] += count_delta
+                counts[1] += total_delta
+
+        increment(RatingHistogram, ['movie', 'stars'], ['count'],
+                  [(*key, count) for key, count in histogram.items() if count])
+        increment(RatingRollup, ['movie', 'period', 'start'], ['count', 'total'],
+                  [(*key, count, total) for key, (count, total) in rollups.items() if count or total])
+
+    @classmethod
+    def rebuild_rollups(cls, movie_ids=None):
+        """
+        Recompute RatingHistogram and RatingRollup from the Rating table, for
+        ``movie_ids`` or for every movie, with INSERT ... SELECT statements.
+        """
+        ratings = cls.objects.order_by()
+        histogram = RatingHistogram.objects.all()
+        rollups = RatingRollup.objects.all()
+        if movie_ids is not None:
+            ratings = ratings.filter(movie_id__in=movie_ids)
+            histogram = histogram.filter(movie_id__in=movie_ids)
+            rollups = rollups.filter(movie_id__in=movie_ids)
+
+        with transaction.atomic():
+            histogram.delete()
+            rollups.delete()
+            insert_from(RatingHistogram, ['movie', 'stars', 'count'], (
+                ratings.annotate(stars=rating_stars_expression('rating'))
+                .values('movie', 'stars').annotate(count=Count('id'))
+            ))
+            for period, trunc in ((RatingRollup.Period.DAY, TruncDate('created_at')),
+                                  (RatingRollup.Period.WEEK, TruncWeek('created_at', output_field=models.DateField()))):
+                insert_from(RatingRollup, ['movie', 'period', 'start', 'count', 'total'], (
+                    ratings.annotate(period=Value(period.value), start=trunc)
+                    .values('movie', 'period', 'start').annotate(count=Count('id'), total=Sum('rating'))
+                ))
+
+
+class RatingHistogram(models.Model):
+    """
+    Number of a movie's ratings with each number of stars, maintained by
+    Rating.update_rollups() and rebuilt by Rating.rebuild_rollups().
+    """
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='+')
+    stars = models.PositiveSmallIntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['movie', 'stars'], name='unique_histogram_bucket'),
+        ]
+
+
+class RatingRollup(models.Model):
+    """
+    Number and sum of the ratings of a movie created in one day or week,
+    maintained like RatingHistogram. Weeks start on Monday.
+    """
+
+    class Period(models.TextChoices):
+        DAY = 'day', 'Day'
+        WEEK = 'week', 'Week'
+
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='+')
+    period = models.CharField(max_length=8, choices=Period.choices)
+    start = models.DateField()
+    count = models.IntegerField(default=0)
+    total = models.FloatField(default=0.0)
+
+    class Meta:
+        # The constraint's index serves reads of a date range.
+        constraints = [
+            models.UniqueConstraint(fields=['movie', 'period', 'start'], name='unique_rollup_period'),
+        ]
+
+    @property
+    def average(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class LeaderboardEntry(models.Model):
+    """
+    One position of a precomputed leaderboard, written by
+    movie.leaderboards.refresh_leaderboards().
+    """
+
+    class Board(models.TextChoices):
+        TOP_RATED = 'top_rated', 'Top rated'
+        TRENDING = 'trending', 'Trending'
+
+    board = models.CharField(max_length=16, choices=Board.choices)
+    position = models.PositiveIntegerField()
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='+')
+    # What the board is ranked by, and the number of ratings it is based on.
+    score = models.FloatField()
+    rating_count = models.PositiveIntegerField()
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        # The constraint's index serves reads, which are a range scan over
+        # one board's positions.
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'position'], name='unique_leaderboard_position'),
+        ]
+
+    def __str__(self):
+        return f"{self.board} #{self.position}: {self.movie_id}"
+
+
 class Report(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     movie = models.ForeignKey(Movie, on_delete=models.CASCADE)
     reason = models.CharField(max_length=256)
-    approved = models.BooleanField(default=False)
-    rejected = models.BooleanField(default=False)
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        APPROVED = 'approved', 'Approved'
+        REJECTED = 'rejected', 'Rejected'
+
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'movie'], name='unique_report_per_user_movie'),
+        ]
+        indexes = [
+            # Covers the moderation queue (pending, oldest first) and lets the
+            # per-status counts be read from the index alone.
+            models.Index(fields=['status', 'id'], name='report_status_idx'),
+        ]
+
+    @classmethod
+    def status_counts(cls):
+        """
+        Return the number of reports in every status, from one GROUP BY query.
+        """
+        counts = dict.fromkeys(cls.Status.values, 0)
+        counts.update(
+            cls.objects.order_by().values_list('status').annotate(n=models.Count('id')).values_list('status', 'n')
+        )
+        return counts
 
     def __str__(self):
         return f"{self.user.username} reported {self.movie.title}"
\ No newline at end of file
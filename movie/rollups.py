@@ -0,0 +1,70 @@
+"""
+SQL helpers for the rating rollup tables, RatingHistogram and RatingRollup.
+
+Rating.update_rollups() adds the deltas of rating writes with increment(),
+one INSERT ... ON CONFLICT DO UPDATE per table. Rating.rebuild_rollups()
+recomputes the tables with insert_from(), one INSERT ... SELECT per table and
+period, so rebuilding never reads the ratings into Python. Both bucket
+ratings into stars the same way, in Python with rating_stars() and in SQL
+with rating_stars_expression().
+"""
+import datetime
+
+from django.db import connections, models, router
+from django.db.models import F
+from django.db.models.functions import Cast
+
+
+def rating_stars(rating):
+    """
+    Histogram bucket of a rating: rounded half up to a whole star.
+    """
+    return int(rating + 0.5)
+
+
+def rating_stars_expression(field):
+    # CAST truncates towards zero, matching rating_stars() for ratings >= 1.
+    return Cast(F(field) + 0.5, models.IntegerField())
+
+
+def increment(model, key_fields, value_fields, rows):
+    """
+    Add each row's values to the ``model`` row with the same key, creating
+    it if needed, with one INSERT ... ON CONFLICT DO UPDATE statement.
+    """
+    if not rows:
+        return
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    keys = [quote(model._meta.get_field(name).column) for name in key_fields]
+    values = [quote(model._meta.get_field(name).column) for name in value_fields]
+    placeholders = ', '.join(['(' + ', '.join(['%s'] * (len(keys) + len(values))) + ')'] * len(rows))
+    sql = (
+        f'INSERT INTO {table} ({", ".join(keys + values)}) VALUES {placeholders} '
+        f'ON CONFLICT ({", ".join(keys)}) DO UPDATE SET '
+        + ', '.join(f'{column} = {table}.{column} + excluded.{column}' for column in values)
+    )
+    params = [
+        connection.ops.adapt_datefield_value(value) if isinstance(value, datetime.date) else value
+        for row in rows for value in row
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def insert_from(model, fields, queryset):
+    """
+    Insert the rows of a ``values()`` queryset, whose columns are ``fields``
+    in order, into ``model`` without reading them into Python.
+    """
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(model._meta.get_field(name).column) for name in fields)
+    # Compile the SELECT for the connection the INSERT runs on. Its columns
+    # are the values() fields, then the annotations in the order they were
+    # added, so callers list ``fields`` in that order. RollupConsistencyTests
+    # checks the rebuilt tables against the incrementally maintained ones.
+    sql, params = queryset.query.get_compiler(connection=connection).as_sql()
+    with connection.cursor() as cursor:
+        cursor.execute(f'INSERT INTO {quote(model._meta.db_table)} ({columns}) {sql}', params)
@@ -0,0 +1,32 @@
+import re
+
+from django.db.models import F
+
+from .models import Movie
+
+_TERM_RE = re.compile(r'\w+')
+
+
+def build_match_query(text):
+    """
+    Turn free text into an FTS5 query that prefix-matches every term.
+
+    Each term is quoted so FTS5 syntax in user input (``OR``, ``NEAR``, ``-``,
+    column filters) is searched for literally instead of being interpreted.
+    """
+    return ' '.join(f'"{term}"*' for term in _TERM_RE.findall(text))
+
+
+def search_movies(text):
+    """
+    Return movies matching ``text`` from the FTS5 index, annotated with
+    ``search_rank`` (bm25, lower is more relevant).
+    """
+    query = build_match_query(text)
+    if not query:
+        return Movie.objects.none()
+    return (
+        Movie.objects
+        .filter(search_index__document__match=query)
+        .annotate(search_rank=F('search_index__rank'))
+    )
@@ -1,3 +1,1263 @@
-from django.test import TestCase
+import base64
+import datetime
+import json
+import os
+import sqlite3
+import tempfile
+import zoneinfo
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.conf import settings
+from django.db import connection, connections
+from django.db.utils import load_backend
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from Movie_Management_System import metrics, routers, schema
+from accounts.models import User
+from benchmarks.dataset import seed
+from benchmarks.endpoints import Endpoint, clear_caches, endpoints_for, run_endpoint
+from benchmarks.serializers import cases, paths
+from movie.api import urls
+from movie.api.views import MovieListView, MovieRatingDetailView
+from movie.leaderboards import refresh_leaderboards
+from movie.models import Movie, Rating, RatingHistogram, RatingRollup, Report
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Every movie API route must stay within the query budget declared in
+    benchmarks/endpoints.py.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = seed(users=20, movies=60, ratings_per_movie=10, reports=30)
+
+    def test_every_route_has_a_budget(self):
+        routes = {str(pattern.pattern) for pattern in urls.urlpatterns}
+        covered = {endpoint.route for endpoint in endpoints_for('movie')}
+        self.assertEqual(routes - covered, set())
+
+    def test_endpoints_stay_within_budget(self):
+        for endpoint in endpoints_for('movie'):
+            with self.subTest(endpoint.name):
+                result = run_endpoint(endpoint, self.dataset)
+                self.assertEqual(result.status, endpoint.status)
+                self.assertLessEqual(
+                    len(result.queries), endpoint.budget,
+                    '\n'.join(query['sql'] for query in result.queries),
+                )
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        lists = [
+            ('/api/movies/', 'anonymous'),
+            ('/api/movies/search/?q=movie', 'anonymous'),
+            ('/api/{d.movie_id}/rating/', 'member'),
+            ('/api/async/{d.movie_id}/rating/', 'member'),
+            ('/api/admin-report/', 'admin'),
+        ]
+        for path, role in lists:
+            with self.subTest(path):
+                counts = []
+                for page_size in (1, 50):
+                    separator = '&' if '?' in path else '?'
+                    endpoint = Endpoint('movie', '', 'GET', f'{path}{separator}page_size={page_size}',
+                                        budget=0, role=role)
+                    counts.append(len(run_endpoint(endpoint, self.dataset).queries))
+                self.assertEqual(counts[0], counts[1])
+
+
+class ValuesSerializerTests(TestCase):
+    """
+    The values fast path, rendered with JSONRenderer or ORJSONRenderer,
+    writes the same bytes as the DRF serializer rendered with JSONRenderer.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(users=10, movies=30, ratings_per_movie=5, reports=15)
+        # Values that the renderers or converters treat specially.
+        owner = User.objects.first()
+        Movie.objects.create(title='Line\u2028separator \u00e9\U0001f3ac', description='"quoted"\n\\',
+                             released_at=datetime.date(1900, 1, 1), genre='drama', language='en',
+                             created_by=owner, rating_avg=1 / 3)
+
+    def test_every_path_matches_the_drf_serializer(self):
+        for name, serializer_class, queryset in cases():
+            options = paths(serializer_class, queryset)
+            serialize, render = options['drf + json']
+            expected = render(serialize())
+            for path, (serialize, render) in options.items():
+                with self.subTest(name, path=path):
+                    self.assertEqual(render(serialize()), expected)
+
+
+class CatalogTestCase(TestCase):
+    """
+    Base class for API behaviour tests. The response cache is cleared before
+    each test, since TestCase never commits and so never bumps the catalog
+    version.
+    """
+
+    def setUp(self):
+        clear_caches()
+        self.client = APIClient()
+
+    @classmethod
+    def create_user(cls, username, **kwargs):
+        return User.objects.create_user(username=username, email=f'{username}@example.com',
+                                        password='correct-horse-battery', **kwargs)
+
+    @classmethod
+    def create_movie(cls, title, created_by, **kwargs):
+        fields = {'description': f'About {title}.', 'released_at': datetime.date(2000, 1, 1),
+                  'genre': 'drama', 'language': 'en', **kwargs}
+        return Movie.objects.create(title=title, created_by=created_by, **fields)
+
+    def walk(self, url, direction='next'):
+        """
+        Follow ``direction`` links from ``url`` and return every page's results.
+        """
+        results = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+            results.append(page['results'])
+            url = page[direction]
+        return results
+
+
+class CursorPaginationTests(CatalogTestCase):
+    """
+    Cursor pages over sort keys shared by many rows visit every row once.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = cls.create_user('owner')
+        # Thirteen unrated movies tie on every rating column, and three
+        # release dates are shared by four or five movies each.
+        cls.movies = [
+            cls.create_movie(f'Movie {i:02}', owner, released_at=datetime.date(2000 + i % 3, 1, 1))
+            for i in range(13)
+        ]
+
+    def expected_titles(self, key, descending):
+        movies = sorted(self.movies, key=lambda movie: (key(movie), movie.id), reverse=descending)
+        return [movie.title for movie in movies]
+
+    def test_pages_through_tied_rows_in_both_directions(self):
+        keys = {
+            'released_at': lambda movie: movie.released_at,
+            'average_rating': lambda movie: movie.rating_avg,
+            'total_ratings': lambda movie: movie.rating_count,
+        }
+        for name, key in keys.items():
+            for descending in (False, True):
+                ordering = f'-{name}' if descending else name
+                with self.subTest(ordering):
+                    pages = self.walk(f'/api/movies/?ordering={ordering}&page_size=4')
+                    self.assertEqual([len(page) for page in pages], [4, 4, 4, 1])
+                    titles = [movie['title'] for page in pages for movie in page]
+                    self.assertEqual(titles, self.expected_titles(key, descending))
+
+                    # Walk back from the last page with the previous links.
+                    last = self.client.get(f'/api/movies/?ordering={ordering}&page_size=4')
+                    while last.json()['next']:
+                        last = self.client.get(last.json()['next'])
+                    back = self.walk(last.json()['previous'], direction='previous')
+                    self.assertEqual([movie['title'] for page in reversed(back) for movie in page], titles[:12])
+
+    def test_pages_use_a_range_scan_without_offset(self):
+        first = self.client.get('/api/movies/?ordering=-average_rating&page_size=4').json()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(first['next'])
+        self.assertTrue(queries.captured_queries)
+        for query in queries.captured_queries:
+            self.assertNotIn('OFFSET', query['sql'])
+
+    def test_rejects_malformed_cursor(self):
+        response = self.client.get('/api/movies/?ordering=released_at&cursor=cD1ub3Rqc29u')
+        self.assertEqual(response.status_code, 404)
+
+    def test_rejects_cursor_values_of_the_wrong_type(self):
+        cursors = {
+            '': 'p=abc',
+            'released_at': 'p=["x", 1]',
+            '-total_ratings': 'p=[[1], 1]',
+        }
+        for ordering, cursor in cursors.items():
+            with self.subTest(ordering=ordering, cursor=cursor):
+                encoded = base64.b64encode(cursor.encode()).decode()
+                response = self.client.get('/api/movies/', {'ordering': ordering, 'cursor': encoded})
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.json(), {'detail': 'Invalid cursor'})
+
+
+class RatingAggregateTests(CatalogTestCase):
+    """
+    The stored rating aggregates follow every rating write.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = cls.create_user('owner')
+        cls.other = cls.create_user('other')
+        cls.movie = cls.create_movie('Aggregates', cls.owner)
+
+    def assertAggregates(self, count, total, average):
+        self.movie.refresh_from_db()
+        self.assertEqual(self.movie.rating_count, count)
+        self.assertAlmostEqual(self.movie.rating_sum, total)
+        self.assertAlmostEqual(self.movie.rating_avg, average)
+        # Repairing the aggregates from the Rating table changes nothing.
+        Movie.rebuild_rating_aggregates(Movie.objects.filter(pk=self.movie.pk))
+        self.movie.refresh_from_db()
+        self.assertEqual((self.movie.rating_count, self.movie.rating_avg), (count, average))
+
+    def rate(self, user, rating):
+        self.client.force_authenticate(user)
+        response = self.client.post(f'/api/{self.movie.pk}/rating-create/', {'rating': rating}, format='json')
+        self.assertEqual(response.status_code, 201)
+        return Rating.objects.get(user=user, movie=self.movie)
+
+    def test_create_update_and_delete(self):
+        self.assertAggregates(0, 0.0, 0.0)
+        owner_rating = self.rate(self.owner, 4)
+        other_rating = self.rate(self.other, 2)
+        self.assertAggregates(2, 6.0, 3.0)
+
+        self.client.force_authenticate(self.owner)
+        response = self.client.patch(f'/api/rating/{owner_rating.pk}/', {'rating': 5}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertAggregates(2, 7.0, 3.5)
+
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.delete(f'/api/rating/{other_rating.pk}/').status_code, 204)
+        self.assertAggregates(1, 5.0, 5.0)
+
+        response = self.client.get(f'/api/movie/{self.movie.pk}/')
+        self.assertEqual((response.json()['average_rating'], response.json()['total_ratings']), (5.0, 1))
+
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.client.delete(f'/api/rating/{owner_rating.pk}/').status_code, 204)
+        self.assertAggregates(0, 0.0, 0.0)
+
+    def concurrently(self, write):
+        """
+        Run ``write`` between the view loading the rating and changing it.
+        """
+        get_object = MovieRatingDetailView.get_object
+
+        def stale_get_object(view):
+            instance = get_object(view)
+            write(Rating.objects.get(pk=instance.pk))
+            return instance
+        return mock.patch.object(MovieRatingDetailView, 'get_object', stale_get_object)
+
+    def test_concurrent_writes_are_counted_once(self):
+        rating = self.rate(self.owner, 4)
+        self.rate(self.other, 2)
+        self.client.force_authenticate(self.owner)
+
+        # The view loaded 4, but the row holds 1 when the view writes.
+        with self.concurrently(lambda pk: Rating.change(pk, 1)):
+            response = self.client.patch(f'/api/rating/{rating.pk}/', {'rating': 5}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['rating'], response.json()['movie']['total_ratings']), (5.0, 2))
+        self.assertAggregates(2, 7.0, 3.5)
+
+        with self.concurrently(Rating.remove):
+            self.assertEqual(self.client.delete(f'/api/rating/{rating.pk}/').status_code, 404)
+        self.assertAggregates(1, 2.0, 2.0)
+
+
+class OneRatingPerUserTests(CatalogTestCase):
+    """
+    A user has at most one rating and one report per movie.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user('rater')
+        cls.movie = cls.create_movie('Once', cls.user)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.user)
+
+    def test_upsert_creates_then_replaces(self):
+        for rating in (2, 4):
+            response = self.client.put(f'/api/{self.movie.pk}/rating/', {'rating': rating}, format='json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['rating'], rating)
+        self.assertEqual(list(Rating.objects.filter(movie=self.movie).values_list('rating', flat=True)), [4.0])
+        self.movie.refresh_from_db()
+        self.assertEqual((self.movie.rating_count, self.movie.rating_avg), (1, 4.0))
+
+    def test_upsert_of_missing_movie_is_404(self):
+        response = self.client.put('/api/999999/rating/', {'rating': 3}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Rating.objects.exists())
+
+    def test_second_rating_is_400(self):
+        url = f'/api/{self.movie.pk}/rating-create/'
+        self.assertEqual(self.client.post(url, {'rating': 3}, format='json').status_code, 201)
+        response = self.client.post(url, {'rating': 5}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), ['You have already rated this movie'])
+        self.movie.refresh_from_db()
+        self.assertEqual((self.movie.rating_count, self.movie.rating_avg), (1, 3.0))
+
+    def test_second_report_is_400(self):
+        url = f'/api/{self.movie.pk}/report-create/'
+        self.assertEqual(self.client.post(url, {'reason': 'Spam'}, format='json').status_code, 201)
+        response = self.client.post(url, {'reason': 'Spam again'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Report.objects.filter(movie=self.movie).count(), 1)
+
+
+class RatingThrottleTests(CatalogTestCase):
+    """
+    Writing ratings is limited to 30 per minute per user, whichever endpoint
+    writes them.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user('rater')
+        cls.movie = cls.create_movie('Once', cls.user)
+        cls.other = cls.create_movie('Twice', cls.user)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.user)
+
+    def test_upserts_share_the_rating_create_bucket(self):
+        url = f'/api/{self.movie.pk}/rating/'
+        for _ in range(30):
+            self.assertEqual(self.client.put(url, {'rating': 3}, format='json').status_code, 200)
+
+        response = self.client.put(url, {'rating': 4}, format='json')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        response = self.client.post(f'/api/{self.other.pk}/rating-create/', {'rating': 4}, format='json')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(Rating.objects.get(user=self.user, movie=self.movie).rating, 3)
+
+
+
+class BulkRatingTests(CatalogTestCase):
+    """
+    POST /api/ratings/bulk/ returns one result per item, in request order.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user('bulk')
+        cls.rated, cls.unrated = cls.create_movie('Rated', cls.user), cls.create_movie('Unrated', cls.user)
+        Rating.upsert(cls.user, cls.rated.pk, 1)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.user)
+
+    def test_per_item_results(self):
+        response = self.client.post('/api/ratings/bulk/', [
+            {'movie_id': self.unrated.pk, 'rating': 2},
+            {'movie_id': self.rated.pk, 'rating': 3},
+            {'movie_id': 999999, 'rating': 3},
+            {'movie_id': self.unrated.pk, 'rating': 9},
+            {'movie_id': self.unrated.pk, 'rating': 5},
+            {'movie_id': 2 ** 70, 'rating': 3},
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([result['index'] for result in results], [0, 1, 2, 3, 4, 5])
+        self.assertEqual([result['status'] for result in results], ['created', 'updated', 'error', 'error', 'created', 'error'])
+        self.assertEqual(results[2]['errors'], {'movie_id': ['Movie not found']})
+        self.assertIn('rating', results[3]['errors'])
+        self.assertIn('movie_id', results[5]['errors'])
+
+        # The last valid item for a movie wins.
+        ratings = dict(Rating.objects.filter(user=self.user).values_list('movie_id', 'rating'))
+        self.assertEqual(ratings, {self.rated.pk: 3.0, self.unrated.pk: 5.0})
+        for movie, average in ((self.rated, 3.0), (self.unrated, 5.0)):
+            movie.refresh_from_db()
+            self.assertEqual((movie.rating_count, movie.rating_avg), (1, average))
+
+    def test_rejects_non_list_and_oversized_batches(self):
+        self.assertEqual(self.client.post('/api/ratings/bulk/', {'movie_id': 1}, format='json').status_code, 400)
+        items = [{'movie_id': self.rated.pk, 'rating': 3}] * 501
+        self.assertEqual(self.client.post('/api/ratings/bulk/', items, format='json').status_code, 400)
+        self.assertEqual(Rating.objects.get(user=self.user, movie=self.rated).rating, 1.0)
+
+
+class ResponseCacheTests(CatalogTestCase):
+    """
+    Catalog reads carry an ETag that changes with every catalog write.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user('reader')
+        cls.movie = cls.create_movie('Cached', cls.user)
+
+    def test_etag_and_304(self):
+        self.client.force_authenticate(self.user)
+        for url in ('/api/movies/', f'/api/movie/{self.movie.pk}/'):
+            with self.subTest(url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn('Last-Modified', response)
+
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b'')
+                # Only authentication may touch the database.
+                self.assertLessEqual(len(queries.captured_queries), 1)
+
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_write_invalidates_cached_responses(self):
+        url = f'/api/movie/{self.movie.pk}/'
+        self.client.force_authenticate(self.user)
+        before = self.client.get(url)
+        self.assertEqual(before.json()['total_ratings'], 0)
+
+        # The catalog version is replaced when the write commits.
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/{self.movie.pk}/rating-create/', {'rating': 4}, format='json')
+        self.assertEqual(response.status_code, 201)
+
+        after = self.client.get(url, HTTP_IF_NONE_MATCH=before['ETag'])
+        self.assertEqual(after.status_code, 200)
+        self.assertNotEqual(after['ETag'], before['ETag'])
+        self.assertEqual(after.json()['total_ratings'], 1)
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Safe requests read from a replica, a client that wrote reads from the
+    primary, and an unavailable replica fails over to the primary. The
+    replica is a backup of the test database taken in setUp, so it lags
+    behind every write made after that. The data is committed before the
+    backup, since a backup waits for open write transactions.
+    """
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(routers._unavailable_until.clear)
+        self.writer = CatalogTestCase.create_user('writer')
+        self.reader = CatalogTestCase.create_user('reader')
+        self.movie = CatalogTestCase.create_movie('Replicated', self.writer)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'replica.sqlite3')
+        replica = sqlite3.connect(path)
+        connection.connection.backup(replica)
+        replica.close()
+        self.add_replica('replica', path)
+        self.add_replica('missing', os.path.join(directory.name, 'missing.sqlite3'))
+
+    def add_replica(self, alias, path):
+        # Connections that are not in DATABASES may be opened by any test.
+        settings_dict = {**connection.settings_dict, 'NAME': f'file:{path}?mode=ro', 'OPTIONS': {}}
+        connections[alias] = load_backend(settings_dict['ENGINE']).DatabaseWrapper(settings_dict, alias)
+        self.addCleanup(connections.__delitem__, alias)
+        self.addCleanup(connections[alias].close)
+
+    def client_for(self, user):
+        return APIClient(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+
+    def rating_count(self, client):
+        response = client.get(f'/api/{self.movie.pk}/rating/')
+        self.assertEqual(response.status_code, 200)
+        return len(response.json()['results'])
+
+    @override_settings(DATABASE_READ_REPLICAS=['replica'])
+    def test_safe_requests_read_from_the_replica(self):
+        Rating.upsert(self.writer, self.movie.pk, 4)
+        self.assertEqual(self.rating_count(self.client_for(self.reader)), 0)
+
+    @override_settings(DATABASE_READ_REPLICAS=['replica'])
+    def test_client_reads_its_own_writes_from_the_primary(self):
+        writer = self.client_for(self.writer)
+        response = writer.post(f'/api/{self.movie.pk}/rating-create/', {'rating': 4}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.rating_count(writer), 1)
+        # Other clients are not pinned, so they still read the lagging replica.
+        self.assertEqual(self.rating_count(self.client_for(self.reader)), 0)
+
+    @override_settings(DATABASE_READ_REPLICAS=['missing'])
+    def test_unavailable_replica_fails_over_to_the_primary(self):
+        Rating.upsert(self.writer, self.movie.pk, 4)
+        self.assertEqual(self.rating_count(self.client_for(self.reader)), 1)
+        self.assertIn('missing', routers._unavailable_until)
+
+    @override_settings(DATABASE_READ_REPLICAS=['replica'])
+    def test_cached_responses_are_read_from_the_primary(self):
+        # The write bumps the catalog version before the replica catches up.
+        response = self.client_for(self.writer).post(f'/api/{self.movie.pk}/rating-create/', {'rating': 4}, format='json')
+        self.assertEqual(response.status_code, 201)
+
+        reader = self.client_for(self.reader)
+        for url in (f'/api/movie/{self.movie.pk}/', f'/api/async/movie/{self.movie.pk}/'):
+            with self.subTest(url):
+                for _ in range(2):
+                    response = reader.get(url)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(response.json()['total_ratings'], 1)
+
+
+class AsyncViewTests(CatalogTestCase):
+    """
+    The /api/async/ views answer like their sync counterparts.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user('async')
+        cls.movies = [
+            cls.create_movie(f'Async {i}', cls.user, released_at=datetime.date(2000 + i % 2, 1, 1),
+                             genre='drama' if i % 3 else 'comedy')
+            for i in range(7)
+        ]
+        for i, movie in enumerate(cls.movies[:3]):
+            Rating.upsert(cls.user, movie.pk, i + 1)
+
+    def setUp(self):
+        super().setUp()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def titles(self, pages):
+        return [movie['title'] for page in pages for movie in page]
+
+    def test_list_pages_like_the_sync_view(self):
+        for query in ('', 'ordering=-released_at', 'ordering=average_rating&genre=drama'):
+            with self.subTest(query):
+                pages = self.walk(f'/api/async/movies/?{query}&page_size=2')
+                self.assertEqual(self.titles(pages), self.titles(self.walk(f'/api/movies/?{query}&page_size=2')))
+
+                last = self.client.get(f'/api/async/movies/?{query}&page_size=2').json()
+                while last['next']:
+                    self.assertTrue(last['next'].startswith('http://testserver/api/async/movies/'))
+                    last = self.client.get(last['next']).json()
+                back = self.walk(last['previous'], direction='previous')
+                self.assertEqual(self.titles(reversed(back)), self.titles(pages[:-1]))
+
+    def test_rejects_invalid_filters(self):
+        response = self.client.get('/api/async/movies/?released_after=yesterday')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), self.client.get('/api/movies/?released_after=yesterday').json())
+
+    def test_detail_and_ratings(self):
+        movie = self.movies[0]
+        self.assertEqual(self.client.get(f'/api/async/movie/{movie.pk}/').json(),
+                         self.client.get(f'/api/movie/{movie.pk}/').json())
+        self.assertEqual(self.client.get(f'/api/async/{movie.pk}/rating/').json(),
+                         self.client.get(f'/api/{movie.pk}/rating/').json())
+        self.assertEqual(self.client.get('/api/async/movie/999999/').status_code, 404)
+
+        self.client.credentials()
+        response = self.client.get(f'/api/async/movie/{movie.pk}/')
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('WWW-Authenticate', response)
+
+    def test_etag_and_invalidation(self):
+        url = f'/api/async/movie/{self.movies[-1].pk}/'
+        before = self.client.get(url)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=before['ETag']).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Rating.upsert(self.user, self.movies[-1].pk, 5)
+
+        after = self.client.get(url, HTTP_IF_NONE_MATCH=before['ETag'])
+        self.assertEqual(after.status_code, 200)
+        self.assertEqual(after.json()['total_ratings'], 1)
+
+
+@override_settings(REQUEST_METRICS_SERVER_TIMING=False)
+class ServerTimingTests(CatalogTestCase):
+    """
+    Only staff users get the Server-Timing header unless it is turned on for
+    everyone.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = cls.create_user('staff', is_staff=True)
+        cls.create_movie('Timed', cls.staff)
+
+    def test_sent_to_staff_only(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/movies/'))
+        self.client.force_authenticate(self.create_user('member'))
+        self.assertNotIn('Server-Timing', self.client.get('/api/movies/'))
+
+        # A URL that is not cached yet, so the list query runs.
+        self.client.force_authenticate(self.staff)
+        timing = self.client.get('/api/movies/?page_size=5')['Server-Timing']
+        self.assertRegex(timing, r'^db;dur=[\d.]+;desc="1 queries", serializer;dur=[\d.]+, total;dur=[\d.]+$')
+
+    def test_sent_to_everyone_when_enabled(self):
+        with self.settings(REQUEST_METRICS_SERVER_TIMING=True):
+            self.assertIn('Server-Timing', self.client.get('/api/movies/'))
+
+
+class RequestMetricsTests(CatalogTestCase):
+    """
+    Requests are added to rolling per-route histograms, which administrators
+    read in the Prometheus text format, and slow requests are logged.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = cls.create_user('staff', is_staff=True)
+        cls.create_movie('Measured', cls.staff)
+
+    def setUp(self):
+        super().setUp()
+        metrics.registry.clear()
+        self.addCleanup(metrics.registry.clear)
+
+    def test_histogram_expires_observations_after_the_window(self):
+        histogram = metrics.RollingHistogram((1, 5), window=10, slices=5)
+        histogram.observe(0.5, now=0)
+        histogram.observe(3, now=1)
+        histogram.observe(10, now=4)
+        self.assertEqual(histogram.snapshot(now=5), ([1, 2, 3], 13.5, 3))
+        # The two-second slice holding the first two observations has left
+        # the window.
+        self.assertEqual(histogram.snapshot(now=10.5), ([0, 0, 1], 10.0, 1))
+        self.assertEqual(histogram.snapshot(now=20), ([0, 0, 0], 0.0, 0))
+
+    def test_metrics_view_renders_prometheus_histograms(self):
+        for queries in (3, 30):
+            metrics.registry.observe('api/example/', 'GET', {
+                'duration': 0.02, 'db': 0.001, 'serializer': 0.0, 'queries': queries,
+            })
+        self.client.force_authenticate(self.staff)
+        self.client.get('/api/movies/?page_size=5')
+
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        lines = response.content.decode().splitlines()
+        self.assertIn('# TYPE http_request_queries histogram', lines)
+
+        labels = 'route="api/example/",method="GET"'
+        buckets = [line for line in lines if line.startswith(f'http_request_queries_bucket{{{labels},')]
+        self.assertEqual(buckets, [
+            f'http_request_queries_bucket{{{labels},le="{bound}"}} {count}'
+            for bound, count in zip([1, 2, 5, 10, 20, 50, 100, '+Inf'], [0, 0, 1, 1, 1, 2, 2, 2])
+        ])
+        self.assertIn(f'http_request_queries_sum{{{labels}}} 33.0', lines)
+        self.assertIn(f'http_request_queries_count{{{labels}}} 2', lines)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="0.025"}} 2', lines)
+
+        # Requests served through the middleware are recorded by route.
+        self.assertIn('http_request_queries_count{route="api/movies/",method="GET"} 1', lines)
+
+    def test_metrics_view_is_staff_only(self):
+        self.client.force_authenticate(self.create_user('member'))
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+
+    def test_slow_requests_are_logged_with_their_queries(self):
+        with self.assertNoLogs('Movie_Management_System.metrics'):
+            self.client.get('/api/movies/?page_size=5')
+
+        with self.settings(REQUEST_METRICS_SLOW_REQUEST_MS=0), \
+                self.assertLogs('Movie_Management_System.metrics', 'WARNING') as logs:
+            self.client.get('/api/movies/?page_size=3')
+        [message] = logs.output
+        self.assertIn('Slow request GET /api/movies/?page_size=3: ', message)
+        self.assertIn(', 1 queries (', message)
+        self.assertIn('FROM "movie_movie"', message)
+
+
+class CatalogTransferTests(CatalogTestCase):
+    """
+    Exported catalog files import back unchanged, and bad rows are reported
+    by line without stopping the import.
+    """
+    movie_fields = ['title', 'description', 'released_at', 'duration_hours', 'duration_minutes',
+                    'duration_seconds', 'genre', 'language', 'created_by']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = cls.create_user('curator', is_staff=True)
+        cls.users = [cls.create_user(f'fan-{i}') for i in range(3)]
+        cls.movies = [
+            cls.create_movie(f'Transfer {i}, "quoted"', cls.users[i % 3], description=f'Line one.\nLine {i}.',
+                             duration_hours=i, duration_minutes=i * 7, genre='drama' if i % 2 else 'comedy')
+            for i in range(5)
+        ]
+        for i, user in enumerate(cls.users):
+            for movie in cls.movies[i:]:
+                Rating.upsert(user, movie.pk, 1 + (i + movie.pk) % 5)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.admin)
+
+    def export(self, model, file_format):
+        response = self.client.get(f'/api/admin-catalog/export/?model={model}&file_format={file_format}')
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def upload(self, model, filename, content):
+        response = self.client.post(f'/api/admin-catalog/import/?model={model}',
+                                    {'file': SimpleUploadedFile(filename, content)}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def movie_rows(self):
+        return sorted(Movie.objects.values_list(*self.movie_fields))
+
+    def rating_rows(self):
+        return sorted(Rating.objects.values_list('user', 'movie__title', 'rating'))
+
+    def test_round_trip(self):
+        movies, ratings = self.movie_rows(), self.rating_rows()
+        aggregates = sorted(Movie.objects.values_list('title', 'rating_count', 'rating_avg'))
+        for file_format in ('csv', 'jsonl'):
+            with self.subTest(file_format):
+                # Ratings refer to movie ids, so movies keep theirs: only
+                # the ratings are deleted and imported again.
+                exported = self.export('ratings', file_format)
+                Rating.objects.all().delete()
+                result = self.upload('ratings', f'ratings.{file_format}', exported)
+                self.assertEqual((result['imported_count'], result['rejected_count']), (len(ratings), 0))
+                self.assertEqual(self.rating_rows(), ratings)
+                self.assertEqual(sorted(Movie.objects.values_list('title', 'rating_count', 'rating_avg')), aggregates)
+
+                exported = self.export('movies', file_format)
+                Movie.objects.all().delete()
+                result = self.upload('movies', f'movies.{file_format}', exported)
+                self.assertEqual((result['imported_count'], result['rejected_count']), (len(movies), 0))
+                self.assertEqual(self.movie_rows(), movies)
+
+                # Put the ratings back on the new movie ids for the next format.
+                by_title = dict(Movie.objects.values_list('title', 'pk'))
+                for user, title, rating in ratings:
+                    Rating.upsert(User.objects.get(pk=user), by_title[title], rating)
+
+    def test_rejected_rows_are_reported_by_line(self):
+        user, movie = self.users[0].pk, self.movies[0].pk
+        lines = [
+            {'user': user, 'movie': movie, 'rating': 5},
+            'not json',
+            [user, movie, 3],
+            {'user': user, 'movie': movie, 'rating': 9},
+            {'user': 999999, 'movie': 999999, 'rating': 3},
+            {'user': self.users[2].pk, 'movie': movie, 'rating': 2},
+        ]
+        content = '\n'.join(line if isinstance(line, str) else json.dumps(line) for line in lines)
+        result = self.upload('ratings', 'ratings.jsonl', content.encode())
+
+        self.assertEqual((result['imported_count'], result['rejected_count']), (2, 4))
+        errors = {error['line']: error['errors'] for error in result['errors']}
+        self.assertEqual(sorted(errors), [2, 3, 4, 5])
+        self.assertIn('Invalid JSON', errors[2]['non_field_errors'][0])
+        self.assertEqual(errors[3], {'non_field_errors': ['Expected a JSON object.']})
+        self.assertIn('rating', errors[4])
+        self.assertEqual(errors[5], {'user': ['User not found'], 'movie': ['Movie not found']})
+        self.assertEqual(Rating.objects.get(user=user, movie=movie).rating, 5)
+        self.assertEqual(Rating.objects.get(user=self.users[2], movie=movie).rating, 2)
+
+    def test_rating_import_keeps_created_at(self):
+        old = datetime.datetime(2020, 3, 4, 5, 6, 7, 890000, tzinfo=datetime.timezone.utc)
+        Rating.objects.filter(user=self.users[0]).update(created_at=old)
+        Rating.rebuild_rollups(Movie.objects.values_list('pk', flat=True))
+        ratings = sorted(Rating.objects.values_list('user', 'movie', 'rating', 'created_at'))
+        rollups = sorted(RatingRollup.objects.values_list('movie', 'period', 'start', 'count', 'total'))
+        for file_format in ('csv', 'jsonl'):
+            with self.subTest(file_format):
+                exported = self.export('ratings', file_format)
+                Rating.objects.all().delete()
+                self.upload('ratings', f'ratings.{file_format}', exported)
+                self.assertEqual(sorted(Rating.objects.values_list('user', 'movie', 'rating', 'created_at')), ratings)
+                self.assertEqual(
+                    sorted(RatingRollup.objects.values_list('movie', 'period', 'start', 'count', 'total')), rollups)
+
+        # Without the column, a replaced rating keeps its date.
+        movie = self.movies[0].pk
+        self.upload('ratings', 'ratings.csv', f'user,movie,rating\n{self.users[0].pk},{movie},1\n'.encode())
+        self.assertEqual(Rating.objects.get(user=self.users[0], movie=movie).created_at, old)
+
+    def test_unreadable_files_are_rejected_before_importing(self):
+        user, movie = self.users[2].pk, self.movies[0].pk
+        header = 'user,movie,rating\n'
+        files = {
+            f'Line 3: Not UTF-8 text: invalid continuation byte at byte {len(f"{user},{movie},3") + 1}.':
+                f'{header}{user},{movie},2\n{user},{movie},3\u00e9\n'.encode('latin-1'),
+            'Line 3: Invalid CSV: field larger than field limit (131072).':
+                f'{header}{user},{movie},2\n{user},{movie},"{"x" * 200000}"\n'.encode(),
+        }
+        for message, content in files.items():
+            with self.subTest(message):
+                response = self.client.post('/api/admin-catalog/import/?model=ratings',
+                                            {'file': SimpleUploadedFile('ratings.csv', content)}, format='multipart')
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'file': [message]})
+                self.assertFalse(Rating.objects.filter(user=user, movie=movie).exists())
+
+    def test_csv_movie_rows_are_validated(self):
+        content = (
+            'title,description,released_at,genre,language,created_by\n'
+            'Valid,Fine.,2001-02-03,drama,en,\n'
+            'Bad date,Fine.,03/02/2001,drama,en,\n'
+            'No owner,Fine.,2001-02-03,drama,en,999999\n'
+        )
+        result = self.upload('movies', 'movies.csv', content.encode())
+        self.assertEqual((result['imported_count'], result['rejected_count']), (1, 2))
+        self.assertEqual([error['line'] for error in result['errors']], [3, 4])
+        self.assertIn('released_at', result['errors'][0]['errors'])
+        self.assertEqual(result['errors'][1]['errors'], {'created_by': ['User not found']})
+        # Rows without created_by are owned by the uploader.
+        self.assertEqual(Movie.objects.get(title='Valid').created_by, self.admin)
+
+
+class StreamingListTests(CatalogTestCase):
+    """
+    Streamed lists hold every matching row, in the paginated list's order.
+    """
+    ndjson = 'application/x-ndjson'
+    json_array = 'application/json; stream=true'
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = cls.create_user('streamer')
+        for i in range(7):
+            cls.create_movie(f'Stream {i} \u00e9', owner, released_at=datetime.date(2000 + i % 3, 1, 1),
+                             genre='drama' if i % 2 else 'comedy')
+
+    def stream(self, url, accept):
+        # Small chunks, so the body spans several of them.
+        with mock.patch.object(MovieListView, 'stream_chunk_size', 3):
+            response = self.client.get(url, HTTP_ACCEPT=accept)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Vary'], 'Accept')
+        chunks = list(response.streaming_content)
+        return response, chunks, b''.join(chunks)
+
+    def test_bodies_match_the_paginated_list(self):
+        for query in ('', '?ordering=released_at', '?genre=drama&ordering=-released_at'):
+            expected = self.client.get(f'/api/movies/{query}{"&" if query else "?"}page_size=500').json()['results']
+            with self.subTest(query):
+                response, chunks, body = self.stream(f'/api/movies/{query}', self.ndjson)
+                self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+                self.assertTrue(body.endswith(b'\n'))
+                self.assertEqual([json.loads(line) for line in body.splitlines()], expected)
+                self.assertEqual(len(chunks), len(expected) // 3 + 1)
+
+                response, chunks, body = self.stream(f'/api/movies/{query}', self.json_array)
+                self.assertEqual(response['Content-Type'], 'application/json; charset=utf-8')
+                self.assertEqual(json.loads(body), expected)
+
+    def test_empty_streams(self):
+        self.assertEqual(self.stream('/api/movies/?genre=none', self.ndjson)[2], b'')
+        self.assertEqual(self.stream('/api/movies/?genre=none', self.json_array)[2], b'[]')
+
+    def test_errors_are_a_single_document(self):
+        for accept in (self.ndjson, self.json_array):
+            with self.subTest(accept):
+                response = self.client.get('/api/movies/?released_after=never', HTTP_ACCEPT=accept)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.streaming)
+                self.assertIn('released_after', json.loads(response.content))
+
+
+class LeaderboardTests(CatalogTestCase):
+    """
+    Leaderboards rank by weighted average and recent activity, and reads
+    serve the last refresh.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [cls.create_user(f'voter-{i}') for i in range(12)]
+        cls.one_perfect, cls.many_good, cls.many_bad, cls.one_poor = (
+            cls.create_movie(title, cls.users[0]) for title in ('One perfect', 'Many good', 'Many bad', 'One poor')
+        )
+        cls.create_movie('Unrated', cls.users[0])
+        Rating.upsert(cls.users[0], cls.one_perfect.pk, 5)
+        Rating.upsert(cls.users[0], cls.one_poor.pk, 2)
+        for user in cls.users:
+            Rating.upsert(user, cls.many_good.pk, 4.5)
+            Rating.upsert(user, cls.many_bad.pk, 2)
+        Rating.objects.filter(movie=cls.many_bad).update(
+            created_at=datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc))
+
+    def board(self, name, limit=20):
+        response = self.client.get(f'/api/movies/{name}/?limit={limit}')
+        self.assertEqual(response.status_code, 200)
+        return [(entry['position'], entry['movie']['title'], entry['score'], entry['rating_count'])
+                for entry in response.json()]
+
+    def test_top_rated_weights_averages_by_rating_count(self):
+        refresh_leaderboards()
+        board = self.board('top-rated')
+        # A single 5 ranks below twelve 4.5s, since every movie also gets
+        # LEADERBOARD_PRIOR_RATINGS ratings at the catalog mean.
+        self.assertEqual([(position, title, count) for position, title, _, count in board], [
+            (1, 'Many good', 12), (2, 'One perfect', 1), (3, 'One poor', 1), (4, 'Many bad', 12),
+        ])
+        mean = (5 + 2 + 12 * 4.5 + 12 * 2) / 26
+        self.assertAlmostEqual(board[1][2], (10 * mean + 5) / 11)
+        self.assertEqual(sorted((score for *_, score, _ in board), reverse=True), [score for *_, score, _ in board])
+        self.assertEqual(len(self.board('top-rated', limit=2)), 2)
+
+    def test_trending_counts_recent_ratings(self):
+        refresh_leaderboards()
+        # Ties on the recent count go to the higher recent average.
+        self.assertEqual(self.board('trending'), [
+            (1, 'Many good', 12.0, 12), (2, 'One perfect', 1.0, 1), (3, 'One poor', 1.0, 1),
+        ])
+
+    def test_reads_serve_the_last_refresh(self):
+        self.assertEqual(self.board('trending'), [])
+        refresh_leaderboards()
+        for user in self.users[1:]:
+            Rating.upsert(user, self.one_poor.pk, 5)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.board('trending')[0][1], 'Many good')
+        self.assertEqual(refresh_leaderboards(), {'top_rated': 4, 'trending': 3})
+        self.assertEqual(self.board('trending')[0][1:], ('One poor', 12.0, 12))
+        self.assertEqual(refresh_leaderboards(), {'top_rated': 0, 'trending': 0})
+
+
+@override_settings(TIME_ZONE='America/New_York')
+class RollupConsistencyTests(CatalogTestCase):
+    """
+    The incrementally maintained histogram and timeline match a rebuild from
+    the Rating table.
+    """
+    # Local dates around midnight and a Monday week start, in the timezone
+    # that both the Python and the SQL bucketing must apply.
+    moments = [
+        datetime.datetime(2024, 3, 3, 23, 30),
+        datetime.datetime(2024, 3, 4, 0, 30),
+        datetime.datetime(2024, 3, 4, 12, 0),
+        datetime.datetime(2024, 3, 10, 23, 59),
+        datetime.datetime(2024, 3, 11, 8, 0),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [cls.create_user(f'rater-{i}') for i in range(4)]
+        cls.movies = [cls.create_movie(f'Rolled {i}', cls.users[0]) for i in range(3)]
+
+    def at(self, index):
+        moment = timezone.make_aware(self.moments[index], zoneinfo.ZoneInfo('America/New_York'))
+        return mock.patch('django.utils.timezone.now', return_value=moment)
+
+    def snapshot(self):
+        tables = (
+            sorted(RatingHistogram.objects.filter(count__gt=0).values_list('movie', 'stars', 'count')),
+            sorted((movie, period, start, count, round(total, 6)) for movie, period, start, count, total
+                   in RatingRollup.objects.filter(count__gt=0).values_list('movie', 'period', 'start', 'count', 'total')),
+        )
+        responses = []
+        for movie in self.movies:
+            responses.append(self.client.get(f'/api/{movie.pk}/rating/histogram/').json())
+            for period in ('day', 'week'):
+                responses.append(self.client.get(
+                    f'/api/{movie.pk}/rating/timeline/?period={period}&since=2024-03-01&until=2024-03-31').json())
+        return tables, responses
+
+    def test_incremental_rollups_match_a_rebuild(self):
+        first, second, third = self.movies
+        with self.at(0):
+            Rating.upsert(self.users[0], first.pk, 4.5)
+            Rating.upsert(self.users[1], first.pk, 1.5)
+        with self.at(1):
+            Rating.bulk_upsert(self.users[2], {first.pk: 3.4, second.pk: 5.0, third.pk: 2.5})
+        with self.at(2):
+            # Replacing a rating moves it between stars but not between days.
+            Rating.upsert(self.users[0], first.pk, 2.0)
+            Rating.upsert(self.users[3], second.pk, 1.0)
+        with self.at(3):
+            Rating.bulk_upsert(self.users[1], {first.pk: 5.0, second.pk: 3.5})
+            Rating.upsert(self.users[0], third.pk, 4.0)
+        with self.at(4):
+            self.client.force_authenticate(self.users[3])
+            rating = Rating.objects.get(user=self.users[3], movie=second)
+            self.assertEqual(self.client.delete(f'/api/rating/{rating.pk}/').status_code, 204)
+            Rating.upsert(self.users[3], third.pk, 3.0)
+
+        incremental = self.snapshot()
+        self.assertIn(['week', '2024-03-04'], [[row[1], str(row[2])] for row in incremental[0][1]])
+        Rating.rebuild_rollups()
+        self.assertEqual(self.snapshot(), incremental)
+
+        Rating.rebuild_rollups([first.pk])
+        self.assertEqual(self.snapshot(), incremental)
+
+
+class SearchTests(CatalogTestCase):
+    """
+    Full-text search prefix matches every term and ranks title matches first.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        user = cls.create_user('searcher')
+        cls.create_movie('A quiet evening', user, description='A dragon sleeps under the hill.')
+        cls.create_movie('Dragon rider', user, description='A story about flying.')
+        cls.create_movie('Dragonfly', user, description='Insects.')
+        cls.create_movie('Harbour lights', user, description='Boats and fog.')
+
+    def search(self, q):
+        response = self.client.get('/api/movies/search/', {'q': q})
+        self.assertEqual(response.status_code, 200)
+        return [movie['title'] for movie in response.json()['results']]
+
+    def test_title_matches_rank_above_description_matches(self):
+        titles = self.search('dragon')
+        self.assertEqual(set(titles), {'A quiet evening', 'Dragon rider', 'Dragonfly'})
+        self.assertEqual(titles[-1], 'A quiet evening')
+
+    def test_pages_follow_rank_order(self):
+        pages = self.walk('/api/movies/search/?q=dragon&page_size=1')
+        self.assertEqual([movie['title'] for page in pages for movie in page], self.search('dragon'))
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.search('dragon flying'), ['Dragon rider'])
+        self.assertEqual(self.search('drag rid'), ['Dragon rider'])
+
+    def test_query_syntax_is_searched_literally(self):
+        self.assertEqual(self.search('harbour OR dragon'), [])
+        self.assertEqual(self.search('"harbour" -fog'), ['Harbour lights'])
+
+    def test_index_follows_writes(self):
+        movie = Movie.objects.get(title='Harbour lights')
+        movie.title = 'Lighthouse keeper'
+        movie.save()
+        self.assertEqual(self.search('harbour'), [])
+        self.assertEqual(self.search('lighthouse'), ['Lighthouse keeper'])
+        movie.delete()
+        self.assertEqual(self.search('lighthouse'), [])
+
+    def test_requires_a_query(self):
+        self.assertEqual(self.client.get('/api/movies/search/').status_code, 400)
+
+
+class BulkModerationTests(CatalogTestCase):
+    """
+    POST /api/admin-report/bulk/ moderates many reports with one UPDATE.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = cls.create_user('moderator', is_staff=True)
+        movie = cls.create_movie('Reported', cls.admin)
+        cls.reports = {
+            status: Report.objects.create(user=cls.create_user(f'reporter-{status}'), movie=movie,
+                                          reason=status, status=status)
+            for status in Report.Status.values
+        }
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.admin)
+
+    def moderate(self, action, ids):
+        return self.client.post('/api/admin-report/bulk/', {'action': action, 'ids': ids}, format='json')
+
+    def test_counts_requested_and_updated_reports(self):
+        ids = [report.pk for report in self.reports.values()]
+        with self.assertNumQueries(1):
+            response = self.moderate('approve', ids + ids[:1] + [999999])
+        self.assertEqual(response.status_code, 200)
+        # Duplicates count once; missing and already approved reports are not updated.
+        self.assertEqual(response.json(), {'action': 'approve', 'requested_count': 4, 'updated_count': 2})
+        self.assertEqual(set(Report.objects.values_list('status', flat=True)), {Report.Status.APPROVED})
+        self.assertEqual(self.client.get('/api/admin-report/queue/').json()['results'], [])
+
+        response = self.moderate('reject', ids[:1])
+        self.assertEqual(response.json(), {'action': 'reject', 'requested_count': 1, 'updated_count': 1})
+
+    def test_rejects_invalid_requests(self):
+        self.assertEqual(self.moderate('delete', [self.reports['pending'].pk]).status_code, 400)
+        self.assertEqual(self.moderate('approve', []).status_code, 400)
+        self.assertEqual(self.moderate('approve', [2 ** 70]).status_code, 400)
+        self.client.force_authenticate(self.create_user('member'))
+        self.assertEqual(self.moderate('approve', [self.reports['pending'].pk]).status_code, 403)
+        self.assertEqual(Report.objects.get(pk=self.reports['pending'].pk).status, Report.Status.PENDING)
+
+
+class MigrationTestCase(TransactionTestCase):
+    """
+    Base class for data migration tests, which migrate between ``before``
+    and ``after`` and end on the latest migrations.
+    """
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+
+class ReportStatusMigrationTests(MigrationTestCase):
+    """
+    Migration 0007 turns the approved/rejected flags into a status, and back.
+    """
+    before = [('movie', '0006_movie_catalog_indexes')]
+    after = [('movie', '0007_report_status')]
+
+    def test_flags_become_status_and_back(self):
+        apps = self.migrate(self.before)
+        owner = User.objects.create_user('owner', 'owner@example.com', 'correct-horse-battery')
+        movie = apps.get_model('movie', 'Movie').objects.create(
+            title='Old', description='Old.', released_at=datetime.date(2000, 1, 1), genre='drama', language='en',
+            created_by_id=owner.pk)
+        Report = apps.get_model('movie', 'Report')
+        flags = {'pending': (False, False), 'approved': (True, False), 'rejected': (False, True), 'both': (True, True)}
+        for reason, (approved, rejected) in flags.items():
+            user = User.objects.create_user(reason, f'{reason}@example.com', 'correct-horse-battery')
+            Report.objects.create(user_id=user.pk, movie_id=movie.pk, reason=reason, approved=approved, rejected=rejected)
+
+        Report = self.migrate(self.after).get_model('movie', 'Report')
+        self.assertEqual(dict(Report.objects.values_list('reason', 'status')),
+                         {'pending': 'pending', 'approved': 'approved', 'rejected': 'rejected', 'both': 'approved'})
+
+        Report = self.migrate(self.before).get_model('movie', 'Report')
+        self.assertEqual({reason: (approved, rejected) for reason, approved, rejected
+                          in Report.objects.values_list('reason', 'approved', 'rejected')},
+                         {**flags, 'both': (True, False)})
+
+
+class RatingRollupMigrationTests(MigrationTestCase):
+    """
+    Migration 0009 fills the rollup tables from the ratings that exist when
+    it runs, so later writes adjust counts that include them.
+    """
+    before = [('movie', '0008_leaderboards')]
+    after = [('movie', '0009_rating_rollups')]
+
+    def rollups(self):
+        return (sorted(RatingHistogram.objects.values_list('movie', 'stars', 'count')),
+                sorted(RatingRollup.objects.values_list('movie', 'period', 'start', 'count', 'total')))
+
+    def test_existing_ratings_are_counted(self):
+        apps = self.migrate(self.before)
+        movie = apps.get_model('movie', 'Movie').objects.create(
+            title='Old', description='Old.', released_at=datetime.date(2000, 1, 1), genre='drama', language='en',
+            created_by_id=User.objects.create_user('owner', 'owner@example.com', 'correct-horse-battery').pk,
+            rating_count=2, rating_sum=6.5, rating_avg=3.25)
+        OldRating = apps.get_model('movie', 'Rating')
+        for username, rating, day in (('early', 4, 3), ('late', 2.5, 4)):
+            user = User.objects.create_user(username, f'{username}@example.com', 'correct-horse-battery')
+            OldRating.objects.create(user_id=user.pk, movie_id=movie.pk, rating=rating)
+            OldRating.objects.filter(user_id=user.pk).update(
+                created_at=datetime.datetime(2024, 1, day, 12, tzinfo=datetime.timezone.utc))
+
+        self.migrate(self.after)
+        histogram, rollups = self.rollups()
+        self.assertEqual(histogram, [(movie.pk, 3, 1), (movie.pk, 4, 1)])
+        self.assertEqual(rollups, [
+            (movie.pk, 'day', datetime.date(2024, 1, 3), 1, 4.0),
+            (movie.pk, 'day', datetime.date(2024, 1, 4), 1, 2.5),
+            (movie.pk, 'week', datetime.date(2024, 1, 1), 2, 6.5),
+        ])
+
+        # Writes to the migrated ratings keep the tables equal to a rebuild.
+        self.assertTrue(Rating.change(Rating.objects.get(user__username='early'), 2))
+        self.assertTrue(Rating.remove(Rating.objects.get(user__username='late')))
+        updated = self.rollups()
+        self.assertEqual(updated[0], [(movie.pk, 2, 1), (movie.pk, 3, 0), (movie.pk, 4, 0)])
+        Rating.rebuild_rollups()
+        rebuilt = self.rollups()
+        self.assertEqual([row for row in updated[0] if row[2]], rebuilt[0])
+        self.assertEqual([row for row in updated[1] if row[3]], rebuilt[1])
+
+
+class SchemaTests(TestCase):
+    """
+    The OpenAPI schema is loaded from OPENAPI_SCHEMA_FILE while its code
+    version matches, and is served with a strong ETag.
+    """
+    stub = {'openapi': '3.0.3', 'info': {'title': 'Stub', 'version': '1'}, 'paths': {}}
+
+    def setUp(self):
+        self.reset()
+        self.addCleanup(self.reset)
+
+    def reset(self):
+        schema.code_version.cache_clear()
+        schema._schema = None
+        schema._rendered.clear()
+
+    def stored(self):
+        with open(settings.OPENAPI_SCHEMA_FILE) as f:
+            return json.load(f)
+
+    @override_settings(CODE_VERSION='v1')
+    def test_loads_a_current_file_and_regenerates_a_stale_one(self):
+        schema.write_schema(self.stub, 'v1')
+        with mock.patch.object(schema, 'generate_schema') as generate:
+            self.assertEqual(schema.load_schema(), self.stub)
+        generate.assert_not_called()
+
+        regenerated = {**self.stub, 'info': {'title': 'New', 'version': '1'}}
+        for version in ('v0', None):
+            with self.subTest(version):
+                if version is None:
+                    with open(settings.OPENAPI_SCHEMA_FILE, 'w') as f:
+                        f.write('{not json')
+                else:
+                    schema.write_schema(self.stub, version)
+                with mock.patch.object(schema, 'generate_schema', return_value=regenerated):
+                    self.assertEqual(schema.load_schema(), regenerated)
+                self.assertEqual(self.stored(), {'version': 'v1', 'schema': regenerated})
+
+    @override_settings(CODE_VERSION='v1')
+    def test_served_with_etag(self):
+        schema.write_schema(self.stub, 'v1')
+        response = self.client.get('/api/schema/?format=json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), self.stub)
+        self.assertIn(f'max-age={settings.OPENAPI_SCHEMA_MAX_AGE}', response['Cache-Control'])
+
+        not_modified = self.client.get('/api/schema/?format=json', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+        # Each format has its own ETag.
+        self.assertNotEqual(self.client.get('/api/schema/')['ETag'], response['ETag'])
+
+    def test_code_version_reads_only_project_packages(self):
+        packages = schema.source_packages()
+        self.assertEqual({os.path.basename(path) for path in packages}, {'Movie_Management_System', 'accounts', 'movie'})
+        version = schema.code_version()
+
+        # Sources elsewhere under BASE_DIR, such as a virtualenv, are ignored.
+        with tempfile.TemporaryDirectory(dir=settings.BASE_DIR) as other:
+            with open(os.path.join(other, 'module.py'), 'w') as f:
+                f.write('VALUE = 1\n')
+            schema.code_version.cache_clear()
+            self.assertEqual(schema.code_version(), version)
+
+        # A changed source file of a package changes the version.
+        path = os.path.join(packages[0], '__init__.py')
+        stat = os.stat(path)
+        self.addCleanup(os.utime, path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        schema.code_version.cache_clear()
+        self.assertNotEqual(schema.code_version(), version)